@@ -1,32 +1,83 @@
 from http.server import BaseHTTPRequestHandler
 import json
-import pdfplumber
-import pandas as pd
 import base64
 from io import BytesIO
+import logging
 import os
+import sys
 
-def extract_table_from_pdf(pdf_content):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from extraction_engine import ExtractionEngine, PdfTableBackend
+from normalizer import DataNormalizer
+from snapshot_store import SnapshotStore
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# O arquivo de listas só é usado quando o servidor define um diretório
+# gravável e persistente; em deploys serverless (Vercel) ele fica desligado,
+# já que o disco não sobrevive de uma execução para a outra
+SNAPSHOT_DIR = os.environ.get('SENIORIDADE_SNAPSHOT_DIR')
+
+# Aviso do formulário sobre a lista antiga, mostrado só com o arquivo de listas habilitado
+SNAPSHOT_HINT = '<p>Sem arquivo, a comparação usa a última lista guardada.</p>'
+
+def _records(df):
+    """
+    Linhas da tabela como dicionários, com ausentes como None (JSON null).
+    """
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+def _extract(pdf_content):
     """
-    Extrai a tabela de um arquivo PDF, ignorando cabeçalho e rodapé.
+    Extrai e normaliza a lista de um PDF.
+    """
+    return DataNormalizer().normalize_dataframe(ExtractionEngine(PdfTableBackend()).extract(BytesIO(pdf_content)))
+
+def extract_table_from_pdf(pdf_content, store=False, source=None):
+    """
+    Extrai a tabela de um arquivo PDF, ignorando cabeçalho e rodapé, e normaliza os dados.
+    
+    Com store=True e o arquivo de listas habilitado no servidor
+    (SENIORIDADE_SNAPSHOT_DIR), a lista é guardada no arquivo de snapshots;
+    um PDF já guardado é lido de lá, sem nova extração. Falhas do arquivo de
+    listas só são registradas: a extração retorna as linhas do mesmo jeito.
     """
     try:
-        all_tables = []
-        with pdfplumber.open(BytesIO(pdf_content)) as pdf:
-            for page in pdf.pages:
-                tables = page.extract_tables()
-                if tables:
-                    table = tables[0]
-                    df = pd.DataFrame(table[1:], columns=table[0])
-                    all_tables.append(df)
+        if store and SNAPSHOT_DIR:
+            try:
+                snapshots = SnapshotStore(SNAPSHOT_DIR)
+                snapshot_id = snapshots.get_or_extract(
+                    BytesIO(pdf_content),
+                    lambda: _extract(pdf_content),
+                    source=source
+                )
+                return _records(snapshots.load(snapshot_id))
+            except Exception as e:
+                logger.error(f"Erro no arquivo de listas, extraindo sem guardar: {str(e)}")
         
-        if not all_tables:
-            raise ValueError("Nenhuma tabela encontrada no PDF")
+        final_df = _extract(pdf_content)
+        return _records(final_df)
         
-        final_df = pd.concat(all_tables, ignore_index=True)
-        return final_df.to_dict(orient='records')
+    except Exception as e:
+        return {"error": str(e)}
+
+def load_latest_snapshot():
+    """
+    Retorna a última lista guardada, no mesmo formato da extração.
+    """
+    if not SNAPSHOT_DIR:
+        return {"error": "O arquivo de listas não está habilitado neste servidor; envie a lista antiga"}
+    try:
+        snapshots = SnapshotStore(SNAPSHOT_DIR)
+        latest = snapshots.latest()
+        if latest is None:
+            return {"error": "Nenhuma lista guardada"}
+        return _records(snapshots.load(latest['id']))
         
     except Exception as e:
+        logger.error(f"Erro ao carregar a última lista guardada: {str(e)}")
         return {"error": str(e)}
 
 class handler(BaseHTTPRequestHandler):
@@ -36,11 +87,16 @@ class handler(BaseHTTPRequestHandler):
         data = json.loads(post_data.decode('utf-8'))
         
         try:
-            # Decode base64 PDF content
-            pdf_content = base64.b64decode(data['pdf_content'])
-            
-            # Process PDF
-            result = extract_table_from_pdf(pdf_content)
+            if data.get('snapshot') == 'latest':
+                # Última lista guardada, sem novo upload
+                result = load_latest_snapshot()
+            else:
+                # Decode base64 PDF content
+                pdf_content = base64.b64decode(data['pdf_content'])
+                
+                # Process PDF
+                result = extract_table_from_pdf(pdf_content, store=data.get('store', False),
+                                                source=data.get('source'))
             
             # Send response
             self.send_response(200)
@@ -443,12 +499,13 @@ class handler(BaseHTTPRequestHandler):
                 <div class="search-section">
                     <h3>Buscar por RE</h3>
                     <div class="search-box">
-                        <input type="text" id="reSearch" placeholder="Digite o RE para buscar (opcional)">
+                        <input type="text" id="reSearch" placeholder="Digite o RE, ou vários separados por vírgula (opcional)">
                     </div>
                 </div>
 
                 <div class="file-input">
                     <h3>Lista Antiga</h3>
+                    <!--SNAPSHOT_HINT-->
                     <input type="file" id="oldFile" accept=".pdf">
                 </div>
                 <div class="file-input">
@@ -489,6 +546,7 @@ class handler(BaseHTTPRequestHandler):
             </footer>
 
             <script>
+                const SNAPSHOTS_ENABLED = /*SNAPSHOTS_ENABLED*/;
                 let oldData = null;
                 let newData = null;
 
@@ -514,8 +572,12 @@ class handler(BaseHTTPRequestHandler):
                     const newFile = document.getElementById('newFile').files[0];
                     const reInput = document.getElementById('reSearch').value.trim();
                     
-                    if (!oldFile || !newFile) {
-                        alert('Por favor, selecione ambos os arquivos PDF');
+                    if (!newFile) {
+                        alert('Por favor, selecione o arquivo PDF da lista nova');
+                        return;
+                    }
+                    if (!oldFile && !SNAPSHOTS_ENABLED) {
+                        alert('Por favor, selecione o arquivo PDF da lista antiga');
                         return;
                     }
 
@@ -523,14 +585,19 @@ class handler(BaseHTTPRequestHandler):
                     updateStep(1, 'active');
 
                     try {
-                        // Process old file
-                        const oldContent = await readFileAsBase64(oldFile);
+                        // Process old file; sem arquivo, usa a última lista guardada
+                        const oldBody = oldFile
+                            ? { pdf_content: await readFileAsBase64(oldFile), store: true, source: oldFile.name }
+                            : { snapshot: 'latest' };
                         const oldResponse = await fetch('/api', {
                             method: 'POST',
                             headers: { 'Content-Type': 'application/json' },
-                            body: JSON.stringify({ pdf_content: oldContent })
+                            body: JSON.stringify(oldBody)
                         });
                         oldData = await oldResponse.json();
+                        if (oldData.error) {
+                            throw new Error(oldData.error);
+                        }
                         updateStep(1, 'completed');
                         updateStep(2, 'active');
 
@@ -539,9 +606,12 @@ class handler(BaseHTTPRequestHandler):
                         const newResponse = await fetch('/api', {
                             method: 'POST',
                             headers: { 'Content-Type': 'application/json' },
-                            body: JSON.stringify({ pdf_content: newContent })
+                            body: JSON.stringify({ pdf_content: newContent, store: true, source: newFile.name })
                         });
                         newData = await newResponse.json();
+                        if (newData.error) {
+                            throw new Error(newData.error);
+                        }
                         updateStep(2, 'completed');
                         updateStep(3, 'active');
 
@@ -550,10 +620,12 @@ class handler(BaseHTTPRequestHandler):
                         updateStep(3, 'completed');
                         hideLoading();
 
-                        // Se houver um RE para buscar, mostra os resultados da busca primeiro
-                        if (reInput) {
-                            const searchResult = analyzeREChanges(reInput, oldData, newData);
-                            displaySearchResult(searchResult);
+                        // Se houver REs para buscar, mostra os resultados da busca primeiro
+                        const reList = reInput.split(/[\\s,;]+/).filter(re => re);
+                        if (reList.length) {
+                            const oldIndex = buildREIndex(oldData);
+                            const newIndex = buildREIndex(newData);
+                            displaySearchResults(reList.map(re => [re, analyzeREChanges(re, oldIndex, newIndex)]));
                         }
                         
                         // Mostra os resultados da comparação
@@ -567,9 +639,21 @@ class handler(BaseHTTPRequestHandler):
                     }
                 }
 
-                function analyzeREChanges(re, oldList, newList) {
-                    const oldEntry = oldList.find(item => item.RE === re);
-                    const newEntry = newList.find(item => item.RE === re);
+                // Índice RE -> primeira linha da lista, montado uma vez por comparação
+                function buildREIndex(list) {
+                    const index = new Map();
+                    for (const item of list) {
+                        const key = String(item.RE).trim();
+                        if (!index.has(key)) {
+                            index.set(key, item);
+                        }
+                    }
+                    return index;
+                }
+
+                function analyzeREChanges(re, oldIndex, newIndex) {
+                    const oldEntry = oldIndex.get(re);
+                    const newEntry = newIndex.get(re);
 
                     if (!oldEntry && !newEntry) {
                         return {
@@ -617,11 +701,14 @@ class handler(BaseHTTPRequestHandler):
                     };
                 }
 
-                function displaySearchResult(result) {
+                function displaySearchResults(results) {
                     const searchResult = document.getElementById('searchResult');
                     if (!searchResult) return;
-                    
-                    let html = '<div class="search-result-content">';
+                    searchResult.innerHTML = results.map(([re, result]) => searchResultHtml(re, result)).join('');
+                }
+
+                function searchResultHtml(re, result) {
+                    let html = `<div class="search-result-content"><h3>RE ${re}</h3>`;
                     
                     switch (result.status) {
                         case 'not_found':
@@ -684,7 +771,7 @@ class handler(BaseHTTPRequestHandler):
                     }
                     
                     html += '</div>';
-                    searchResult.innerHTML = html;
+                    return html;
                 }
 
                 function createDataTable(data) {
@@ -801,4 +888,7 @@ class handler(BaseHTTPRequestHandler):
         </body>
         </html>
         """
+        # Sem o arquivo de listas, a lista antiga é sempre enviada
+        html = html.replace('<!--SNAPSHOT_HINT-->', SNAPSHOT_HINT if SNAPSHOT_DIR else '')
+        html = html.replace('/*SNAPSHOTS_ENABLED*/', 'true' if SNAPSHOT_DIR else 'false')
         self.wfile.write(html.encode()) 
\ No newline at end of file
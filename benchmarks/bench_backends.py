@@ -0,0 +1,56 @@
+"""
+Mede cada backend do motor de extração nos mesmos documentos.
+
+Para cada arquivo, roda todos os backends aplicáveis (PDF: modo tabela,
+modo tabela paralelo e modo palavra/coordenada; Excel: leitor de planilhas)
+e informa páginas/s e linhas/s.
+
+Uso:
+    python benchmarks/bench_backends.py lista.pdf [outra_lista.xlsx ...] [--repeat N]
+"""
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from extraction_engine import ExcelBackend, ExtractionEngine, PdfTableBackend, PdfWordsBackend
+
+def _backends_for(path):
+    if path.lower().endswith('.pdf'):
+        return [
+            ('pdf_table', PdfTableBackend()),
+            ('pdf_table (paralelo)', PdfTableBackend(parallel=True)),
+            ('pdf_words', PdfWordsBackend()),
+        ]
+    return [('excel', ExcelBackend())]
+
+def _run(engine, path, repeat):
+    best = None
+    for _ in range(repeat):
+        rows = len(engine.extract(path))
+        stats = dict(engine.stats)
+        if best is None or stats['seconds'] < best['seconds']:
+            best = stats
+            best['final_rows'] = rows
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'arquivo':<30} {'backend':<22} {'páginas':>8} {'linhas':>8} {'tempo (s)':>10} {'pág/s':>8} {'linhas/s':>10}")
+    for path in args.files:
+        for label, backend in _backends_for(path):
+            stats = _run(ExtractionEngine(backend), path, args.repeat)
+            seconds = stats['seconds'] or float('nan')
+            print(f"{os.path.basename(path):<30} {label:<22} {stats['pages']:>8} {stats['final_rows']:>8} "
+                  f"{seconds:>10.3f} {stats['pages'] / seconds:>8.1f} {stats['rows'] / seconds:>10.1f}")
+
+if __name__ == "__main__":
+    main()
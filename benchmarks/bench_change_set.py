@@ -0,0 +1,64 @@
+"""
+Resultado colunar (change_set.ChangeSet) contra os registros de texto que
+compare_tables montava para cada diferença.
+
+"colunar" mede compare_tables(columnar=True), que só guarda códigos e
+valores; "com textos" soma a montagem de todos os registros
+(to_records), o que compare_tables faz por padrão. As duas últimas colunas medem a
+contagem por tipo e a seleção das mudanças de equipamento pelo
+ChangeSet e pelos registros de texto.
+
+Uso:
+    python benchmarks/bench_change_set.py [linhas ...] [--changed F]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+
+from bench_schema import _make_lists
+from comparator import compare_tables
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def _with_changes(rows, changed):
+    """Listas de _make_lists com uma fração das linhas mudando de FUNÇÃO e de NOME DE GUERRA."""
+    old_df, new_df = _make_lists(rows)
+    positions = np.flatnonzero(np.random.default_rng(0).random(len(new_df)) < changed)
+    new_df.loc[positions, 'FUNÇÃO'] = 'CHEFE'
+    new_df.loc[positions, 'NOME DE GUERRA'] = [f'NOVO{i:06d}' for i in positions]
+    return old_df, new_df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', nargs='*', type=int, default=[50000, 100000, 200000])
+    parser.add_argument('--changed', type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'linhas':>8} {'mudanças':>9} {'colunar (s)':>12} {'com textos (s)':>15} "
+          f"{'filtro colunar (s)':>19} {'filtro textos (s)':>18}")
+    for rows in args.rows:
+        old_df, new_df = _with_changes(rows, args.changed)
+        result, columnar_time = _time(lambda: compare_tables(old_df.copy(), new_df.copy(), columnar=True))
+        changes = result['differences']
+        records, records_time = _time(changes.to_records)
+        _, columnar_filter_time = _time(lambda: (changes.counts(), changes.select(fields=['EQUIPAMENTO'])))
+        _, records_filter_time = _time(lambda: (Counter(record['Tipo'] for record in records),
+                                                [record for record in records
+                                                 if record['Tipo'] == 'MUDANÇA DE EQUIPAMENTO']))
+        print(f"{rows:>8} {len(changes):>9} {columnar_time:>12.2f} {columnar_time + records_time:>15.2f} "
+              f"{columnar_filter_time:>19.3f} {records_filter_time:>18.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Escalabilidade da comparação de listas: o motor por RE (hash join) de
+comparator contra a busca anterior, uma varredura da coluna RE para cada RE.
+
+A busca anterior é quadrática e só roda até --scan-max linhas. A coluna
+"com hashes" mede compare_tables recebendo os hashes das linhas já
+calculados (como os lidos do cache de extração); "hashes" é o custo de
+calcular os hashes de uma lista, pago uma vez ao gravá-la no cache.
+
+Uso:
+    python benchmarks/bench_comparator.py [linhas ...] [--scan-max N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pandas as pd
+
+from bench_schema import _make_lists
+from comparator import ListComparator, compare_tables, row_fingerprints
+
+def _scan_compare_lists(old_df, new_df):
+    """Comparação anterior: df[df['RE'] == re].iloc[0] para cada RE."""
+    comparator = ListComparator()
+    old_res = set(old_df['RE'])
+    new_res = set(new_df['RE'])
+    changes_list = []
+    for re in new_res - old_res:
+        new_row = new_df[new_df['RE'] == re].iloc[0]
+        changes_list.append({'RE': re, 'Nome': new_row['NOME'], 'Mudança': 'ENTRADA',
+                             'Detalhes': f"Novo piloto: {new_row['NOME']} ({new_row['NOME DE GUERRA']})"})
+    for re in old_res - new_res:
+        old_row = old_df[old_df['RE'] == re].iloc[0]
+        changes_list.append({'RE': re, 'Nome': old_row['NOME'], 'Mudança': 'SAÍDA',
+                             'Detalhes': f"Piloto removido: {old_row['NOME']} ({old_row['NOME DE GUERRA']})"})
+    for re in old_res & new_res:
+        old_row = old_df[old_df['RE'] == re].iloc[0]
+        new_row = new_df[new_df['RE'] == re].iloc[0]
+        for change in comparator._detect_changes(old_row, new_row):
+            changes_list.append({'RE': re, 'Nome': new_row['NOME'], 'Mudança': f"MUDANÇA DE {change['campo']}",
+                                 'Detalhes': f"De: {change['valor_antigo']} Para: {change['valor_novo']}"})
+    return pd.DataFrame(changes_list)
+
+def _same_rows(a, b):
+    key = lambda df: sorted(map(tuple, df.astype(str).values.tolist()))
+    return key(a) == key(b)
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', nargs='*', type=int, default=[1000, 10000, 100000])
+    parser.add_argument('--scan-max', type=int, default=10000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'linhas':>8} {'busca por RE (s)':>17} {'compare_lists (s)':>18} {'compare_tables (s)':>19} "
+          f"{'com hashes (s)':>15} {'hashes (s)':>11} {'mudanças':>9}")
+    for rows in args.rows:
+        old_df, new_df = _make_lists(rows)
+        changes, lists_time = _time(lambda: ListComparator().compare_lists(old_df, new_df))
+        tables, tables_time = _time(lambda: compare_tables(old_df.copy(), new_df.copy()))
+        old_fingerprints, fingerprint_time = _time(lambda: row_fingerprints(old_df))
+        new_fingerprints = row_fingerprints(new_df)
+        hashed, hashed_time = _time(lambda: compare_tables(old_df.copy(), new_df.copy(),
+                                                           old_fingerprints, new_fingerprints))
+        if hashed != tables:
+            raise AssertionError(f"Resultados diferentes com hashes com {rows} linhas")
+
+        scan = '-'
+        if rows <= args.scan_max:
+            scan_changes, scan_time = _time(lambda: _scan_compare_lists(old_df, new_df))
+            if not _same_rows(scan_changes, changes):
+                raise AssertionError(f"Resultados diferentes com {rows} linhas")
+            scan = f"{scan_time:.2f}"
+        print(f"{rows:>8} {scan:>17} {lists_time:>18.3f} {tables_time:>19.3f} "
+              f"{hashed_time:>15.3f} {fingerprint_time:>11.3f} {len(changes):>9}")
+
+if __name__ == "__main__":
+    main()
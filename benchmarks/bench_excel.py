@@ -0,0 +1,70 @@
+"""
+Compara pd.read_excel (padrão) com a leitura em blocos de excel_reader numa
+planilha sintética de lista de senioridade.
+
+Uso:
+    python benchmarks/bench_excel.py [linhas]
+"""
+import gc
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pandas as pd
+from openpyxl import Workbook
+
+from excel_reader import read_excel_compact
+
+def _write_workbook(path, rows):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'RE', 'SENIORIDADE',
+                  'BASE', 'ADMISSÃO', 'OBSERVAÇÃO'])
+    functions = ['CMTE', 'COP', 'INSTRUTOR']
+    equipment = ['A320', 'B737', 'E195', 'A330']
+    for i in range(rows):
+        sheet.append([functions[i % 3], equipment[i % 4], f'PILOTO NUMERO {i:06d} DA SILVA',
+                      f'PIL{i:06d}', 100000 + i, i + 1, 'GRU', '2010-01-01', ''])
+    workbook.save(path)
+
+def _measure(func):
+    """Tempo de uma execução sem rastreamento e pico de memória de outra, com tracemalloc."""
+    gc.collect()
+    start = time.perf_counter()
+    df = func()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+def main():
+    logging.disable(logging.INFO)
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'lista.xlsx')
+        _write_workbook(path, rows)
+
+        default_df, default_time, default_peak = _measure(lambda: pd.read_excel(path))
+        compact_df, compact_time, compact_peak = _measure(lambda: read_excel_compact(path))
+
+    mb = 1024 * 1024
+    print(f"Linhas: {rows}")
+    print(f"{'':<22} {'tempo (s)':>10} {'pico (MB)':>10} {'DataFrame (MB)':>15}")
+    print(f"{'pd.read_excel':<22} {default_time:>10.2f} {default_peak / mb:>10.1f} "
+          f"{default_df.memory_usage(deep=True).sum() / mb:>15.1f}")
+    print(f"{'read_excel_compact':<22} {compact_time:>10.2f} {compact_peak / mb:>10.1f} "
+          f"{compact_df.memory_usage(deep=True).sum() / mb:>15.1f}")
+    print(f"Tipos: {dict(compact_df.dtypes.astype(str))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compara a extração completa (page.extract_table() em todas as páginas) com a
+extração por coordenadas de coordinate_extractor.
+
+Uso:
+    python benchmarks/bench_fast_extraction.py lista.pdf [repetições]
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from pdf_extractor import extract_table_from_pdf
+
+def _best_of(repeat, func):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    logging.disable(logging.INFO)
+    pdf_path = sys.argv[1]
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    full_time, full_df = _best_of(repeat, lambda: extract_table_from_pdf(pdf_path))
+    fast_time, fast_df = _best_of(repeat, lambda: extract_table_from_pdf(pdf_path, fast=True))
+
+    print(f"Registros: {len(full_df)}")
+    print(f"extract_table():     {full_time:.3f}s")
+    print(f"por coordenadas:     {fast_time:.3f}s ({full_time / fast_time:.1f}x)")
+    print(f"Resultados idênticos: {full_df.equals(fast_df)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Entradas, saídas e REs comuns: comparator.join_by_re (REs como códigos
+inteiros e tabelas código -> posição) contra os conjuntos de strings da
+versão anterior de app.compare_lists e contra a junção anterior por
+índice de hash (pd.Index.get_indexer).
+
+Os conjuntos de strings não dão as posições das linhas, só quais REs
+entraram, saíram ou ficaram; as duas junções dão as posições usadas por
+diff_fields. "texto" usa os REs como strings e "inteiro" os REs do
+esquema compacto. As linhas são embaralhadas, já que as listas seguem a
+senioridade e não a ordem dos REs.
+
+Uso:
+    python benchmarks/bench_join.py [linhas ...] [--repeat N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+
+from bench_schema import _make_lists
+from comparator import join_by_re
+
+def _string_sets(old_re, new_re):
+    """Forma anterior de app.compare_lists: REs como str e conjuntos do Python."""
+    old_re = pd.Series(old_re).astype(str)
+    new_re = pd.Series(new_re).astype(str)
+    old_res = set(old_re)
+    new_res = set(new_re)
+    return new_re.isin(new_res - old_res), old_re.isin(old_res - new_res), old_res & new_res
+
+def _hash_join(old_re, new_re):
+    """Junção anterior de join_by_re: um pd.Index por lista e get_indexer nos dois sentidos."""
+    old_first = np.flatnonzero(~pd.Series(old_re).duplicated().to_numpy())
+    new_first = np.flatnonzero(~pd.Series(new_re).duplicated().to_numpy())
+    old_index = pd.Index(old_re[old_first])
+    new_index = pd.Index(new_re[new_first])
+    in_old = old_index.get_indexer(new_index)
+    in_new = new_index.get_indexer(old_index)
+    matched = in_old >= 0
+    return new_first[~matched], old_first[in_new < 0], old_first[in_old[matched]], new_first[matched]
+
+def _time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', nargs='*', type=int, default=[10000, 100000, 500000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'linhas':>8} {'REs':>8} {'conjuntos str (ms)':>19} {'hash (ms)':>10} {'códigos (ms)':>13}")
+    for rows in args.rows:
+        old_df, new_df = _make_lists(rows)
+        rng = np.random.default_rng(0)
+        old_df = old_df.iloc[rng.permutation(len(old_df))]
+        new_df = new_df.iloc[rng.permutation(len(new_df))]
+        text = (old_df['RE'].to_numpy(), new_df['RE'].to_numpy())
+        integer = (old_df['RE'].astype('int32').to_numpy(), new_df['RE'].astype('int32').to_numpy())
+        for label, (old_re, new_re) in (('texto', text), ('inteiro', integer)):
+            _, sets_time = _time(lambda: _string_sets(old_re, new_re), args.repeat)
+            expected, hash_time = _time(lambda: _hash_join(old_re, new_re), args.repeat)
+            result, codes_time = _time(lambda: join_by_re(old_re, new_re), args.repeat)
+            assert all(np.array_equal(a, b) for a, b in zip(result, expected))
+            print(f"{rows:>8} {label:>8} {sets_time * 1000:>19.1f} {hash_time * 1000:>10.1f} {codes_time * 1000:>13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Movimentação na lista (movement.analyze_movement) contra a contagem de
+ultrapassagens comparando pares de pilotos.
+
+A contagem por pares é quadrática e só roda até --pairwise-max linhas. Na
+lista nova, 10% dos pilotos recebem uma SENIORIDADE aleatória.
+
+Uso:
+    python benchmarks/bench_movement.py [linhas ...] [--pairwise-max N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+
+from bench_schema import _make_lists
+from movement import analyze_movement
+from schema import to_compact
+
+def _shuffle_seniority(df, fraction=0.1, seed=0):
+    rng = np.random.default_rng(seed)
+    seniority = pd.to_numeric(df['SENIORIDADE']).to_numpy()
+    moved = rng.choice(len(df), int(len(df) * fraction), replace=False)
+    seniority[moved] = rng.integers(1, len(df) + 1, len(moved))
+    df = df.copy()
+    df['SENIORIDADE'] = seniority.astype(str)
+    return df
+
+def _pairwise_overtakes(movement):
+    """Ultrapassagens comparando cada par de pilotos (numpy, O(n²))."""
+    old = movement['POSIÇÃO ANTIGA'].to_numpy()
+    new = movement['POSIÇÃO NOVA'].to_numpy()
+    return np.array([int(((old < old[i]) & (new > new[i])).sum()) for i in range(len(old))])
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', nargs='*', type=int, default=[1000, 10000, 50000])
+    parser.add_argument('--pairwise-max', type=int, default=10000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'linhas':>8} {'por pares (s)':>14} {'texto (s)':>10} {'compacto (s)':>13} {'ultrapassagens':>15}")
+    for rows in args.rows:
+        old_df, new_df = _make_lists(rows)
+        new_df = _shuffle_seniority(new_df)
+        result, text_time = _time(lambda: analyze_movement(old_df, new_df))
+        old_compact, new_compact = to_compact(old_df), to_compact(new_df)
+        _, compact_time = _time(lambda: analyze_movement(old_compact, new_compact))
+        movement = result['pilotos']
+
+        pairwise = '-'
+        if rows <= args.pairwise_max:
+            overtakes, pairwise_time = _time(lambda: _pairwise_overtakes(movement))
+            if not (overtakes == movement['ULTRAPASSOU'].to_numpy()).all():
+                raise AssertionError(f"Resultados diferentes com {rows} linhas")
+            pairwise = f"{pairwise_time:.2f}"
+        print(f"{rows:>8} {pairwise:>14} {text_time:>10.3f} {compact_time:>13.3f} "
+              f"{int(movement['ULTRAPASSOU'].sum()):>15}")
+
+if __name__ == "__main__":
+    main()
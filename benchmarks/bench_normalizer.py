@@ -0,0 +1,67 @@
+"""
+Compara a normalização célula a célula (Series.apply) com a de
+DataNormalizer.normalize_dataframe, feita uma vez por valor distinto de
+cada coluna, numa lista sintética.
+
+Uso:
+    python benchmarks/bench_normalizer.py [linhas]
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pandas as pd
+
+from normalizer import DataNormalizer
+
+def _make_dataframe(rows):
+    functions = [' cmte', 'COP ', 'Instrutor']
+    equipment = ['a320', 'B737 ', 'e195', 'A330']
+    return pd.DataFrame({
+        'FUNÇÃO': [functions[i % 3] for i in range(rows)],
+        'EQUIPAMENTO': [equipment[i % 4] for i in range(rows)],
+        'NOME': [f'  piloto  numero {i:06d}   da silva ' for i in range(rows)],
+        'NOME DE GUERRA': [f'pil{i:06d}' for i in range(rows)],
+        'RE': [f'RE {100000 + i}' for i in range(rows)],
+        'SENIORIDADE': [f'{i + 1:06d}' for i in range(rows)],
+    })
+
+def _normalize_per_cell(normalizer, df):
+    """Implementação anterior: um método Python por célula."""
+    normalized_df = df.copy()
+    for column, normalize in normalizer.column_mappings.items():
+        if column in normalized_df.columns:
+            normalized_df[column] = normalized_df[column].apply(normalize)
+    normalized_df = normalized_df.drop_duplicates()
+    return normalized_df[normalized_df['RE'] != ""]
+
+def _best_time(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main():
+    logging.disable(logging.INFO)
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    df = _make_dataframe(rows)
+    normalizer = DataNormalizer()
+
+    per_cell_df, per_cell_time = _best_time(lambda: _normalize_per_cell(normalizer, df))
+    by_value_df, by_value_time = _best_time(lambda: normalizer.normalize_dataframe(df))
+
+    print(f"Linhas: {rows}")
+    print(f"{'célula a célula (apply)':<26} {per_cell_time:>8.3f} s")
+    print(f"{'por valor distinto':<26} {by_value_time:>8.3f} s")
+    print(f"Aceleração: {per_cell_time / by_value_time:.1f}x")
+    print(f"Resultados idênticos: {per_cell_df.equals(by_value_df)}")
+
+if __name__ == "__main__":
+    main()
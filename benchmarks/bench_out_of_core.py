@@ -0,0 +1,91 @@
+"""
+Comparação fora da memória (out_of_core.compare_out_of_core) contra
+comparator.compare_tables com as duas listas inteiras em memória.
+
+As listas são geradas em lotes, como as páginas de uma extração: a
+comparação em memória junta os lotes antes de comparar, a fora da memória
+os grava em disco à medida que chegam. O pico de memória é medido com
+tracemalloc (alocações do Python e do NumPy), numa execução separada da
+que mede o tempo.
+
+Uso:
+    python benchmarks/bench_out_of_core.py [linhas ...] [--batch-rows N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+
+from comparator import compare_tables
+from out_of_core import compare_out_of_core
+
+FUNCTIONS = np.array(['CMTE', 'COP', 'INSTRUTOR'], dtype=object)
+EQUIPMENT = np.array(['A320', 'B737', 'E195', 'A330'], dtype=object)
+
+def _frame(positions, res):
+    return pd.DataFrame({
+        'FUNÇÃO': FUNCTIONS[positions % 3],
+        'EQUIPAMENTO': EQUIPMENT[positions % 4],
+        'NOME': [f'PILOTO NUMERO {i:06d} DA SILVA' for i in positions],
+        'NOME DE GUERRA': [f'PIL{i:06d}' for i in positions],
+        'RE': [str(re) for re in res],
+        'SENIORIDADE': [str(i + 1) for i in positions],
+    })
+
+def _batches(rows, batch_rows, new=False):
+    """Lotes de uma lista; a lista nova perde 1%, ganha 1% e tem 1% de mudanças de equipamento."""
+    for start in range(0, rows, batch_rows):
+        positions = np.arange(start, min(start + batch_rows, rows))
+        if new:
+            positions = positions[positions % 100 != 0]
+        df = _frame(positions, 100000 + positions)
+        if new:
+            df.loc[positions % 100 == 1, 'EQUIPAMENTO'] = 'B787'
+        yield df
+    if new:
+        for start in range(0, rows // 100, batch_rows):
+            positions = np.arange(start, min(start + batch_rows, rows // 100))
+            yield _frame(positions, 900000 + positions)
+
+def _in_memory(rows, batch_rows):
+    base_df = pd.concat(_batches(rows, batch_rows), ignore_index=True)
+    compare_df = pd.concat(_batches(rows, batch_rows, new=True), ignore_index=True)
+    return compare_tables(base_df, compare_df)
+
+def _out_of_core(rows, batch_rows):
+    return compare_out_of_core(_batches(rows, batch_rows), _batches(rows, batch_rows, new=True))
+
+def _measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', nargs='*', type=int, default=[50000, 100000, 200000, 400000])
+    parser.add_argument('--batch-rows', type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'linhas':>8} {'em memória (s)':>15} {'pico (MB)':>10} {'fora da memória (s)':>20} {'pico (MB)':>10}")
+    for rows in args.rows:
+        expected, memory_time, memory_peak = _measure(_in_memory, rows, args.batch_rows)
+        result, spill_time, spill_peak = _measure(_out_of_core, rows, args.batch_rows)
+        assert result == expected
+        print(f"{rows:>8} {memory_time:>15.2f} {memory_peak:>10.1f} {spill_time:>20.2f} {spill_peak:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Busca de vários REs: o índice de re_index.REIndex contra a filtragem das
+duas listas inteiras para cada RE (busca anterior de app.analyze_re_changes).
+
+Uso:
+    python benchmarks/bench_re_index.py [linhas] [--res N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+
+from bench_schema import _make_lists
+from re_index import REIndex
+
+def _scan_lookup(re, old_df, new_df):
+    """Busca anterior: old_df[old_df['RE'] == re] e new_df[new_df['RE'] == re] por RE."""
+    old_info = old_df[old_df['RE'] == re]
+    new_info = new_df[new_df['RE'] == re]
+    return (old_info.iloc[0].to_dict() if not old_info.empty else None,
+            new_info.iloc[0].to_dict() if not new_info.empty else None)
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', nargs='?', type=int, default=50000)
+    parser.add_argument('--res', type=int, default=300)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    old_df, new_df = _make_lists(args.rows)
+    all_res = pd.concat([old_df['RE'], new_df['RE']]).unique()
+    res = list(np.random.default_rng(0).choice(all_res, min(args.res, len(all_res)), replace=False))
+
+    _, scan_time = _time(lambda: [_scan_lookup(re, old_df, new_df) for re in res])
+    index, build_time = _time(lambda: REIndex(old_df, new_df))
+    _, lookup_time = _time(lambda: index.lookup_many(res))
+
+    print(f"{len(res)} REs em listas de {args.rows} linhas")
+    print(f"  filtragem por RE: {scan_time:.2f} s")
+    print(f"  índice: {build_time:.3f} s para montar + {lookup_time:.3f} s para as buscas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Pareamento de saídas e entradas (reconciliation.match_exits_entries): busca
+por blocos contra a comparação de todos os pares saída x entrada.
+
+Metade das saídas volta como entrada com outro RE (parte delas com um erro
+de digitação no nome); as demais saídas e entradas são pilotos diferentes.
+A comparação de todos os pares é medida numa amostra das saídas e
+extrapolada.
+
+Uso:
+    python benchmarks/bench_reconciliation.py [saídas] [--sample N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+
+from reconciliation import DEFAULT_THRESHOLD, match_exits_entries, name_key, similarity
+
+FIRST_NAMES = ['JOAO', 'JOSE', 'MARIA', 'ANA', 'CARLOS', 'PAULO', 'PEDRO', 'LUCAS', 'MARCOS', 'RAFAEL',
+               'FERNANDA', 'JULIANA', 'BRUNO', 'RODRIGO', 'GABRIEL', 'FELIPE', 'DANIEL', 'THIAGO']
+LAST_NAMES = ['SILVA', 'SANTOS', 'OLIVEIRA', 'SOUZA', 'RODRIGUES', 'FERREIRA', 'ALVES', 'PEREIRA',
+              'LIMA', 'GOMES', 'COSTA', 'RIBEIRO', 'MARTINS', 'CARVALHO', 'ALMEIDA', 'LOPES']
+SYLLABLES = ['BA', 'CO', 'DI', 'FE', 'GA', 'LU', 'MA', 'NO', 'PI', 'RO', 'SA', 'TE', 'VI', 'ZE', 'RA', 'LI']
+
+def _make_names(count, rng):
+    """Nomes com poucos sobrenomes muito comuns e muitos raros (frequência de Zipf)."""
+    first = FIRST_NAMES + sorted({''.join(rng.choice(SYLLABLES, 2)) + rng.choice(['O', 'A', 'EL']) for _ in range(200)})
+    last = LAST_NAMES + sorted({''.join(rng.choice(SYLLABLES, 3)) + rng.choice(['S', 'DO', 'NI', '']) for _ in range(800)})
+    first_p = 1 / np.arange(1, len(first) + 1) ** 0.7
+    last_p = 1 / np.arange(1, len(last) + 1)
+    first_p, last_p = first_p / first_p.sum(), last_p / last_p.sum()
+    names = []
+    for _ in range(count):
+        words = list(rng.choice(first, rng.integers(1, 3), p=first_p)) + list(rng.choice(last, 2, p=last_p))
+        names.append(' '.join(words))
+    return names
+
+def _typo(name, rng):
+    position = int(rng.integers(1, len(name) - 1))
+    return name[:position] + name[position + 1:]
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('exits', nargs='?', type=int, default=3000)
+    parser.add_argument('--sample', type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(0)
+    exit_names = _make_names(args.exits, rng)
+    returning = args.exits // 2
+    entry_names = [_typo(name, rng) if position % 2 else name for position, name in enumerate(exit_names[:returning])]
+    entry_names += _make_names(args.exits - returning, rng)
+    order = rng.permutation(args.exits)
+    entry_names = [entry_names[position] for position in order]
+    exit_war = np.array([name.split()[-1] for name in exit_names], dtype=object)
+    entry_war = np.array([name.split()[-1] for name in entry_names], dtype=object)
+    exit_names = np.array(exit_names, dtype=object)
+    entry_names = np.array(entry_names, dtype=object)
+
+    matches, blocked_time = _time(lambda: match_exits_entries(exit_names, exit_war, entry_names, entry_war))
+    # A entrada j é a posição order[j] antes de embaralhar: o piloto da saída order[j], se voltou
+    correct = sum(int(order[j]) == i and i < returning for i, j, _ in matches)
+
+    entries = [(name_key(name), name_key(war)) for name, war in zip(entry_names, entry_war)]
+    sample = range(min(args.sample, args.exits))
+    _, sample_time = _time(lambda: [
+        similarity(name_key(exit_names[i]), name_key(exit_war[i]), name, war) >= DEFAULT_THRESHOLD
+        for i in sample for name, war in entries
+    ])
+
+    print(f"{args.exits} saídas x {args.exits} entradas ({returning} voltam com outro RE, metade com erro no nome)")
+    print(f"  todos os pares (estimado): {sample_time * args.exits / len(sample):.1f} s")
+    print(f"  blocos: {blocked_time:.2f} s; {len(matches)} pares, {correct} corretos")
+
+if __name__ == "__main__":
+    main()
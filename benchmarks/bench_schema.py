@@ -0,0 +1,102 @@
+"""
+Mede memória e tempo de comparação das listas em texto (object) e no
+esquema compacto de schema.to_compact, com duas listas sintéticas
+(a segunda com entradas, saídas e mudanças de equipamento).
+
+Uso:
+    python benchmarks/bench_schema.py [linhas] [--compare-rows N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pandas as pd
+
+from comparator import ListComparator, compare_tables
+from normalizer import DataNormalizer
+from schema import to_compact
+
+def _make_lists(rows):
+    functions = ['CMTE', 'COP', 'INSTRUTOR']
+    equipment = ['A320', 'B737', 'E195', 'A330']
+    old_df = pd.DataFrame({
+        'FUNÇÃO': [functions[i % 3] for i in range(rows)],
+        'EQUIPAMENTO': [equipment[i % 4] for i in range(rows)],
+        'NOME': [f'PILOTO NUMERO {i:06d} DA SILVA' for i in range(rows)],
+        'NOME DE GUERRA': [f'PIL{i:06d}' for i in range(rows)],
+        'RE': [str(100000 + i) for i in range(rows)],
+        'SENIORIDADE': [str(i + 1) for i in range(rows)],
+    })
+    # Lista seguinte: 1% saiu, 1% entrou e 1% mudou de equipamento
+    step = 100
+    new_df = old_df.drop(index=old_df.index[::step]).copy()
+    new_df.loc[new_df.index[::step], 'EQUIPAMENTO'] = 'B787'
+    entries = old_df.iloc[:rows // step].copy()
+    entries['RE'] = [str(900000 + i) for i in range(len(entries))]
+    new_df = pd.concat([new_df, entries], ignore_index=True)
+    # Os textos da lista nova são objetos próprios, como numa extração real
+    for column in new_df.columns:
+        new_df[column] = [value[:1] + value[1:] for value in new_df[column]]
+    return old_df, new_df
+
+def _footprint(*frames):
+    """Bytes ocupados pelas listas, contando uma única vez cada objeto compartilhado."""
+    total = 0
+    seen = set()
+    for df in frames:
+        for column in df.columns:
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                total += series.cat.codes.memory_usage(index=False)
+                values = series.cat.categories.to_numpy()
+            elif series.dtype == object:
+                total += series.memory_usage(index=False)
+                values = series.to_numpy()
+            else:
+                total += series.memory_usage(index=False)
+                continue
+            for value in values:
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    total += sys.getsizeof(value)
+    return total
+
+def _time(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', nargs='?', type=int, default=100000)
+    parser.add_argument('--compare-rows', type=int, default=5000,
+                        help='linhas usadas na comparação (o comparador percorre a lista para cada RE)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    mb = 1024 * 1024
+
+    old_df, new_df = _make_lists(args.rows)
+    compact_old, compact_new = to_compact(old_df), to_compact(new_df)
+    print(f"Linhas: {args.rows}")
+    print(f"{'':<10} {'memória (MB)':>13} {'normalização (s)':>17}")
+    for label, frames in (('texto', (old_df, new_df)), ('compacto', (compact_old, compact_new))):
+        seconds = _time(lambda: DataNormalizer().normalize_dataframe(frames[0]))
+        print(f"{label:<10} {_footprint(*frames) / mb:>13.1f} {seconds:>17.3f}")
+    print(f"Conversão para o esquema compacto: {_time(lambda: to_compact(old_df)):.3f} s por lista")
+
+    old_df, new_df = _make_lists(args.compare_rows)
+    compact_old, compact_new = to_compact(old_df), to_compact(new_df)
+    print(f"\nComparação com {args.compare_rows} linhas")
+    print(f"{'':<10} {'compare_lists (s)':>18} {'compare_tables (s)':>19}")
+    for label, (base, other) in (('texto', (old_df, new_df)), ('compacto', (compact_old, compact_new))):
+        lists = _time(lambda: ListComparator().compare_lists(base, other))
+        tables = _time(lambda: compare_tables(base.copy(), other.copy()))
+        print(f"{label:<10} {lists:>18.2f} {tables:>19.2f}")
+
+if __name__ == "__main__":
+    main()
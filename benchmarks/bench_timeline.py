@@ -0,0 +1,74 @@
+"""
+Histórico de N listas mensais (timeline.SeniorityTimeline) contra N-1
+comparações independentes com ListComparator.compare_lists.
+
+Também mede as consultas por piloto no histórico (trajetória de
+senioridade e mudanças de equipamento), que não refazem comparações.
+
+Uso:
+    python benchmarks/bench_timeline.py [linhas] [--snapshots N] [--queries N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+
+from bench_schema import _make_lists
+from comparator import ListComparator
+from schema import to_compact
+from timeline import SeniorityTimeline
+
+def _make_snapshots(rows, count, seed=0):
+    """Listas mensais: a cada mês 1% sai, 1% entra e 1% muda de equipamento."""
+    rng = np.random.default_rng(seed)
+    current, _ = _make_lists(rows)
+    step = max(rows // 100, 1)
+    snapshots = []
+    for month in range(count):
+        snapshots.append((f"2024-{month + 1:02d}", to_compact(current)))
+        kept = np.sort(rng.choice(len(current), len(current) - step, replace=False))
+        following = current.iloc[kept].copy()
+        following.iloc[rng.choice(len(following), step, replace=False), 1] = 'B787'
+        entries = current.iloc[:step].copy()
+        entries['RE'] = [str(200000 + month * 10000 + i) for i in range(step)]
+        current = pd.concat([following, entries], ignore_index=True)
+        current['SENIORIDADE'] = [str(i + 1) for i in range(len(current))]
+    return snapshots
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', nargs='?', type=int, default=50000)
+    parser.add_argument('--snapshots', type=int, default=12)
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    snapshots = _make_snapshots(args.rows, args.snapshots)
+    _, pairwise_time = _time(lambda: [
+        ListComparator().compare_lists(old, new) for (_, old), (_, new) in zip(snapshots, snapshots[1:])
+    ])
+    timeline, build_time = _time(lambda: SeniorityTimeline.from_snapshots(snapshots))
+    _, index_time = _time(timeline._build_indexes)
+
+    res = snapshots[0][1]['RE'].to_numpy()[::max(args.rows // args.queries, 1)][:args.queries]
+    _, query_time = _time(lambda: [(timeline.seniority_trajectory(re), timeline.equipment_changes(re)) for re in res])
+
+    print(f"{args.snapshots} listas de {args.rows} linhas")
+    print(f"  {args.snapshots - 1} comparações independentes: {pairwise_time:.2f} s")
+    print(f"  histórico (diferenças consecutivas): {build_time:.2f} s + índices {index_time:.2f} s")
+    print(f"  consultas por piloto: {query_time / len(res) * 1000:.2f} ms cada ({len(res)} pilotos)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Matrizes de transição de FUNÇÃO, EQUIPAMENTO e da combinação dos dois
+(transitions.transition_matrices, contadas com np.bincount) contra
+pd.crosstab nas mesmas colunas alinhadas pelo RE e contra a extração das
+transições dos textos 'De: X Para: Y' de compare_tables, forma usada até
+aqui (só de FUNÇÃO e EQUIPAMENTO, sem a diagonal).
+
+Uso:
+    python benchmarks/bench_transitions.py [linhas ...] [--changed F]
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pandas as pd
+
+from bench_change_set import _with_changes
+from comparator import compare_tables, join_by_re
+from transitions import COMBINED, transition_matrices
+
+DETAILS = re.compile(r'De: (.*) Para: (.*)')
+
+def _crosstab(old_df, new_df):
+    _, _, common_old, common_new = join_by_re(old_df['RE'].to_numpy(), new_df['RE'].to_numpy())
+    old = old_df.iloc[common_old].reset_index(drop=True)
+    new = new_df.iloc[common_new].reset_index(drop=True)
+    matrices = {column: pd.crosstab(old[column], new[column]) for column in ['FUNÇÃO', 'EQUIPAMENTO']}
+    matrices[COMBINED] = pd.crosstab(old['FUNÇÃO'] + ' / ' + old['EQUIPAMENTO'],
+                                     new['FUNÇÃO'] + ' / ' + new['EQUIPAMENTO'])
+    return matrices
+
+def _from_text(differences):
+    counts = {column: Counter() for column in ['FUNÇÃO', 'EQUIPAMENTO']}
+    for record in differences:
+        column = record['Tipo'].replace('MUDANÇA DE ', '')
+        if column in counts:
+            counts[column][DETAILS.match(record['Detalhes']).groups()] += 1
+    return counts
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('rows', nargs='*', type=int, default=[50000, 100000, 200000])
+    parser.add_argument('--changed', type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'linhas':>8} {'bincount (s)':>13} {'crosstab (s)':>13} {'textos (s)':>11}")
+    for rows in args.rows:
+        old_df, new_df = _with_changes(rows, args.changed)
+        matrices, bincount_time = _time(lambda: transition_matrices(old_df, new_df))
+        expected, crosstab_time = _time(lambda: _crosstab(old_df, new_df))
+        for name, matrix in expected.items():
+            assert matrix.equals(matrices[name].loc[matrix.index, matrix.columns].rename_axis(
+                index=matrix.index.name, columns=matrix.columns.name))
+        differences = compare_tables(old_df.copy(), new_df.copy())['differences']
+        _, text_time = _time(lambda: _from_text(differences))
+        print(f"{rows:>8} {bincount_time:>13.3f} {crosstab_time:>13.3f} {text_time:>11.3f}")
+
+if __name__ == "__main__":
+    main()
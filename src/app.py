@@ -1,6 +1,14 @@
+import os
 import streamlit as st
-import pdfplumber
 import pandas as pd
+import numpy as np
+from typing import Dict, List
+from comparator import re_codes
+from extraction_engine import ExtractionEngine, PdfTableBackend
+from normalizer import DataNormalizer
+from pdf_extractor import find_re_rows
+from re_index import REIndex, parse_re_list
+from snapshot_store import SnapshotStore
 
 st.set_page_config(
     page_title="Comparador de Listas de Senioridade",
@@ -8,51 +16,26 @@ st.set_page_config(
     layout="wide"
 )
 
+# Arquivo de listas guardadas; desabilitado sem SENIORIDADE_SNAPSHOT_DIR
+SNAPSHOT_DIR = os.environ.get('SENIORIDADE_SNAPSHOT_DIR')
+
 def extract_table_from_pdf(pdf_file) -> pd.DataFrame:
     """
-    Extrai a tabela de um arquivo PDF, ignorando cabeçalho e rodapé.
+    Extrai a tabela de um arquivo PDF, ignorando cabeçalho e rodapé, e normaliza os dados.
     """
     try:
-        all_tables = []
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages:
-                # Extrai tabelas da página
-                tables = page.extract_tables()
-                if tables:
-                    # Pega a primeira tabela de cada página
-                    table = tables[0]
-                    # Converte para DataFrame
-                    df = pd.DataFrame(table[1:], columns=table[0])  # Primeira linha como cabeçalho
-                    all_tables.append(df)
-        
-        if not all_tables:
-            raise ValueError("Nenhuma tabela encontrada no PDF")
-        
-        # Combina todas as tabelas
-        final_df = pd.concat(all_tables, ignore_index=True)
-        
-        # Limpa os dados
-        final_df = clean_dataframe(final_df)
-        
-        return final_df
+        return DataNormalizer().normalize_dataframe(ExtractionEngine(PdfTableBackend()).extract(pdf_file))
         
     except Exception as e:
         st.error(f"Erro ao extrair tabela do PDF: {str(e)}")
         raise
 
-def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+def load_snapshot(store: SnapshotStore, snapshot_id: str) -> pd.DataFrame:
     """
-    Limpa e padroniza o DataFrame.
+    Carrega uma lista guardada, com os valores ausentes como None (como na extração).
     """
-    # Remove linhas vazias
-    df = df.dropna(how='all')
-    
-    # Remove espaços em branco
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].str.strip()
-    
-    return df
+    df = store.load(snapshot_id)
+    return df.astype(object).where(df.notna(), None)
 
 def compare_lists(old_df: pd.DataFrame, new_df: pd.DataFrame) -> dict:
     """
@@ -66,15 +49,14 @@ def compare_lists(old_df: pd.DataFrame, new_df: pd.DataFrame) -> dict:
     old_df['RE'] = old_df['RE'].astype(str)
     new_df['RE'] = new_df['RE'].astype(str)
     
-    # Encontra entradas e saídas
-    old_res = set(old_df['RE'])
-    new_res = set(new_df['RE'])
+    # Encontra entradas e saídas pelos REs como inteiros
+    old_codes, new_codes, _ = re_codes(old_df['RE'].to_numpy(), new_df['RE'].to_numpy())
     
     # Pessoas que entraram (estão na nova lista mas não na antiga)
-    entries = new_df[new_df['RE'].isin(new_res - old_res)]
+    entries = new_df[~np.isin(new_codes, old_codes)]
     
     # Pessoas que saíram (estão na lista antiga mas não na nova)
-    exits = old_df[old_df['RE'].isin(old_res - new_res)]
+    exits = old_df[~np.isin(old_codes, new_codes)]
     
     return {
         'entradas': entries,
@@ -89,57 +71,49 @@ def analyze_re_changes(re: str, old_df: pd.DataFrame, new_df: pd.DataFrame) -> d
     """
     Analisa as mudanças específicas de um RE entre as listas.
     """
-    # Converte RE para string
-    re = str(re)
-    
-    # Busca o RE nas duas listas
-    old_info = old_df[old_df['RE'] == re]
-    new_info = new_df[new_df['RE'] == re]
-    
-    if old_info.empty and new_info.empty:
-        return {
-            'status': 'not_found',
-            'message': 'RE não encontrado em nenhuma das listas'
-        }
-    
-    if old_info.empty:
-        return {
-            'status': 'new_entry',
-            'message': 'RE encontrado apenas na lista nova',
-            'data': new_info.iloc[0].to_dict()
-        }
-    
-    if new_info.empty:
-        return {
-            'status': 'exit',
-            'message': 'RE encontrado apenas na lista antiga',
-            'data': old_info.iloc[0].to_dict()
-        }
-    
-    # Se encontrou em ambas as listas, compara as mudanças
-    old_row = old_info.iloc[0]
-    new_row = new_info.iloc[0]
-    
-    changes = []
-    
-    # Verifica mudanças em cada coluna
-    for col in old_df.columns:
-        if old_row[col] != new_row[col]:
-            changes.append({
-                'campo': col,
-                'valor_antigo': old_row[col],
-                'valor_novo': new_row[col]
-            })
-    
-    return {
-        'status': 'changed',
-        'message': 'RE encontrado em ambas as listas com mudanças',
-        'data': {
-            'antigo': old_row.to_dict(),
-            'novo': new_row.to_dict(),
-            'mudancas': changes
-        }
-    }
+    return REIndex(old_df, new_df).lookup(re)
+
+def analyze_re_list(res: List[str], old_df: pd.DataFrame, new_df: pd.DataFrame) -> Dict[str, dict]:
+    """
+    Analisa vários REs de uma vez, com o índice das listas montado uma única vez.
+    """
+    return REIndex(old_df, new_df).lookup_many(res)
+
+def lookup_res(res: List[str], old_file, new_file) -> Dict[str, dict]:
+    """
+    Analisa REs lendo apenas as páginas dos PDFs que os contêm.
+    """
+    res = [str(re).strip() for re in res]
+    old_rows = find_re_rows(old_file, res)
+    new_rows = find_re_rows(new_file, res)
+    return analyze_re_list(res, old_rows, new_rows)
+
+def lookup_re(re: str, old_file, new_file) -> dict:
+    """
+    Analisa um RE lendo apenas as páginas dos PDFs que o contêm.
+    """
+    return next(iter(lookup_res([re], old_file, new_file).values()))
+
+def show_re_changes(re: str, changes: dict) -> None:
+    """
+    Mostra o resultado da análise de um RE.
+    """
+    st.markdown(f"### 📊 Análise do RE {re}")
+    if changes['status'] == 'not_found':
+        st.warning(changes['message'])
+    elif changes['status'] == 'new_entry':
+        st.success(f"Novo na lista! Dados: {changes['data']}")
+    elif changes['status'] == 'exit':
+        st.error(f"Saiu da lista. Dados: {changes['data']}")
+    else:  # changed
+        st.info("Mudanças encontradas:")
+        
+        # Mostra as mudanças em um formato mais amigável
+        for change in changes['data']['mudancas']:
+            st.write(f"**{change['campo']}**:")
+            st.write(f"- Antigo: {change['valor_antigo']}")
+            st.write(f"- Novo: {change['valor_novo']}")
+            st.write("---")
 
 def main():
     st.title("📄 Comparador de Listas de Senioridade")
@@ -149,55 +123,70 @@ def main():
     Faça upload dos arquivos PDF das listas antiga e nova para ver as mudanças.
     """)
     
+    # Com o arquivo de listas habilitado, as listas já extraídas ficam
+    # guardadas para as próximas comparações
+    store = SnapshotStore(SNAPSHOT_DIR) if SNAPSHOT_DIR else None
+    latest = store.latest() if store is not None else None
+    if store is not None:
+        st.markdown("As listas processadas ficam guardadas e a lista antiga pode ser a última guardada.")
+    
     # Seção de busca por RE
     st.subheader("🔍 Buscar por RE")
-    re_input = st.text_input("Digite o RE para ver as mudanças específicas:")
+    re_input = st.text_input("Digite o RE (ou vários, separados por vírgula) para ver as mudanças específicas:")
+    res = parse_re_list(re_input)
     
     # Upload dos arquivos
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Lista Antiga")
-        old_file = st.file_uploader("Upload da lista antiga (PDF)", type=['pdf'])
+        use_stored = latest is not None and st.checkbox(
+            f"Usar a última lista guardada ({latest['label']}, {latest['source'] or 'sem nome'})"
+        )
+        old_file = None if use_stored else st.file_uploader("Upload da lista antiga (PDF)", type=['pdf'])
     
     with col2:
         st.subheader("Lista Nova")
         new_file = st.file_uploader("Upload da lista nova (PDF)", type=['pdf'])
     
     # Botão para executar a análise
-    if old_file is not None and new_file is not None:
+    if (old_file is not None or use_stored) and new_file is not None:
         execute_button = st.button("🔍 Executar Análise", type="primary")
         
         if execute_button:
             try:
-                # Extrai as tabelas dos PDFs
+                # Se houver um RE para buscar, analisa as mudanças lendo só as páginas dele
+                if res and not use_stored:
+                    with st.spinner("Buscando os REs..."):
+                        for re, changes in lookup_res(res, old_file, new_file).items():
+                            show_re_changes(re, changes)
+                
+                # Extrai as tabelas dos PDFs; arquivos já guardados não são extraídos de novo
                 with st.spinner("Processando as listas..."):
-                    old_df = extract_table_from_pdf(old_file)
-                    new_df = extract_table_from_pdf(new_file)
+                    if store is None:
+                        old_df = extract_table_from_pdf(old_file)
+                        new_df = extract_table_from_pdf(new_file)
+                    else:
+                        new_id = store.get_or_extract(new_file, lambda: extract_table_from_pdf(new_file),
+                                                      source=new_file.name)
+                        if use_stored:
+                            old_snapshot = latest if latest['id'] != new_id else store.latest(exclude=new_id)
+                            if old_snapshot is None:
+                                raise ValueError("Não há outra lista guardada para comparar com a lista nova")
+                            old_id = old_snapshot['id']
+                        else:
+                            old_id = store.get_or_extract(old_file, lambda: extract_table_from_pdf(old_file),
+                                                          source=old_file.name)
+                        old_df = load_snapshot(store, old_id)
+                        new_df = load_snapshot(store, new_id)
                     
                     # Compara as listas
                     comparison = compare_lists(old_df, new_df)
-                    
-                    # Se houver um RE para buscar, analisa as mudanças
-                    if re_input:
-                        changes = analyze_re_changes(re_input, old_df, new_df)
-                        
-                        st.markdown("### 📊 Análise do RE")
-                        if changes['status'] == 'not_found':
-                            st.warning(changes['message'])
-                        elif changes['status'] == 'new_entry':
-                            st.success(f"Novo na lista! Dados: {changes['data']}")
-                        elif changes['status'] == 'exit':
-                            st.error(f"Saiu da lista. Dados: {changes['data']}")
-                        else:  # changed
-                            st.info("Mudanças encontradas:")
-                            
-                            # Mostra as mudanças em um formato mais amigável
-                            for change in changes['data']['mudancas']:
-                                st.write(f"**{change['campo']}**:")
-                                st.write(f"- Antigo: {change['valor_antigo']}")
-                                st.write(f"- Novo: {change['valor_novo']}")
-                                st.write("---")
+                
+                # Com a lista antiga guardada, o RE é analisado nas tabelas já carregadas
+                if res and use_stored:
+                    for re, changes in analyze_re_list(res, old_df, new_df).items():
+                        show_re_changes(re, changes)
                 
                 # Mostra estatísticas gerais
                 st.markdown("### 📈 Estatísticas Gerais")
@@ -0,0 +1,288 @@
+import logging
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tipos de mudança, guardados como códigos int8 em ChangeSet.kind
+ENTRY = 0
+EXIT = 1
+RE_CHANGE = 2
+FIELD_CHANGE = 3
+KIND_LABELS = ('ENTRADA', 'SAÍDA', 'POSSÍVEL MUDANÇA DE RE')
+
+# Dados do piloto repetidos em cada registro de compare_tables (coluna -> chave do registro)
+PILOT_COLUMNS = {'NOME': 'Nome', 'NOME DE GUERRA': 'Nome de Guerra', 'FUNÇÃO': 'Função', 'EQUIPAMENTO': 'Equipamento'}
+
+# Formatos de saída: registros de compare_tables ou relatório de ListComparator.compare_lists
+STYLES = ('tables', 'lists')
+
+def _object_array(values, size: Optional[int] = None) -> np.ndarray:
+    """Array de objetos (valores escalares, sem conversão de tipo); um valor único é repetido size vezes."""
+    if size is not None:
+        result = np.empty(size, dtype=object)
+        result[:] = [values] * size
+        return result
+    result = np.empty(len(values), dtype=object)
+    result[:] = list(values)
+    return result
+
+class ChangeSet(Sequence):
+    """
+    Mudanças entre duas listas de senioridade em formato colunar.
+
+    Cada mudança é uma posição nos arrays:
+        - re: RE do piloto (na lista nova, ou na antiga para as saídas);
+        - kind: tipo (ENTRY, EXIT, RE_CHANGE ou FIELD_CHANGE);
+        - field: índice do campo em fields (-1 fora das mudanças de campo);
+        - old / new: valores antigo e novo do campo; nas mudanças de RE, o
+          RE antigo e o novo;
+        - score e old_name: semelhança dos nomes e NOME na lista antiga,
+          só nas mudanças de RE;
+        - pilots: NOME, NOME DE GUERRA, FUNÇÃO e EQUIPAMENTO do piloto
+          ('N/A' quando a coluna não existe na lista).
+
+    Filtrar (select, take) e contar (counts) usam só os códigos; os textos
+    dos relatórios ('Tipo', 'Detalhes') são montados em to_records, to_frame
+    ou ao acessar um item, e só para as mudanças pedidas. Como sequência,
+    um ChangeSet se comporta como a lista de registros de compare_tables.
+    """
+
+    def __init__(self, re: np.ndarray, kind: np.ndarray, field: np.ndarray, old: np.ndarray, new: np.ndarray,
+                 fields: List[str], pilots: Dict[str, np.ndarray], score: Optional[np.ndarray] = None,
+                 old_name: Optional[np.ndarray] = None):
+        size = len(re)
+        self.re = re
+        self.kind = np.asarray(kind, dtype=np.int8)
+        self.field = np.asarray(field, dtype=np.int8)
+        self.old = old
+        self.new = new
+        self.fields = list(fields)
+        self.pilots = {column: pilots.get(column, _object_array('N/A', size)) for column in PILOT_COLUMNS}
+        self.score = np.full(size, np.nan) if score is None else np.asarray(score, dtype=np.float64)
+        self.old_name = _object_array(None, size) if old_name is None else old_name
+
+    @classmethod
+    def empty(cls, fields: Iterable[str] = ()) -> 'ChangeSet':
+        """ChangeSet sem mudanças."""
+        nothing = _object_array([])
+        return cls(nothing, [], [], nothing, nothing, list(fields), {})
+
+    @classmethod
+    def from_positions(cls, base_columns: Dict[str, np.ndarray], compare_columns: Dict[str, np.ndarray],
+                       entered: np.ndarray, left: np.ndarray, reconciled: List[Tuple[int, int, float]],
+                       changed_base: np.ndarray, changed_compare: np.ndarray,
+                       masks: Dict[str, np.ndarray]) -> 'ChangeSet':
+        """
+        Monta o ChangeSet a partir das posições de uma comparação, sem formatar textos.
+
+        Args:
+            base_columns: Valores das colunas da lista antiga (ver comparator._column_values)
+            compare_columns: Valores das colunas da lista nova
+            entered: Posições das entradas na lista nova
+            left: Posições das saídas na lista antiga
+            reconciled: Saídas e entradas pareadas (posição antiga, posição nova, semelhança)
+            changed_base: Posições dos pares comparados na lista antiga
+            changed_compare: Posições correspondentes na lista nova
+            masks: Campos alterados de cada par (ver comparator.diff_fields)
+
+        Returns:
+            Mudanças na ordem de compare_tables: entradas, saídas, mudanças
+            de RE e mudanças de campo (por par e na ordem dos campos)
+        """
+        fields = list(masks)
+        if fields:
+            rows, codes = np.nonzero(np.column_stack([masks[field] for field in fields]))
+        else:
+            rows = codes = np.array([], dtype=np.int64)
+        entered = np.asarray(entered, dtype=np.int64)
+        left = np.asarray(left, dtype=np.int64)
+        paired_base = np.array([base for base, _, _ in reconciled], dtype=np.int64)
+        paired_compare = np.array([compare for _, compare, _ in reconciled], dtype=np.int64)
+        scores = np.array([score for _, _, score in reconciled], dtype=np.float64)
+        field_base = np.asarray(changed_base, dtype=np.int64)[rows]
+        field_compare = np.asarray(changed_compare, dtype=np.int64)[rows]
+
+        # Linhas de onde vêm os dados do piloto: a nova, ou a antiga nas saídas
+        sources = [(compare_columns, entered), (base_columns, left),
+                   (compare_columns, paired_compare), (compare_columns, field_compare)]
+
+        def gather(column):
+            return np.concatenate([
+                columns[column][positions] if column in columns else _object_array('N/A', len(positions))
+                for columns, positions in sources
+            ])
+
+        counts = [len(entered), len(left), len(reconciled), len(rows)]
+        size = sum(counts)
+        old = _object_array(None, size)
+        new = _object_array(None, size)
+        start = counts[0] + counts[1]
+        old[start:start + counts[2]] = base_columns['RE'][paired_base]
+        new[start:start + counts[2]] = compare_columns['RE'][paired_compare]
+        start += counts[2]
+        for code, field in enumerate(fields):
+            selected = np.flatnonzero(codes == code)
+            old[start + selected] = base_columns[field][field_base[selected]]
+            new[start + selected] = compare_columns[field][field_compare[selected]]
+
+        score = np.full(size, np.nan)
+        score[counts[0] + counts[1]:start] = scores
+        old_name = _object_array(None, size)
+        if 'NOME' in base_columns:
+            old_name[counts[0] + counts[1]:start] = base_columns['NOME'][paired_base]
+
+        return cls(
+            re=gather('RE'),
+            kind=np.repeat(np.array([ENTRY, EXIT, RE_CHANGE, FIELD_CHANGE], dtype=np.int8), counts),
+            field=np.concatenate([np.full(size - len(codes), -1), codes]),
+            old=old,
+            new=new,
+            fields=fields,
+            pilots={column: gather(column) for column in PILOT_COLUMNS},
+            score=score,
+            old_name=old_name
+        )
+
+    def __len__(self) -> int:
+        return len(self.re)
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            return self.take(np.arange(len(self))[item])
+        position = range(len(self))[item]
+        return next(self._iter_records([position], 'tables'))
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self._iter_records(range(len(self)), 'tables')
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ChangeSet, list)):
+            return self.to_records() == list(other)
+        return NotImplemented
+
+    # Mutável e comparável com listas: não pode ser chave de dicionário
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ChangeSet({len(self)} mudanças: {self.counts().to_dict()})"
+
+    def take(self, positions: np.ndarray) -> 'ChangeSet':
+        """Mudanças nas posições indicadas, na ordem indicada."""
+        positions = np.asarray(positions, dtype=np.int64)
+        return ChangeSet(
+            self.re[positions], self.kind[positions], self.field[positions], self.old[positions],
+            self.new[positions], self.fields, {column: values[positions] for column, values in self.pilots.items()},
+            self.score[positions], self.old_name[positions]
+        )
+
+    def filter(self, mask: np.ndarray) -> 'ChangeSet':
+        """Mudanças em que a máscara booleana é verdadeira."""
+        return self.take(np.flatnonzero(mask))
+
+    def select(self, kinds: Optional[Iterable] = None, fields: Optional[Iterable[str]] = None,
+               res: Optional[Iterable] = None) -> 'ChangeSet':
+        """
+        Filtra as mudanças pelos códigos, sem montar textos.
+
+        Args:
+            kinds: Tipos mantidos, como códigos (ENTRY, EXIT, RE_CHANGE,
+                FIELD_CHANGE) ou rótulos de 'Tipo' ('ENTRADA', 'MUDANÇA DE NOME'...)
+            fields: Campos mantidos (só mudanças de campo desses campos)
+            res: REs mantidos
+
+        Returns:
+            Novo ChangeSet com as mudanças selecionadas
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if kinds is not None:
+            labels = self._label_table()
+            codes = [labels.index(kind) if isinstance(kind, str) else int(kind) for kind in kinds]
+            type_codes = self._type_codes()
+            kind_mask = np.isin(self.kind, [code for code in codes if code < FIELD_CHANGE])
+            if FIELD_CHANGE in codes:
+                kind_mask |= self.kind == FIELD_CHANGE
+            kind_mask |= np.isin(type_codes, [code for code in codes if code > FIELD_CHANGE])
+            mask &= kind_mask
+        if fields is not None:
+            codes = [self.fields.index(field) for field in fields if field in self.fields]
+            mask &= (self.kind == FIELD_CHANGE) & np.isin(self.field, codes)
+        if res is not None:
+            wanted = pd.Index([str(re).strip() for re in res])
+            mask &= wanted.get_indexer(pd.Index([str(re) for re in self.re])) >= 0
+        return self.filter(mask)
+
+    def _label_table(self) -> List[str]:
+        """Rótulos de 'Tipo': os de KIND_LABELS e, a partir de FIELD_CHANGE + 1, um por campo."""
+        return list(KIND_LABELS) + ['MUDANÇA DE CAMPO'] + [f"MUDANÇA DE {field}" for field in self.fields]
+
+    def _type_codes(self) -> np.ndarray:
+        """Código de cada mudança em _label_table (mudanças de campo separadas por campo)."""
+        return np.where(self.kind == FIELD_CHANGE, FIELD_CHANGE + 1 + self.field.astype(np.int64),
+                        self.kind.astype(np.int64))
+
+    def labels(self) -> np.ndarray:
+        """Rótulo de 'Tipo' de cada mudança."""
+        return np.array(self._label_table(), dtype=object)[self._type_codes()]
+
+    def counts(self) -> pd.Series:
+        """Número de mudanças por rótulo de 'Tipo', só dos tipos que ocorreram."""
+        table = self._label_table()
+        counts = np.bincount(self._type_codes(), minlength=len(table))
+        series = pd.Series(counts, index=table, name='Quantidade')
+        return series[series > 0]
+
+    def _label(self, position: int, table: List[str]) -> str:
+        kind = self.kind[position]
+        return table[FIELD_CHANGE + 1 + self.field[position]] if kind == FIELD_CHANGE else table[kind]
+
+    def _details(self, position: int, style: str) -> str:
+        kind = self.kind[position]
+        re = self.re[position]
+        if kind == FIELD_CHANGE:
+            return f"De: {self.old[position]} Para: {self.new[position]}"
+        if kind == RE_CHANGE:
+            return (f"De: RE {self.old[position]} ({self.old_name[position]}) Para: RE {re} "
+                    f"(semelhança {self.score[position]:.2f})")
+        if style == 'lists':
+            name = f"{self.pilots['NOME'][position]} ({self.pilots['NOME DE GUERRA'][position]})"
+            return f"Novo piloto: {name}" if kind == ENTRY else f"Piloto removido: {name}"
+        return f"Novo piloto: RE {re}" if kind == ENTRY else f"Piloto removido: RE {re}"
+
+    def _iter_records(self, positions: Iterable[int], style: str) -> Iterator[Dict]:
+        """Monta, uma a uma, os registros de texto das posições pedidas."""
+        if style not in STYLES:
+            raise ValueError(f"Formato inválido: {style}")
+        table = self._label_table()
+        for position in positions:
+            label = self._label(position, table)
+            details = self._details(position, style)
+            if style == 'lists':
+                yield {'RE': self.re[position], 'Nome': self.pilots['NOME'][position],
+                       'Mudança': label, 'Detalhes': details}
+            else:
+                record = {'RE': self.re[position]}
+                record.update({key: self.pilots[column][position] for column, key in PILOT_COLUMNS.items()})
+                record['Tipo'] = label
+                record['Detalhes'] = details
+                yield record
+
+    def to_records(self, style: str = 'tables') -> List[Dict]:
+        """
+        Monta os registros de texto.
+
+        Args:
+            style: 'tables' para os registros de compare_tables (RE, Nome,
+                Nome de Guerra, Função, Equipamento, Tipo, Detalhes) ou
+                'lists' para os de ListComparator.compare_lists (RE, Nome,
+                Mudança, Detalhes)
+        """
+        return list(self._iter_records(range(len(self)), style))
+
+    def to_frame(self, style: str = 'tables') -> pd.DataFrame:
+        """Registros de to_records como DataFrame."""
+        return pd.DataFrame(self.to_records(style))
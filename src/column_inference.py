@@ -0,0 +1,151 @@
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Número máximo de linhas avaliadas por coluna; o custo da inferência não
+# cresce com o tamanho da lista
+DEFAULT_SAMPLE_SIZE = 500
+
+# Pontuação mínima para uma coluna ser associada a um nome padronizado
+MIN_SCORE = 0.5
+
+# Mapeamentos já inferidos, por conjunto de cabeçalhos (layout)
+_MAPPING_CACHE_SIZE = 64
+_mapping_cache: 'OrderedDict[Tuple[str, ...], Dict]' = OrderedDict()
+
+def _sample_rows(df: pd.DataFrame, sample_size: int) -> pd.DataFrame:
+    """Amostra de até sample_size linhas espaçadas igualmente, na ordem original."""
+    if len(df) <= sample_size:
+        return df
+    positions = np.unique(np.linspace(0, len(df) - 1, sample_size).astype(np.int64))
+    return df.iloc[positions]
+
+def score_columns(df: pd.DataFrame, sample_size: int = DEFAULT_SAMPLE_SIZE) -> pd.DataFrame:
+    """
+    Pontua cada coluna quanto à semelhança com cada coluna da lista de senioridade.
+
+    Todas as células da amostra são avaliadas de uma vez (uma única Series
+    com todas as colunas empilhadas) e agregadas por coluna.
+
+    Args:
+        df: DataFrame com os cabeçalhos originais do arquivo
+        sample_size: Número máximo de linhas avaliadas
+
+    Returns:
+        DataFrame com uma linha por coluna do arquivo e uma coluna por nome
+        padronizado, com pontuações entre 0 e 1
+    """
+    sample = _sample_rows(df, sample_size)
+    rows = len(sample)
+    columns = list(sample.columns)
+    if rows == 0 or not columns:
+        return pd.DataFrame(index=columns, dtype=float)
+
+    values = sample.to_numpy(dtype=object).ravel(order='F')
+    labels = np.repeat(np.arange(len(columns)), rows)
+    present = ~pd.isna(values)
+
+    cells = pd.Series(values[present]).astype(str).str.strip()
+    labels = labels[present]
+    cells_upper = cells.str.upper()
+
+    features = pd.DataFrame({
+        'column': labels,
+        're': cells.str.fullmatch(r'\D{0,3}\d{5,6}\D{0,3}'),
+        'int': cells.str.fullmatch(r'\d{1,6}'),
+        'name': cells_upper.str.fullmatch(r"[^\W\d_]+(?:[ '.\-]+[^\W\d_]+)+"),
+        'word': cells_upper.str.fullmatch(r"[^\W\d_]+"),
+        'alnum_code': cells_upper.str.fullmatch(r'[A-Z]*\d+[A-Z0-9\-]*|[A-Z]+\d+[A-Z0-9\-]*'),
+        'value': cells_upper,
+    })
+
+    grouped = features.groupby('column')
+    rates = grouped[['re', 'int', 'name', 'word', 'alnum_code']].mean()
+    counts = grouped['value'].count()
+    distinct = grouped['value'].nunique() / counts
+    numbers = pd.to_numeric(features['value'].where(features['int']), errors='coerce')
+    increasing = numbers.groupby(features['column']).apply(lambda s: s.dropna().is_monotonic_increasing)
+    filled = counts / rows
+
+    scores = pd.DataFrame(index=rates.index)
+    scores['RE'] = rates['re'] * (0.5 + 0.5 * distinct)
+    scores['SENIORIDADE'] = rates['int'] * distinct * increasing.reindex(rates.index, fill_value=False).astype(float)
+    scores['NOME'] = rates['name'] * distinct
+    scores['NOME DE GUERRA'] = rates['word'] * distinct
+    low_cardinality = (distinct <= 0.2).astype(float)
+    scores['EQUIPAMENTO'] = rates['alnum_code'] * low_cardinality
+    scores['FUNÇÃO'] = rates['word'] * low_cardinality
+    scores = scores.mul(filled, axis=0)
+
+    scores.index = [columns[i] for i in scores.index]
+    return scores.reindex(columns).fillna(0.0)
+
+def infer_column_mapping(df: pd.DataFrame, sample_size: int = DEFAULT_SAMPLE_SIZE,
+                         use_cache: bool = True) -> Dict:
+    """
+    Associa colunas do arquivo aos nomes padronizados da lista de senioridade.
+
+    As associações são escolhidas da maior para a menor pontuação, sem
+    repetir colunas nem nomes. O resultado fica guardado por conjunto de
+    cabeçalhos, e arquivos com o mesmo layout reaproveitam o mapeamento sem
+    nova amostragem.
+
+    Returns:
+        Dicionário {coluna do arquivo: nome padronizado}
+    """
+    key = tuple(str(col) for col in df.columns)
+    if use_cache and key in _mapping_cache:
+        _mapping_cache.move_to_end(key)
+        return dict(_mapping_cache[key])
+
+    scores = score_columns(df, sample_size)
+    candidates = scores.stack()
+    candidates = candidates[candidates >= MIN_SCORE].sort_values(ascending=False, kind='stable')
+
+    mapping = {}
+    used = set()
+    for (column, canonical), score in candidates.items():
+        if column in mapping or canonical in used:
+            continue
+        mapping[column] = canonical
+        used.add(canonical)
+        logger.info(f"Coluna '{column}' identificada como {canonical} (pontuação {score:.2f})")
+
+    if use_cache:
+        _mapping_cache[key] = dict(mapping)
+        if len(_mapping_cache) > _MAPPING_CACHE_SIZE:
+            _mapping_cache.popitem(last=False)
+    return mapping
+
+def infer_re_column(df: pd.DataFrame, sample_size: int = DEFAULT_SAMPLE_SIZE) -> Optional[str]:
+    """
+    Encontra a coluna que contém o RE.
+
+    Se nenhuma coluna tiver pontuação suficiente, usa a coluna da amostra
+    com mais células contendo números.
+
+    Returns:
+        Nome da coluna, ou None se nenhuma coluna tiver números
+    """
+    mapping = infer_column_mapping(df, sample_size)
+    for column, canonical in mapping.items():
+        if canonical == 'RE':
+            return column
+
+    sample = _sample_rows(df, sample_size)
+    if sample.empty:
+        return None
+    digit_rates = sample.apply(lambda col: col.astype(str).str.contains(r'\d').mean())
+    if digit_rates.empty or digit_rates.max() == 0:
+        return None
+    return digit_rates.idxmax()
+
+def clear_mapping_cache() -> None:
+    """Descarta os mapeamentos guardados."""
+    _mapping_cache.clear()
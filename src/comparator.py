@@ -1,24 +1,248 @@
 import pandas as pd
-from typing import Dict, List, Tuple
+import numpy as np
+from typing import Dict, List, Optional, Tuple
 import logging
-import unicodedata
+
+from change_set import ChangeSet
+from normalizer import strip_accents
+from reconciliation import match_exits_entries
+from schema import RE_DTYPE, is_compact
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _values_differ(old_value, new_value) -> bool:
+    """Compara dois valores de campo; dois ausentes (NA) são iguais."""
+    old_missing = pd.isna(old_value)
+    new_missing = pd.isna(new_value)
+    if old_missing or new_missing:
+        return old_missing != new_missing
+    return old_value != new_value
+
+def _column_values(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Valores de cada coluna como arrays, para ler linhas sem montar uma Series por linha."""
+    return {column: df[column].to_numpy(dtype=object) for column in df.columns}
+
+def _row(columns: Dict[str, np.ndarray], position: int) -> Dict:
+    """Linha na posição indicada (coluna -> valor)."""
+    return {column: values[position] for column, values in columns.items()}
+
+def _first_positions(re_values: np.ndarray) -> np.ndarray:
+    """Posição da primeira ocorrência de cada RE, na ordem da lista."""
+    return np.flatnonzero(~pd.Series(re_values).duplicated().to_numpy())
+
+# REs inteiros são usados como códigos quando o intervalo entre o menor e o
+# maior não passa disso vezes o número de linhas; acima, são numerados
+MAX_RE_SPAN_RATIO = 8
+
+def re_codes(old_re: np.ndarray, new_re: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    REs das duas listas como códigos inteiros densos, comparáveis entre si.
+    
+    REs inteiros (esquema compacto) viram RE - menor RE, sem nenhuma
+    busca; os demais (texto) recebem um número por valor distinto,
+    atribuído de uma vez às duas listas, de modo que o mesmo RE tem o
+    mesmo código nas duas.
+    
+    Returns:
+        Tupla (códigos da lista antiga, códigos da lista nova, total de
+        códigos); os códigos vão de 0 a total - 1
+    """
+    old_re = np.asarray(old_re)
+    new_re = np.asarray(new_re)
+    rows = len(old_re) + len(new_re)
+    if rows and np.issubdtype(old_re.dtype, np.integer) and np.issubdtype(new_re.dtype, np.integer):
+        values = np.concatenate([old_re, new_re]).astype(np.int64)
+        low = values.min()
+        span = int(values.max() - low) + 1
+        if span <= MAX_RE_SPAN_RATIO * rows:
+            values -= low
+            return values[:len(old_re)], values[len(old_re):], span
+    codes, uniques = pd.factorize(np.concatenate([old_re.astype(object), new_re.astype(object)]),
+                                  use_na_sentinel=False)
+    return codes[:len(old_re)], codes[len(old_re):], len(uniques)
+
+def _first_by_code(codes: np.ndarray, size: int) -> np.ndarray:
+    """Posição da primeira ocorrência de cada código na lista, ou -1 para os ausentes."""
+    first = np.full(size, -1, dtype=np.int64)
+    # Atribuição de trás para frente: a primeira ocorrência é a última gravada
+    first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+    return first
+
+def join_by_re(old_re: np.ndarray, new_re: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Junta duas listas pelo RE com operações de conjunto em arrays de inteiros.
+    
+    Os REs viram códigos densos (re_codes) e cada lista ganha uma tabela
+    código -> primeira posição; entradas, saídas e REs comuns saem de
+    leituras nessas tabelas, sem hashing dos REs inteiros. Um RE repetido
+    é representado pela sua primeira linha.
+    
+    Args:
+        old_re: REs da lista antiga
+        new_re: REs da lista nova
+        
+    Returns:
+        Tupla de posições (entradas na lista nova, saídas na lista antiga,
+        comuns na lista antiga, comuns na lista nova); entradas e comuns
+        seguem a ordem da lista nova e saídas a da lista antiga
+    """
+    old_codes, new_codes, size = re_codes(old_re, new_re)
+    old_table = _first_by_code(old_codes, size)
+    new_table = _first_by_code(new_codes, size)
+    old_first = np.flatnonzero(old_table[old_codes] == np.arange(len(old_codes)))
+    new_first = np.flatnonzero(new_table[new_codes] == np.arange(len(new_codes)))
+    
+    in_old = old_table[new_codes[new_first]]
+    in_new = new_table[old_codes[old_first]]
+    matched = in_old >= 0
+    return new_first[~matched], old_first[in_new < 0], in_old[matched], new_first[matched]
+
+# Campos comparados entre as linhas de um mesmo RE, na ordem do relatório
+COMPARED_COLUMNS = ['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'SENIORIDADE']
+
+def _normalize_values(values: np.ndarray) -> np.ndarray:
+    """
+    Aplica normalize_text a um array, uma vez por valor distinto.
+    
+    Ausentes (None, NaN, pd.NA) ficam None: normalize_text os
+    transformaria em 'NONE', 'NAN' ou '<NA>', textos diferentes entre si.
+    """
+    normalized = np.empty(len(values), dtype=object)
+    missing = pd.isna(values)
+    codes, uniques = pd.factorize(values[~missing])
+    normalized[~missing] = np.array([normalize_text(value) for value in uniques] + [''], dtype=object)[codes]
+    normalized[missing] = None
+    return normalized
+
+def diff_fields(old_columns: Dict[str, np.ndarray], new_columns: Dict[str, np.ndarray],
+                old_positions: np.ndarray, new_positions: np.ndarray,
+                columns: List[str] = COMPARED_COLUMNS, normalize: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Marca, coluna a coluna, os campos que mudaram entre as linhas alinhadas pelo RE.
+    
+    Cada coluna é comparada de uma vez. Só os pares com valores diferentes
+    passam pela comparação completa (normalize_text, ou NA igual a NA), já
+    que valores idênticos nunca contam como mudança.
+    
+    Args:
+        old_columns: Valores das colunas da lista antiga (ver _column_values)
+        new_columns: Valores das colunas da lista nova
+        old_positions: Posições das linhas comuns na lista antiga
+        new_positions: Posições correspondentes na lista nova
+        columns: Colunas comparadas; as ausentes em uma das listas são ignoradas
+        normalize: Compara os valores normalizados (acentos e maiúsculas)
+        
+    Returns:
+        Dicionário {coluna: máscara booleana com uma posição por par de linhas}
+    """
+    masks = {}
+    for column in columns:
+        if column not in old_columns or column not in new_columns:
+            continue
+        old_values = old_columns[column][old_positions]
+        new_values = new_columns[column][new_positions]
+        
+        mask = (pd.Series(old_values, dtype=object) != pd.Series(new_values, dtype=object)).to_numpy()
+        candidates = np.flatnonzero(mask)
+        if len(candidates):
+            old_candidates = old_values[candidates]
+            new_candidates = new_values[candidates]
+            # Ausente contra ausente é igual, qualquer que seja o marcador (None, NaN, pd.NA)
+            both_missing = pd.isna(old_candidates) & pd.isna(new_candidates)
+            if normalize:
+                changed = _normalize_values(old_candidates) != _normalize_values(new_candidates)
+                mask[candidates] = changed & ~both_missing
+            else:
+                # Pares já diferentes pelo operador: só ausente contra ausente é igual
+                mask[candidates] = ~both_missing
+        masks[column] = mask
+    return masks
+
+def row_fingerprints(df: pd.DataFrame, columns: List[str] = COMPARED_COLUMNS) -> np.ndarray:
+    """
+    Calcula um hash de 64 bits por linha sobre os campos comparados.
+    
+    Linhas com os mesmos valores têm o mesmo hash, seja a coluna texto,
+    categórica ou inteira do esquema compacto; ausentes (NA) têm todos o
+    mesmo hash. Os hashes seguem a ordem das linhas do DataFrame.
+    
+    Args:
+        df: Lista de senioridade
+        columns: Colunas consideradas; as ausentes no DataFrame são ignoradas
+        
+    Returns:
+        Array uint64 com um hash por linha
+    """
+    present = [column for column in columns if column in df.columns]
+    if not present:
+        return np.zeros(len(df), dtype=np.uint64)
+    values = pd.DataFrame({column: df[column].to_numpy(dtype=object) for column in present})
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+def _differing_pairs(old_df: pd.DataFrame, new_df: pd.DataFrame,
+                     old_fingerprints, new_fingerprints,
+                     old_positions: np.ndarray, new_positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduz os pares de linhas comuns aos que têm hashes diferentes.
+    
+    Só filtra quando os hashes das duas listas foram informados (por
+    exemplo, lidos do cache de extração): calculá-los na hora custa mais do
+    que comparar as colunas diretamente.
+    """
+    if old_fingerprints is None or new_fingerprints is None:
+        return old_positions, new_positions
+    
+    same_columns = ([c for c in COMPARED_COLUMNS if c in old_df.columns] ==
+                    [c for c in COMPARED_COLUMNS if c in new_df.columns])
+    if not same_columns or len(old_fingerprints) != len(old_df) or len(new_fingerprints) != len(new_df):
+        logger.warning("Hashes de linha incompatíveis com as listas; comparando todos os REs em comum")
+        return old_positions, new_positions
+    
+    differ = np.asarray(old_fingerprints)[old_positions] != np.asarray(new_fingerprints)[new_positions]
+    logger.info(f"{int(differ.sum())} de {len(differ)} REs em comum com campos alterados (hash)")
+    return old_positions[differ], new_positions[differ]
+
+def reconcile_exits_entries(old_columns: Dict[str, np.ndarray], new_columns: Dict[str, np.ndarray],
+                            left: np.ndarray, entered: np.ndarray) -> List[Tuple[int, int, float]]:
+    """
+    Pareia saídas e entradas que provavelmente são o mesmo piloto com outro RE.
+    
+    Args:
+        old_columns: Valores das colunas da lista antiga (ver _column_values)
+        new_columns: Valores das colunas da lista nova
+        left: Posições das saídas na lista antiga
+        entered: Posições das entradas na lista nova
+        
+    Returns:
+        Lista de (posição na lista antiga, posição na lista nova, semelhança);
+        vazia sem a coluna NOME nas duas listas
+    """
+    if not len(left) or not len(entered) or 'NOME' not in old_columns or 'NOME' not in new_columns:
+        return []
+    
+    def war_names(columns, positions):
+        if 'NOME DE GUERRA' in columns:
+            return columns['NOME DE GUERRA'][positions]
+        return np.full(len(positions), None, dtype=object)
+    
+    pairs = match_exits_entries(old_columns['NOME'][left], war_names(old_columns, left),
+                                new_columns['NOME'][entered], war_names(new_columns, entered))
+    return [(int(left[i]), int(entered[j]), score) for i, j, score in pairs]
+
 class ListComparator:
     """Classe responsável por comparar duas listas de senioridade."""
     
     def __init__(self):
         self.changes = []
     
-    def _detect_changes(self, old_row: pd.Series, new_row: pd.Series) -> List[Dict]:
+    def _detect_changes(self, old_row: Dict, new_row: Dict) -> List[Dict]:
         """
         Detecta mudanças entre duas linhas de dados.
         
         Args:
-            old_row: Linha da lista antiga
-            new_row: Linha da lista nova
+            old_row: Linha da lista antiga (coluna -> valor, ou Series)
+            new_row: Linha da lista nova (coluna -> valor, ou Series)
             
         Returns:
             Lista de dicionários com as mudanças detectadas
@@ -26,8 +250,8 @@ class ListComparator:
         changes = []
         
         # Comparar cada campo
-        for column in ['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'SENIORIDADE']:
-            if old_row[column] != new_row[column]:
+        for column in COMPARED_COLUMNS:
+            if _values_differ(old_row[column], new_row[column]):
                 changes.append({
                     'campo': column,
                     'valor_antigo': old_row[column],
@@ -36,71 +260,82 @@ class ListComparator:
         
         return changes
     
-    def compare_lists(self, old_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+    def compare_changes(self, old_df: pd.DataFrame, new_df: pd.DataFrame,
+                        old_fingerprints: Optional[np.ndarray] = None,
+                        new_fingerprints: Optional[np.ndarray] = None) -> ChangeSet:
         """
-        Compara duas listas de senioridade e identifica mudanças.
+        Compara duas listas de senioridade e retorna as mudanças em formato
+        colunar, sem montar os textos do relatório (ver compare_lists).
         
         Args:
             old_df: DataFrame com a lista antiga
             new_df: DataFrame com a lista nova
+            old_fingerprints: Hashes das linhas da lista antiga (row_fingerprints)
+            new_fingerprints: Hashes das linhas da lista nova; com os dois,
+                só os REs com hashes diferentes têm os campos comparados
             
         Returns:
-            DataFrame com o relatório de mudanças
+            ChangeSet com as entradas, saídas e mudanças de campo
         """
         logger.info("Iniciando comparação das listas...")
         
-        # Criar conjuntos de REs
-        old_res = set(old_df['RE'])
-        new_res = set(new_df['RE'])
-        
-        # Identificar REs que entraram e saíram
-        entered_res = new_res - old_res
-        left_res = old_res - new_res
-        
-        # Criar lista para armazenar mudanças
-        changes_list = []
-        
-        # Processar entradas
-        for re in entered_res:
-            new_row = new_df[new_df['RE'] == re].iloc[0]
-            changes_list.append({
-                'RE': re,
-                'Nome': new_row['NOME'],
-                'Mudança': 'ENTRADA',
-                'Detalhes': f"Novo piloto: {new_row['NOME']} ({new_row['NOME DE GUERRA']})"
-            })
-        
-        # Processar saídas
-        for re in left_res:
-            old_row = old_df[old_df['RE'] == re].iloc[0]
-            changes_list.append({
-                'RE': re,
-                'Nome': old_row['NOME'],
-                'Mudança': 'SAÍDA',
-                'Detalhes': f"Piloto removido: {old_row['NOME']} ({old_row['NOME DE GUERRA']})"
-            })
-        
-        # Processar mudanças para REs presentes em ambas as listas
-        common_res = old_res.intersection(new_res)
-        for re in common_res:
-            old_row = old_df[old_df['RE'] == re].iloc[0]
-            new_row = new_df[new_df['RE'] == re].iloc[0]
+        # Juntar as listas pelo RE
+        old_columns = _column_values(old_df)
+        new_columns = _column_values(new_df)
+        entered, left, common_old, common_new = join_by_re(old_df['RE'].to_numpy(), new_df['RE'].to_numpy())
+        
+        # Processar mudanças para REs presentes em ambas as listas: as colunas
+        # são comparadas de uma vez e só as células alteradas viram mudanças
+        common_old, common_new = _differing_pairs(old_df, new_df, old_fingerprints, new_fingerprints,
+                                                  common_old, common_new)
+        masks = diff_fields(old_columns, new_columns, common_old, common_new, normalize=False)
+        changes = ChangeSet.from_positions(old_columns, new_columns, entered, left, [],
+                                           common_old, common_new, masks)
+        
+        logger.info(f"Comparação concluída! {len(changes)} mudanças detectadas.")
+        return changes
+    
+    def compare_lists(self, old_df: pd.DataFrame, new_df: pd.DataFrame,
+                      old_fingerprints: Optional[np.ndarray] = None,
+                      new_fingerprints: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Compara duas listas de senioridade e identifica mudanças.
+        
+        Args:
+            old_df: DataFrame com a lista antiga
+            new_df: DataFrame com a lista nova
+            old_fingerprints: Hashes das linhas da lista antiga (row_fingerprints)
+            new_fingerprints: Hashes das linhas da lista nova; com os dois,
+                só os REs com hashes diferentes têm os campos comparados
             
-            changes = self._detect_changes(old_row, new_row)
-            if changes:
-                for change in changes:
-                    changes_list.append({
-                        'RE': re,
-                        'Nome': new_row['NOME'],
-                        'Mudança': f"MUDANÇA DE {change['campo']}",
-                        'Detalhes': f"De: {change['valor_antigo']} Para: {change['valor_novo']}"
-                    })
-        
-        # Criar DataFrame com as mudanças
-        changes_df = pd.DataFrame(changes_list)
-        
-        logger.info(f"Comparação concluída! {len(changes_df)} mudanças detectadas.")
+        Returns:
+            DataFrame com o relatório de mudanças
+        """
+        changes_df = self.compare_changes(old_df, new_df, old_fingerprints, new_fingerprints).to_frame('lists')
+        
+        # Listas no esquema compacto geram o relatório também compacto
+        if is_compact(old_df) and is_compact(new_df) and not changes_df.empty:
+            changes_df['RE'] = changes_df['RE'].astype(RE_DTYPE)
+            changes_df['Mudança'] = changes_df['Mudança'].astype('category')
+        
         return changes_df 
+    
+    def analyze_movement(self, old_df: pd.DataFrame, new_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Movimentação na lista dos REs presentes nas duas listas: variação de
+        posição, ultrapassagens e resumos por EQUIPAMENTO e FUNÇÃO (ver
+        movement.analyze_movement).
+        """
+        from movement import analyze_movement
+        return analyze_movement(old_df, new_df)
+    
+    def analyze_transitions(self, old_df: pd.DataFrame, new_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Matrizes de transição (de -> para) de FUNÇÃO, EQUIPAMENTO e da
+        combinação dos dois entre as listas (ver transitions.transition_matrices).
+        """
+        from transitions import transition_matrices
+        return transition_matrices(old_df, new_df)
 
 def normalize_text(text: str) -> str:
     """
@@ -110,112 +345,123 @@ def normalize_text(text: str) -> str:
     text = str(text).strip()
     
     # Remover acentos
-    text = ''.join(c for c in unicodedata.normalize('NFD', text)
-                  if unicodedata.category(c) != 'Mn')
+    text = strip_accents(text)
     
     # Converter para maiúsculas
     text = text.upper()
     
     return text
 
-def compare_tables(base_df: pd.DataFrame, compare_df: pd.DataFrame) -> Dict:
+def collect_differences(base_columns: Dict[str, np.ndarray], compare_columns: Dict[str, np.ndarray],
+                        entered: np.ndarray, left: np.ndarray,
+                        changed_base: np.ndarray, changed_compare: np.ndarray,
+                        masks: Dict[str, np.ndarray], reconcile: bool = False) -> Tuple[ChangeSet, np.ndarray, np.ndarray, List]:
+    """
+    Reúne as diferenças de compare_tables: entradas, saídas, saídas e
+    entradas pareadas (reconcile_exits_entries) e mudanças de campo.
+    
+    Args:
+        base_columns: Valores das colunas da tabela base (ver _column_values)
+        compare_columns: Valores das colunas da tabela de comparação
+        entered: Posições das entradas na tabela de comparação
+        left: Posições das saídas na tabela base
+        changed_base: Posições dos pares comparados na tabela base
+        changed_compare: Posições correspondentes na tabela de comparação
+        masks: Campos alterados de cada par (ver diff_fields)
+        reconcile: Pareia saídas e entradas com nomes muito semelhantes
+        
+    Returns:
+        Tupla (diferenças, entradas e saídas que restaram sem par, pares)
+    """
+    # Saídas e entradas que provavelmente são o mesmo piloto com outro RE
+    reconciled = reconcile_exits_entries(base_columns, compare_columns, left, entered) if reconcile else []
+    if reconciled:
+        left = left[~np.isin(left, [base_position for base_position, _, _ in reconciled])]
+        entered = entered[~np.isin(entered, [compare_position for _, compare_position, _ in reconciled])]
+    
+    logger.info(f"REs que entraram: {sorted(compare_columns['RE'][entered].tolist())}")
+    logger.info(f"REs que saíram: {sorted(base_columns['RE'][left].tolist())}")
+    
+    # Só os códigos e valores das mudanças; os textos são montados sob demanda
+    differences = ChangeSet.from_positions(base_columns, compare_columns, entered, left, reconciled,
+                                           changed_base, changed_compare, masks)
+    logger.info(f"Diferenças por tipo: {differences.counts().to_dict()}")
+    
+    return differences, entered, left, reconciled
+
+def compare_tables(base_df: pd.DataFrame, compare_df: pd.DataFrame,
+                   base_fingerprints: Optional[np.ndarray] = None,
+                   compare_fingerprints: Optional[np.ndarray] = None,
+                   reconcile: bool = False, transitions: bool = False,
+                   columnar: bool = False) -> Dict:
     """
     Compara duas tabelas e retorna as diferenças encontradas.
     
     Args:
         base_df: DataFrame com a tabela base
         compare_df: DataFrame com a tabela para comparação
+        base_fingerprints: Hashes das linhas da tabela base (row_fingerprints)
+        compare_fingerprints: Hashes das linhas da tabela de comparação; com
+            os dois, só os REs com hashes diferentes têm os campos comparados
+        reconcile: Pareia saídas e entradas com nomes muito semelhantes (RE
+            alterado ou digitado errado), reportadas como POSSÍVEL MUDANÇA
+            DE RE em vez de uma SAÍDA e uma ENTRADA. Desligado por padrão:
+            ligado, os pares saem das contagens 'entered' e 'left' e são
+            contados à parte em 'reconciled'
+        transitions: Inclui em 'transitions' as matrizes de transição de
+            FUNÇÃO, EQUIPAMENTO e da combinação dos dois
+            (transitions.transition_matrices)
+        columnar: Devolve em 'differences' o ChangeSet em vez da lista de
+            registros, sem montar os textos das mudanças (ChangeSet.to_records
+            dá a mesma lista)
         
     Returns:
-        Dicionário com as diferenças encontradas
+        Dicionário com as diferenças encontradas; 'differences' é uma lista
+        de dicionários (RE, Tipo, Detalhes), serializável em JSON
     """
     try:
-        # Garantir que os REs sejam strings
-        base_df['RE'] = base_df['RE'].astype(str)
-        compare_df['RE'] = compare_df['RE'].astype(str)
+        # Garantir que os REs sejam do mesmo tipo; duas listas no esquema
+        # compacto são comparadas pelos REs inteiros
+        if not (is_compact(base_df) and is_compact(compare_df)):
+            base_df['RE'] = base_df['RE'].astype(str)
+            compare_df['RE'] = compare_df['RE'].astype(str)
         
         logger.info(f"Total de registros na tabela base: {len(base_df)}")
         logger.info(f"Total de registros na tabela de comparação: {len(compare_df)}")
         
-        # Criar conjuntos de REs
-        base_res = set(base_df['RE'])
-        compare_res = set(compare_df['RE'])
-        
-        # Identificar REs que entraram e saíram
-        entered_res = compare_res - base_res
-        left_res = base_res - compare_res
-        
-        logger.info(f"REs que entraram: {sorted(list(entered_res))}")
-        logger.info(f"REs que saíram: {sorted(list(left_res))}")
-        
-        # Lista para armazenar diferenças
-        differences = []
-        
-        # Processar entradas
-        for re in entered_res:
-            compare_row = compare_df[compare_df['RE'] == re].iloc[0]
-            differences.append({
-                'RE': re,
-                'Nome': compare_row.get('NOME', 'N/A'),
-                'Nome de Guerra': compare_row.get('NOME DE GUERRA', 'N/A'),
-                'Função': compare_row.get('FUNÇÃO', 'N/A'),
-                'Equipamento': compare_row.get('EQUIPAMENTO', 'N/A'),
-                'Tipo': 'ENTRADA',
-                'Detalhes': f"Novo piloto: RE {re}"
-            })
-        
-        # Processar saídas
-        for re in left_res:
-            base_row = base_df[base_df['RE'] == re].iloc[0]
-            differences.append({
-                'RE': re,
-                'Nome': base_row.get('NOME', 'N/A'),
-                'Nome de Guerra': base_row.get('NOME DE GUERRA', 'N/A'),
-                'Função': base_row.get('FUNÇÃO', 'N/A'),
-                'Equipamento': base_row.get('EQUIPAMENTO', 'N/A'),
-                'Tipo': 'SAÍDA',
-                'Detalhes': f"Piloto removido: RE {re}"
-            })
+        # Juntar as tabelas pelo RE
+        base_columns = _column_values(base_df)
+        compare_columns = _column_values(compare_df)
+        entered, left, common_base, common_compare = join_by_re(
+            base_df['RE'].to_numpy(), compare_df['RE'].to_numpy()
+        )
         
         # Processar mudanças para REs presentes em ambas as tabelas
-        common_res = base_res.intersection(compare_res)
-        logger.info(f"REs em comum: {sorted(list(common_res))}")
+        logger.info(f"REs em comum: {sorted(compare_columns['RE'][common_compare].tolist())}")
         
-        for re in common_res:
-            base_row = base_df[base_df['RE'] == re].iloc[0]
-            compare_row = compare_df[compare_df['RE'] == re].iloc[0]
-            
-            # Comparar cada campo
-            for column in ['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'SENIORIDADE']:
-                if column in base_row and column in compare_row:
-                    base_value = normalize_text(base_row[column])
-                    compare_value = normalize_text(compare_row[column])
-                    
-                    if base_value != compare_value:
-                        logger.info(f"Diferença encontrada em {column} para RE {re}:")
-                        logger.info(f"Base: {base_value}")
-                        logger.info(f"Comparação: {compare_value}")
-                        
-                        differences.append({
-                            'RE': re,
-                            'Nome': compare_row.get('NOME', 'N/A'),
-                            'Nome de Guerra': compare_row.get('NOME DE GUERRA', 'N/A'),
-                            'Função': compare_row.get('FUNÇÃO', 'N/A'),
-                            'Equipamento': compare_row.get('EQUIPAMENTO', 'N/A'),
-                            'Tipo': f"MUDANÇA DE {column}",
-                            'Detalhes': f"De: {base_row[column]} Para: {compare_row[column]}"
-                        })
+        # Comparar os campos coluna a coluna; registros e detalhes só para as células alteradas
+        changed_base, changed_compare = _differing_pairs(base_df, compare_df, base_fingerprints,
+                                                         compare_fingerprints, common_base, common_compare)
+        masks = diff_fields(base_columns, compare_columns, changed_base, changed_compare)
+        differences, entered, left, reconciled = collect_differences(
+            base_columns, compare_columns, entered, left, changed_base, changed_compare, masks, reconcile
+        )
         
         logger.info(f"Total de diferenças encontradas: {len(differences)}")
         
-        return {
-            'differences': differences,
+        result = {
+            'differences': differences if columnar else differences.to_records(),
             'total_base': len(base_df),
             'total_compare': len(compare_df),
             'total_differences': len(differences),
-            'entered': len(entered_res),
-            'left': len(left_res)
+            'entered': len(entered),
+            'left': len(left),
+            'reconciled': len(reconciled)
         }
+        if transitions:
+            from transitions import transition_matrices
+            result['transitions'] = transition_matrices(base_df, compare_df, common_base, common_compare)
+        return result
         
     except Exception as e:
         logger.error(f"Erro ao comparar tabelas: {str(e)}")
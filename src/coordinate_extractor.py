@@ -0,0 +1,187 @@
+import pdfplumber
+import logging
+import re
+from bisect import bisect_right
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from extraction_engine import map_columns
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tolerância vertical (em pontos) para considerar que duas palavras estão na mesma linha
+LINE_TOLERANCE = 3
+
+class ColumnLayout:
+    """
+    Posições das colunas da tabela, aprendidas a partir da primeira página.
+
+    Listas de senioridade têm layout fixo: as colunas ficam nas mesmas
+    posições x em todas as páginas. Com as fronteiras conhecidas, as demais
+    páginas podem ser lidas agrupando as palavras por coordenada, sem a
+    detecção de linhas e interseções feita por extract_table().
+    """
+
+    def __init__(self, header: List[str], boundaries: List[float], top: float):
+        self.header = header
+        # boundaries tem len(header) + 1 posições: borda esquerda, divisões internas e borda direita
+        self.boundaries = boundaries
+        # Topo do cabeçalho na página de onde o layout veio; nas outras
+        # páginas o topo da tabela é procurado de novo (extract_rows)
+        self.top = top
+        mapping = map_columns(header)
+        self.numeric_columns = [
+            index for index, col in enumerate(header) if mapping.get(col) in ('RE', 'SENIORIDADE')
+        ]
+        self.re_column = next((index for index, col in enumerate(header) if mapping.get(col) == 'RE'), None)
+
+    @classmethod
+    def from_page(cls, page, table_settings: Optional[Dict] = None) -> Tuple[Optional['ColumnLayout'], Optional[List[List]]]:
+        """
+        Aprende o layout a partir da tabela de uma página.
+
+        Returns:
+            Tupla (layout, tabela extraída da página); o layout é None se a
+            tabela não tiver uma linha de cabeçalho completa
+        """
+        return cls.from_table(page.find_table(table_settings))
+
+    @classmethod
+    def from_table(cls, table) -> Tuple[Optional['ColumnLayout'], Optional[List[List]]]:
+        """Como from_page, a partir da tabela já encontrada (page.find_table)."""
+        if table is None:
+            return None, None
+
+        rows = table.extract()
+        header_cells = table.rows[0].cells
+        if not rows or any(cell is None for cell in header_cells):
+            return None, rows
+
+        boundaries = [header_cells[0][0]] + [cell[2] for cell in header_cells]
+        return cls(rows[0], boundaries, header_cells[0][1]), rows
+
+    def _column_of(self, word: Dict) -> Optional[int]:
+        """Índice da coluna que contém a palavra, ou None se ela cruzar uma fronteira."""
+        center = (word['x0'] + word['x1']) / 2
+        index = bisect_right(self.boundaries, center) - 1
+        if index < 0 or index >= len(self.header):
+            return None
+        if word['x0'] < self.boundaries[index] - 1 or word['x1'] > self.boundaries[index + 1] + 1:
+            return None
+        return index
+
+    def _cells(self, line_words: List[Dict]) -> Optional[List[str]]:
+        """Textos de uma linha por coluna, ou None se alguma palavra cruzar uma fronteira."""
+        cells = [[] for _ in self.header]
+        for word in sorted(line_words, key=lambda w: w['x0']):
+            index = self._column_of(word)
+            if index is None:
+                return None
+            cells[index].append(word['text'])
+        return [' '.join(cell) for cell in cells]
+
+    def _is_data_row(self, row: Optional[List[str]]) -> bool:
+        """Linha com a forma de uma linha de dados (RE e SENIORIDADE com dígitos)."""
+        return row is not None and all(re.search(r'\d', row[index]) for index in self.numeric_columns)
+
+    def _has_re(self, line_words: List[Dict]) -> bool:
+        """Se a linha tem um número dentro da coluna RE (mesmo que o resto dela não caiba no layout)."""
+        if self.re_column is None:
+            return False
+        left, right = self.boundaries[self.re_column], self.boundaries[self.re_column + 1]
+        return any(left <= (word['x0'] + word['x1']) / 2 < right and re.search(r'\d', word['text'])
+                   for word in line_words)
+
+    def extract_rows(self, page) -> Optional[List[List[str]]]:
+        """
+        Extrai as linhas da tabela de uma página usando as posições das palavras.
+
+        O topo da tabela é encontrado em cada página: a tabela começa depois
+        do cabeçalho ou, nas páginas sem cabeçalho, na primeira linha com a
+        forma de uma linha de dados. Títulos acima dela são descartados.
+
+        Returns:
+            Linhas da tabela (sem cabeçalho), ou None se a página não bater
+            com o layout e precisar da extração completa
+        """
+        left, right = self.boundaries[0], self.boundaries[-1]
+        words = [word for word in page.extract_words() if word['x1'] > left and word['x0'] < right]
+        if not words:
+            return None
+
+        # Agrupar as palavras em linhas pela coordenada vertical
+        lines = []
+        for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+            if lines and word['top'] - lines[-1][0] <= LINE_TOLERANCE:
+                lines[-1][1].append(word)
+            else:
+                lines.append((word['top'], [word]))
+        rows = [self._cells(line_words) for _, line_words in lines]
+
+        # Topo da tabela nesta página
+        start = next((index + 1 for index, row in enumerate(rows) if row == self.header), None)
+        if start is None:
+            start = next((index for index, row in enumerate(rows) if self._is_data_row(row)), None)
+            if start is None:
+                return None
+        rows = rows[start:]
+
+        if not self._validate(rows):
+            return None
+        # Toda linha com RE na página tem de ter virado uma linha da tabela;
+        # se não, alguma ficou de fora e a página vai para a extração completa
+        if sum(self._has_re(line_words) for _, line_words in lines) != len(rows):
+            return None
+        return rows
+
+    def _validate(self, rows: List[Optional[List[str]]]) -> bool:
+        """Confere se as linhas lidas por coordenada têm a forma esperada."""
+        return bool(rows) and all(self._is_data_row(row) for row in rows)
+
+def iter_page_tables_fast(pdf_file, layout: Optional[ColumnLayout] = None,
+                          table_settings: Optional[Dict] = None,
+                          on_table: Optional[Callable] = None) -> Iterator[Tuple[int, Optional[List[List]]]]:
+    """
+    Extrai as tabelas brutas de todas as páginas usando o layout da primeira.
+
+    A primeira página passa pela extração completa, que também fornece as
+    fronteiras das colunas. As demais são lidas por coordenada; quando uma
+    página não valida (linha quebrada, texto fora das colunas, RE ausente),
+    ela volta para page.extract_table().
+
+    Args:
+        pdf_file: Arquivo PDF (pode ser um arquivo ou BytesIO)
+        layout: Layout já conhecido (por exemplo, de um perfil); assim até a
+            primeira página é lida por coordenada
+        table_settings: Configurações do pdfplumber para a extração completa
+        on_table: Recebe (página, tabela do pdfplumber) da página de onde o
+            layout é aprendido, para reaproveitar a tabela encontrada
+
+    Yields:
+        Pares (número da página, tabela) na ordem das páginas, no mesmo
+        formato de page.extract_table() (cabeçalho na primeira linha)
+    """
+    fallbacks = 0
+    with pdfplumber.open(pdf_file) as pdf:
+        logger.info(f"Total de páginas no PDF: {len(pdf.pages)}")
+        for page_num, page in enumerate(pdf.pages, 1):
+            table = None
+            if layout is None:
+                found = page.find_table(table_settings)
+                if on_table is not None:
+                    on_table(page, found)
+                layout, table = ColumnLayout.from_table(found)
+                if layout is not None:
+                    logger.info(f"Layout de colunas aprendido na página {page_num}: {layout.boundaries}")
+            else:
+                rows = layout.extract_rows(page)
+                if rows is not None:
+                    table = [layout.header] + rows
+                else:
+                    fallbacks += 1
+                    logger.info(f"Página {page_num} fora do layout, usando extract_table()")
+                    table = page.extract_table(table_settings)
+            page.flush_cache()
+            yield page_num, table
+
+    logger.info(f"Extração por coordenadas concluída ({fallbacks} páginas com extração completa)")
@@ -0,0 +1,159 @@
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from extraction_engine import REQUIRED_COLUMNS, map_columns
+from schema import CATEGORY_COLUMNS, INTEGER_COLUMNS, to_compact
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10000
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+def _open_sheet(source):
+    """Abre a planilha ativa em modo somente leitura (linhas lidas sob demanda)."""
+    from openpyxl import load_workbook
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    return workbook, workbook.active
+
+def iter_excel_tables(source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[List]]:
+    """
+    Lê a planilha em blocos de linhas, sem carregar o modelo completo do openpyxl.
+
+    Cada bloco repete o cabeçalho na primeira linha, no mesmo formato das
+    tabelas de página do motor de extração.
+
+    Args:
+        source: Caminho ou BytesIO do arquivo .xlsx
+        chunk_size: Número de linhas por bloco
+
+    Yields:
+        Listas de linhas ([cabeçalho] + linhas do bloco)
+    """
+    workbook, sheet = _open_sheet(source)
+    try:
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        header = list(header)
+        chunk = []
+        for row in rows:
+            chunk.append(list(row))
+            if len(chunk) >= chunk_size:
+                yield [header] + chunk
+                chunk = []
+        if chunk:
+            yield [header] + chunk
+    finally:
+        workbook.close()
+
+def _to_integer(series: pd.Series) -> pd.Series:
+    """
+    Converte para Int32, aproveitando os números da planilha e extraindo dígitos dos textos.
+
+    Números não inteiros (12.5), negativos ou fora do intervalo do Int32
+    viram NA, com um aviso, como em schema.to_compact(errors='drop').
+    """
+    numbers = pd.to_numeric(series, errors='coerce')
+    text = series[numbers.isna() & series.notna()]
+    if not text.empty:
+        digits = text.astype(str).str.replace(r'\D', '', regex=True)
+        numbers.loc[text.index] = pd.to_numeric(digits.where(digits != ''), errors='coerce')
+
+    numbers = numbers.astype('float64')
+    invalid = numbers.notna() & ~((numbers % 1 == 0) & numbers.between(0, _INT32_MAX))
+    if invalid.any():
+        examples = series[invalid].astype(str).head(5).tolist()
+        logger.warning(f"{int(invalid.sum())} valores inválidos na coluna {series.name}: {examples}")
+        numbers = numbers.where(~invalid)
+    return numbers.astype('Int32')
+
+def _to_text(series: pd.Series) -> pd.Series:
+    """Converte para texto sem espaços extras, mantendo ausentes como NA."""
+    return series.where(series.isna(), series.astype(str).str.strip())
+
+def _compact_chunk(records: List[Tuple], columns: List[str]) -> pd.DataFrame:
+    """Monta o DataFrame de um bloco já com os tipos compactos."""
+    df = pd.DataFrame.from_records(records, columns=columns)
+    for col in df.columns:
+        if col in INTEGER_COLUMNS:
+            df[col] = _to_integer(df[col])
+        elif col in CATEGORY_COLUMNS:
+            df[col] = _to_text(df[col]).astype('category')
+        else:
+            df[col] = _to_text(df[col])
+    return df
+
+def iter_excel_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      column_mapping: Optional[Dict] = None) -> Iterator[pd.DataFrame]:
+    """
+    Lê a planilha em blocos, materializando apenas as colunas da lista de senioridade.
+
+    RE e SENIORIDADE são convertidos para inteiros (Int32), FUNÇÃO e
+    EQUIPAMENTO para categóricos; as demais colunas do arquivo são
+    descartadas ainda na leitura, linha a linha.
+
+    Args:
+        source: Caminho ou BytesIO do arquivo .xlsx
+        chunk_size: Número de linhas por bloco
+        column_mapping: Mapeamento {cabeçalho: nome padronizado}; por padrão,
+            identificado pelos cabeçalhos e, sem coluna RE, inferido pela
+            amostra do primeiro bloco
+
+    Yields:
+        DataFrames de até chunk_size linhas, sem as linhas vazias e sem RE
+    """
+    positions = None
+    names = None
+    for table in iter_excel_tables(source, chunk_size):
+        header, rows = table[0], table[1:]
+
+        if positions is None:
+            mapping = column_mapping or map_columns(header)
+            if 'RE' not in mapping.values():
+                from column_inference import infer_column_mapping
+                mapping = infer_column_mapping(pd.DataFrame(rows, columns=header))
+            by_name = {canonical: header.index(col) for col, canonical in mapping.items() if col in header}
+            names = [col for col in REQUIRED_COLUMNS if col in by_name]
+            positions = [by_name[col] for col in names]
+            if 'RE' not in names:
+                raise ValueError("Não foi possível identificar a coluna do RE na planilha")
+            logger.info(f"Colunas lidas da planilha: {names}")
+
+        records = [
+            tuple(row[i] if i < len(row) else None for i in positions)
+            for row in rows
+            if any(value is not None and value != '' for value in row)
+        ]
+        if not records:
+            continue
+
+        df = _compact_chunk(records, names)
+        yield df[df['RE'].notna()]
+
+def read_excel_compact(source, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       column_mapping: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Lê a planilha inteira com os tipos compactos de iter_excel_chunks.
+
+    Returns:
+        DataFrame com as colunas padronizadas encontradas, no esquema
+        compacto de schema.to_compact
+    """
+    chunks = list(iter_excel_chunks(source, chunk_size, column_mapping))
+    if not chunks:
+        raise ValueError("O arquivo não contém dados")
+
+    df = pd.concat(chunks, ignore_index=True)
+
+    # Blocos com categorias diferentes voltam como texto na concatenação;
+    # to_compact recategoriza e aplica o esquema canônico (RE int32)
+    return to_compact(df, errors='drop')
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Callable, Dict, Optional, Union
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from table_io import read_table, write_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'senioridade')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_SUFFIX = '.npz'
+# Hashes das linhas de cada tabela (comparator.row_fingerprints), ao lado dela
+FINGERPRINT_SUFFIX = '.fp.npy'
+
+def file_hash(file: Union[BytesIO, str]) -> str:
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo.
+
+    Args:
+        file: Caminho do arquivo ou objeto com read() (BytesIO, upload)
+
+    Returns:
+        Hash hexadecimal do conteúdo
+    """
+    digest = hashlib.sha256()
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    else:
+        position = file.tell()
+        file.seek(0)
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+        file.seek(position)
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """
+    Cache em disco das tabelas extraídas, endereçado pelo conteúdo do arquivo.
+
+    A chave combina o hash do arquivo, o nome e a versão do extrator e as
+    configurações usadas. As tabelas são gravadas no formato colunar de
+    table_io, acompanhadas dos hashes das suas linhas (.fp.npy), de modo que
+    a lista antiga de uma comparação não precisa ter os hashes recalculados.
+    Quando o diretório passa de max_bytes, as entradas usadas há mais tempo
+    são removidas (LRU pela data de modificação do arquivo, que é atualizada
+    a cada acerto).
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.environ.get('SENIORIDADE_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, content_hash: str, extractor: str, version: str, settings: Optional[Dict] = None) -> str:
+        """Gera a chave da entrada a partir do hash do conteúdo, do extrator e das configurações."""
+        payload = json.dumps(
+            {'extractor': extractor, 'version': version, 'settings': settings or {}},
+            sort_keys=True, default=str
+        )
+        settings_hash = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+        return f"{content_hash}-{settings_hash}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def _fingerprint_path(self, path: str) -> str:
+        return path[:-len(CACHE_SUFFIX)] + FINGERPRINT_SUFFIX
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Retorna a tabela guardada para a chave, ou None se não houver."""
+        path = self._path(key)
+        try:
+            df = read_table(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Entrada de cache inválida, removendo {path}: {str(e)}")
+            self._remove(path)
+            return None
+
+        # Marcar como usada recentemente
+        os.utime(path)
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Grava a tabela para a chave e aplica o limite de tamanho do cache."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        write_table(df, tmp_path)
+        self._put_fingerprints(path, df)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _put_fingerprints(self, path: str, df: pd.DataFrame) -> Optional[np.ndarray]:
+        from comparator import row_fingerprints
+
+        fingerprint_path = self._fingerprint_path(path)
+        tmp_path = f"{fingerprint_path}.{os.getpid()}.tmp"
+        try:
+            fingerprints = row_fingerprints(df)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, fingerprints)
+            os.replace(tmp_path, fingerprint_path)
+            return fingerprints
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar os hashes das linhas no cache: {str(e)}")
+            return None
+
+    def get_fingerprints(self, key: str) -> Optional[np.ndarray]:
+        """
+        Retorna os hashes das linhas da tabela guardada para a chave.
+
+        Entradas gravadas sem os hashes têm os hashes calculados uma vez e
+        guardados.
+
+        Returns:
+            Array uint64 com um hash por linha, ou None se a tabela não está no cache
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            return np.load(self._fingerprint_path(path))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Hashes de linha inválidos no cache, recalculando: {str(e)}")
+
+        df = self.get(key)
+        if df is None:
+            return None
+        return self._put_fingerprints(path, df)
+
+    def fingerprints_for(self, file: Union[BytesIO, str], extractor: str, version: str,
+                         settings: Optional[Dict] = None) -> Optional[np.ndarray]:
+        """
+        Hashes das linhas da tabela extraída do arquivo, se ela estiver no cache.
+
+        Os argumentos são os mesmos de get_or_extract; o resultado pode ser
+        passado a ListComparator.compare_lists e compare_tables.
+        """
+        return self.get_fingerprints(self.make_key(file_hash(file), extractor, version, settings))
+
+    def get_or_extract(self, file: Union[BytesIO, str], extractor: str, version: str,
+                       extract: Callable[[], pd.DataFrame], settings: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Retorna a tabela do cache ou executa a extração e guarda o resultado.
+
+        Args:
+            file: Arquivo de origem (caminho ou BytesIO)
+            extractor: Nome do extrator, para separar resultados de extratores diferentes
+            version: Versão do extrator; mudá-la invalida as entradas antigas
+            extract: Função sem argumentos que faz a extração
+            settings: Configurações que alteram o resultado da extração
+
+        Returns:
+            DataFrame extraído, sempre como lido do cache (ausentes como
+            pd.NA, índice de 0 a n - 1), haja ou não acerto
+        """
+        key = self.make_key(file_hash(file), extractor, version, settings)
+        df = self.get(key)
+        if df is not None:
+            logger.info(f"Tabela carregada do cache ({extractor}): {key}")
+            return df
+
+        extracted = extract()
+        try:
+            self.put(key, extracted)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar a tabela no cache: {str(e)}")
+            return extracted
+
+        # Devolver a tabela relida do cache, para que um erro e um acerto
+        # deem os mesmos dados
+        df = self.get(key)
+        if df is None:
+            logger.warning("Tabela removida do cache logo após a gravação (maior que max_bytes)")
+            return extracted
+        return df
+
+    def invalidate(self, file: Optional[Union[BytesIO, str]] = None) -> int:
+        """
+        Remove entradas do cache.
+
+        Args:
+            file: Se informado, remove apenas as entradas desse arquivo; senão, limpa o cache
+
+        Returns:
+            Número de entradas removidas
+        """
+        prefix = file_hash(file) + '-' if file is not None else ''
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(CACHE_SUFFIX) and name.startswith(prefix):
+                self._remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        logger.info(f"{removed} entradas removidas do cache")
+        return removed
+
+    def size(self) -> int:
+        """Tamanho total das entradas do cache, em bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            try:
+                fingerprint_size = os.stat(self._fingerprint_path(path)).st_size
+            except FileNotFoundError:
+                fingerprint_size = 0
+            entries.append((path, stat.st_size + fingerprint_size, stat.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        # Remover as entradas usadas há mais tempo até caber no limite
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            logger.info(f"Entrada removida do cache (LRU): {path}")
+
+    def _remove(self, path: str) -> None:
+        for entry_path in (path, self._fingerprint_path(path)):
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
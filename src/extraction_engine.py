@@ -0,0 +1,545 @@
+import pdfplumber
+import pandas as pd
+from pdfplumber.table import TableSettings
+from pdfminer.pdftypes import PDFStream, resolve1
+from pdfminer.psparser import LIT
+import logging
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from schema import to_compact
+
+if TYPE_CHECKING:
+    from layout_profiles import LayoutProfile
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'RE', 'SENIORIDADE']
+
+# Tabela bruta de uma página, no formato de page.extract_table()
+PageTable = Tuple[int, Optional[List[List]]]
+
+LITERAL_FORM = LIT('Form')
+LITERAL_TYPE0 = LIT('Type0')
+
+def map_columns(columns) -> Dict:
+    """
+    Identifica as colunas da lista de senioridade a partir dos cabeçalhos do arquivo.
+
+    Returns:
+        Dicionário {cabeçalho original: nome padronizado}
+    """
+    column_mapping = {}
+    for col in columns:
+        col_upper = str(col).upper()
+        if 'FUNÇÃO' in col_upper or 'FUNCAO' in col_upper:
+            column_mapping[col] = 'FUNÇÃO'
+        elif 'EQUIPAMENTO' in col_upper:
+            column_mapping[col] = 'EQUIPAMENTO'
+        elif 'NOME' in col_upper and 'GUERRA' not in col_upper:
+            column_mapping[col] = 'NOME'
+        elif 'GUERRA' in col_upper:
+            column_mapping[col] = 'NOME DE GUERRA'
+        elif 'RE' in col_upper:
+            column_mapping[col] = 'RE'
+        elif 'SENIORIDADE' in col_upper:
+            column_mapping[col] = 'SENIORIDADE'
+    return column_mapping
+
+def clean_batch(df: pd.DataFrame, column_mapping: Dict) -> pd.DataFrame:
+    """Renomeia as colunas, mantém apenas as necessárias e remove espaços extras."""
+    # Renomear colunas
+    df = df.rename(columns=column_mapping)
+
+    # Manter apenas as colunas necessárias
+    available_columns = [col for col in REQUIRED_COLUMNS if col in df.columns]
+
+    if not available_columns:
+        raise ValueError("Não foi possível identificar as colunas necessárias no arquivo")
+
+    df = df[available_columns]
+
+    # Limpar dados: só os valores presentes viram texto sem espaços extras;
+    # células vazias continuam ausentes (NA), em vez de '<NA>' ou 'None'
+    for col in df.columns:
+        values = df[col]
+        df[col] = values.where(values.isna(), values.astype(str).str.strip())
+
+    return df
+
+def _row_key(row) -> List[str]:
+    """Linha da tabela como textos sem espaços, para reconhecer um cabeçalho repetido."""
+    return [str(cell).strip() if cell is not None else '' for cell in row]
+
+def page_text(page) -> str:
+    """Texto bruto da página, sem a análise de layout de extract_text()."""
+    return ''.join(char['text'] for char in page.chars)
+
+# Strings de um content stream: literais (com um nível de parênteses
+# aninhados) ou hexadecimais
+_STRING = rb'\((?:[^\\()]|\\.|\((?:[^\\()]|\\.)*\))*\)|<[0-9A-Fa-f\s]*>'
+_STRING_PATTERN = re.compile(_STRING, re.S)
+# Operadores que desenham texto: [...] TJ, (...) Tj, (...) ' e a c (...) "
+_TEXT_PATTERN = re.compile(rb'\[((?:' + _STRING + rb'|[^\]()<])*)\]\s*TJ|(' + _STRING + rb')\s*(?:Tj|\'|")', re.S)
+_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+_ESCAPE_PATTERN = re.compile(rb'\\([0-7]{1,3}|\r\n|.)', re.S)
+
+def _unescape(match) -> bytes:
+    escaped = match.group(1)
+    if escaped[:1].isdigit():
+        return bytes([int(escaped, 8) & 0xFF])
+    if escaped in (b'\n', b'\r', b'\r\n'):
+        # Barra no fim da linha: continuação, não faz parte da string
+        return b''
+    return _ESCAPES.get(escaped, escaped)
+
+def _string_bytes(token: bytes) -> bytes:
+    """Bytes de uma string do content stream ((literal) ou <hexadecimal>)."""
+    if token[:1] == b'<':
+        digits = re.sub(rb'\s', b'', token[1:-1])
+        return bytes.fromhex((digits + b'0' * (len(digits) % 2)).decode('ascii'))
+    return _ESCAPE_PATTERN.sub(_unescape, token[1:-1])
+
+def _forms(resources, seen: set) -> Iterator:
+    """Form XObjects dos recursos (e os que eles usam), cada um uma vez."""
+    xobjects = resolve1((resources or {}).get('XObject')) or {}
+    for reference in xobjects.values():
+        xobject = resolve1(reference)
+        key = getattr(reference, 'objid', None) or id(xobject)
+        if key in seen or not isinstance(xobject, PDFStream) or xobject.get('Subtype') is not LITERAL_FORM:
+            continue
+        seen.add(key)
+        yield xobject
+        yield from _forms(resolve1(xobject.get('Resources')), seen)
+
+def page_streams(page) -> Tuple[List[PDFStream], List]:
+    """
+    Content streams da página e dos Form XObjects que ela usa.
+
+    Returns:
+        Tupla (streams, dicionários de recursos da página e dos formulários)
+    """
+    resources = [resolve1(page.page_obj.resources)]
+    streams = [resolve1(stream) for stream in page.page_obj.contents]
+    for form in _forms(resources[0], set()):
+        streams.append(form)
+        resources.append(resolve1(form.get('Resources')))
+    return streams, resources
+
+def content_text(page) -> Optional[str]:
+    """
+    Texto da página lido direto dos content streams, sem interpretar fontes
+    nem montar os caracteres (muito mais barato que page.chars).
+
+    Cada operador de texto vira um trecho, separado dos outros por espaço.
+    Só vale para fontes simples, em que os bytes das strings são o próprio
+    texto; com fontes compostas (Type0, glifos em códigos de 2 bytes) não
+    há como ler o texto sem a fonte.
+
+    Returns:
+        Texto da página, ou None se ela usar fontes compostas
+    """
+    streams, resources = page_streams(page)
+    for resource in resources:
+        fonts = resolve1((resource or {}).get('Font')) or {}
+        if any(resolve1(font).get('Subtype') is LITERAL_TYPE0 for font in fonts.values()):
+            return None
+
+    pieces = []
+    for stream in streams:
+        for match in _TEXT_PATTERN.finditer(stream.get_data()):
+            if match.group(1) is not None:
+                text = b''.join(_string_bytes(token) for token in _STRING_PATTERN.findall(match.group(1)))
+            else:
+                text = _string_bytes(match.group(2))
+            pieces.append(text.decode('latin-1'))
+    return ' '.join(pieces)
+
+def read_pdf_source(pdf_file) -> Union[str, bytes]:
+    """
+    Prepara a origem do PDF para ser reaberta em outro processo.
+
+    Caminhos são repassados como estão; arquivos em memória (BytesIO,
+    uploads) são lidos para bytes, já que não podem ser compartilhados
+    entre processos.
+    """
+    if isinstance(pdf_file, (str, os.PathLike)):
+        return os.fspath(pdf_file)
+    if hasattr(pdf_file, 'seek'):
+        pdf_file.seek(0)
+    return pdf_file.read()
+
+def open_pdf(pdf_source: Union[str, bytes]):
+    """Abre o PDF a partir de um caminho ou do conteúdo em bytes."""
+    if isinstance(pdf_source, bytes):
+        return pdfplumber.open(BytesIO(pdf_source))
+    return pdfplumber.open(pdf_source)
+
+def _page_ranges(total_pages: int, chunks: int) -> List[Tuple[int, int]]:
+    """Divide as páginas em intervalos contíguos [início, fim) de tamanho semelhante."""
+    chunks = max(1, min(chunks, total_pages))
+    size, extra = divmod(total_pages, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def _extract_found(table, table_settings: Optional[Dict] = None) -> Optional[List[List]]:
+    """Linhas de uma tabela já encontrada (page.find_table), como page.extract_table()."""
+    if table is None:
+        return None
+    return table.extract(**(TableSettings.resolve(table_settings).text_settings or {}))
+
+def _extract_page_range(pdf_source: Union[str, bytes], start: int, end: int,
+                        table_settings: Optional[Dict] = None) -> List[PageTable]:
+    """
+    Extrai as tabelas brutas de um intervalo de páginas.
+
+    Executado nos processos do pool: cada worker abre o PDF por conta própria
+    e devolve pares (número da página, tabela) para o processo principal.
+    """
+    results = []
+    with open_pdf(pdf_source) as pdf:
+        for index in range(start, end):
+            page = pdf.pages[index]
+            results.append((index + 1, page.extract_table(table_settings)))
+            page.flush_cache()
+    return results
+
+class ExtractionBackend(ABC):
+    """
+    Interface dos backends de extração.
+
+    Um backend só sabe ler o arquivo e devolver as tabelas brutas página a
+    página (lista de linhas, com o cabeçalho na primeira linha da primeira
+    tabela). Cabeçalhos, limpeza e padronização de colunas ficam a cargo do
+    ExtractionEngine, iguais para todos os backends.
+    """
+
+    name = 'base'
+
+    # Tamanho da primeira página e a tabela do pdfplumber encontrada nela,
+    # quando o backend a leu; permite aprender o perfil de layout sem reler o PDF
+    first_page: Optional[Tuple[List[float], object]] = None
+
+    @abstractmethod
+    def iter_page_tables(self, source) -> Iterator[PageTable]:
+        """Tabelas brutas do arquivo, como pares (número da página, linhas ou None)."""
+
+    def _found_first_table(self, page, table) -> None:
+        self.first_page = ([float(page.width), float(page.height)], table)
+
+    def settings(self) -> Dict:
+        """Configurações que alteram o resultado (usadas como chave de cache)."""
+        return {}
+
+class PdfTableBackend(ExtractionBackend):
+    """
+    Backend pdfplumber em modo tabela: page.extract_table() em cada página.
+
+    Args:
+        table_settings: Configurações de tabela do pdfplumber
+        parallel: Se True, distribui intervalos de páginas entre um pool de processos
+        max_workers: Número máximo de processos no modo paralelo (padrão: número de CPUs)
+        pages: Números das páginas (a partir de 1) a extrair (padrão: todas)
+        text_filter: Recebe o texto bruto da página (content_text, trechos
+            separados por espaço) e decide se ela deve ser extraída
+    """
+
+    name = 'pdf_table'
+
+    def __init__(self, table_settings: Optional[Dict] = None, parallel: bool = False,
+                 max_workers: Optional[int] = None, pages: Optional[Iterable[int]] = None,
+                 text_filter: Optional[Callable[[str], bool]] = None):
+        if parallel and (pages is not None or text_filter is not None):
+            raise ValueError("O modo paralelo não aceita filtros de página")
+        self.table_settings = table_settings
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.pages = list(pages) if pages is not None else None
+        self.text_filter = text_filter
+
+    def settings(self) -> Dict:
+        return {'table_settings': self.table_settings}
+
+    def iter_page_tables(self, source) -> Iterator[PageTable]:
+        if self.parallel:
+            yield from self._extract_parallel(source)
+            return
+
+        filtered = self.pages is not None or self.text_filter is not None
+        with pdfplumber.open(source) as pdf:
+            logger.info(f"Total de páginas no PDF: {len(pdf.pages)}")
+            page_numbers = self._page_numbers(len(pdf.pages))
+
+            # Com filtros, a primeira página é lida mesmo fora da seleção, só pelo cabeçalho
+            first_selected = not filtered or (1 in page_numbers and self._accept(pdf.pages[0]))
+            if not first_selected:
+                table = pdf.pages[0].extract_table(self.table_settings)
+                pdf.pages[0].flush_cache()
+                yield 1, table[:1] if table else None
+
+            for page_num in page_numbers:
+                page = pdf.pages[page_num - 1]
+                if page_num == 1:
+                    if not first_selected:
+                        continue
+                elif filtered and not self._accept(page):
+                    page.flush_cache()
+                    continue
+                # Extrair a tabela da página (a da primeira fica guardada em first_page)
+                if page_num == 1:
+                    found = page.find_table(self.table_settings)
+                    self._found_first_table(page, found)
+                    table = _extract_found(found, self.table_settings)
+                else:
+                    table = page.extract_table(self.table_settings)
+                page.flush_cache()
+                yield page_num, table
+
+    def _page_numbers(self, total_pages: int) -> List[int]:
+        """Páginas selecionadas que existem no documento; as demais são ignoradas com um aviso."""
+        if self.pages is None:
+            return list(range(1, total_pages + 1))
+        page_numbers = [page_num for page_num in self.pages if 1 <= page_num <= total_pages]
+        if len(page_numbers) < len(self.pages):
+            missing = [page_num for page_num in self.pages if not 1 <= page_num <= total_pages]
+            logger.warning(f"Páginas inexistentes ignoradas (o PDF tem {total_pages}): {missing}")
+        return page_numbers
+
+    def _accept(self, page) -> bool:
+        if self.text_filter is None:
+            return True
+        # Texto dos content streams, sem montar os caracteres; com fontes
+        # compostas, as palavras da página (bem mais caro)
+        text = content_text(page)
+        if text is None:
+            text = ' '.join(word['text'] for word in page.extract_words())
+        return self.text_filter(text)
+
+    def _extract_parallel(self, source) -> List[PageTable]:
+        """Extrai as tabelas brutas de todas as páginas usando um pool de processos."""
+        pdf_source = read_pdf_source(source)
+        with open_pdf(pdf_source) as pdf:
+            total_pages = len(pdf.pages)
+        logger.info(f"Total de páginas no PDF: {total_pages}")
+
+        max_workers = self.max_workers or os.cpu_count() or 1
+        ranges = _page_ranges(total_pages, max_workers)
+        logger.info(f"Extraindo {total_pages} páginas em {len(ranges)} processos")
+
+        page_tables = []
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_extract_page_range, pdf_source, start, end, self.table_settings)
+                for start, end in ranges
+            ]
+            # Os intervalos são contíguos e os resultados são lidos na ordem de submissão,
+            # então as páginas voltam na ordem original
+            for future in futures:
+                page_tables.extend(future.result())
+        return page_tables
+
+class PdfWordsBackend(ExtractionBackend):
+    """
+    Backend pdfplumber em modo palavra/coordenada (ver coordinate_extractor).
+
+    Args:
+        table_settings: Configurações de tabela do pdfplumber, para as páginas
+            que precisam da extração completa
+        layout: Layout de colunas já conhecido (por exemplo, de um perfil)
+    """
+
+    name = 'pdf_words'
+
+    def __init__(self, table_settings: Optional[Dict] = None, layout=None):
+        self.table_settings = table_settings
+        self.layout = layout
+
+    def settings(self) -> Dict:
+        return {'table_settings': self.table_settings}
+
+    def iter_page_tables(self, source) -> Iterator[PageTable]:
+        from coordinate_extractor import iter_page_tables_fast
+        return iter_page_tables_fast(source, self.layout, self.table_settings, on_table=self._found_first_table)
+
+class ExcelBackend(ExtractionBackend):
+    """
+    Backend para planilhas Excel.
+
+    Arquivos .xlsx são lidos no modo somente leitura do openpyxl, em blocos
+    de chunk_size linhas (cada bloco vale como uma página); .xls passa pelo
+    pandas e a planilha inteira vale como uma página.
+    """
+
+    name = 'excel'
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        self.chunk_size = chunk_size
+
+    def iter_page_tables(self, source) -> Iterator[PageTable]:
+        if source_name(source).lower().endswith('.xls'):
+            df = pd.read_excel(source)
+            yield 1, [list(df.columns)] + df.values.tolist()
+            return
+
+        from excel_reader import DEFAULT_CHUNK_SIZE, iter_excel_tables
+        for number, table in enumerate(iter_excel_tables(source, self.chunk_size or DEFAULT_CHUNK_SIZE), 1):
+            yield number, table
+
+BACKENDS = {
+    PdfTableBackend.name: PdfTableBackend,
+    PdfWordsBackend.name: PdfWordsBackend,
+    ExcelBackend.name: ExcelBackend
+}
+
+def source_name(source) -> str:
+    """Nome do arquivo de origem (caminho ou atributo name de uploads/BytesIO)."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, 'name', '') or ''
+
+def backend_for(source, **options) -> ExtractionBackend:
+    """
+    Escolhe o backend pela extensão do arquivo (PDF em modo tabela por padrão).
+
+    Args:
+        source: Caminho, BytesIO ou upload
+        **options: Repassadas ao construtor do backend
+    """
+    name = source_name(source).lower()
+    if name.endswith(('.xlsx', '.xls', '.xlsm')):
+        return ExcelBackend(**options)
+    return PdfTableBackend(**options)
+
+class ExtractionEngine:
+    """
+    Motor único de extração de listas de senioridade.
+
+    Recebe as tabelas brutas de um backend e aplica o pós-processamento
+    comum: cabeçalho da primeira tabela propagado para as páginas seguintes,
+    remoção de linhas vazias, padronização das colunas e limpeza dos textos.
+    Ao final de cada extração, stats traz páginas, linhas e tempo gasto.
+    """
+
+    def __init__(self, backend: Optional[ExtractionBackend] = None):
+        self.backend = backend or PdfTableBackend()
+        self.stats = {'pages': 0, 'rows': 0, 'seconds': 0.0}
+
+    def iter_raw_batches(self, source, profile: Optional['LayoutProfile'] = None) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """
+        Gera (número da página, DataFrame) com os cabeçalhos originais do arquivo.
+
+        Args:
+            source: Arquivo de origem (caminho, BytesIO ou upload)
+            profile: Perfil de layout opcional (linha do cabeçalho)
+        """
+        header_row = profile.header_row if profile else 0
+        columns = None
+        self.stats = {'pages': 0, 'rows': 0, 'seconds': 0.0}
+        started = time.perf_counter()
+
+        try:
+            for page_num, table in self.backend.iter_page_tables(source):
+                self.stats['pages'] += 1
+                logger.info(f"Processando página {page_num}")
+
+                # Descartar as linhas de título acima do cabeçalho, só na primeira
+                # tabela (as seguintes não repetem o título; as lidas por
+                # coordenada já começam pelo cabeçalho)
+                if table and header_row and columns is None and [cell or '' for cell in table[0]] != profile.header:
+                    table = table[header_row:]
+
+                if not table:
+                    logger.warning(f"Nenhuma tabela encontrada na página {page_num}")
+                    continue
+
+                # Os cabeçalhos da primeira tabela valem para as páginas seguintes;
+                # nelas, a primeira linha só é descartada quando repete o cabeçalho
+                if columns is None:
+                    columns = table[0]
+                    header_key = _row_key(columns)
+                    logger.info(f"Colunas encontradas na página {page_num}: {list(columns)}")
+                    rows = table[1:]
+                else:
+                    rows = table[1:] if _row_key(table[0]) == header_key else table
+
+                df = pd.DataFrame(rows, columns=columns)
+
+                # Limpar os dados
+                df = df.replace('', pd.NA).dropna(how='all')
+                logger.info(f"Número de linhas na página {page_num} após limpeza: {len(df)}")
+
+                self.stats['rows'] += len(df)
+                yield page_num, df
+        finally:
+            self.stats['seconds'] = time.perf_counter() - started
+
+    def iter_batches(self, source, profile: Optional['LayoutProfile'] = None) -> Iterator[pd.DataFrame]:
+        """
+        Gera um DataFrame por página, já com as colunas padronizadas e limpas.
+
+        Duplicatas são removidas apenas dentro de cada lote.
+        """
+        column_mapping = profile.column_mapping if profile else None
+        for _, df in self.iter_raw_batches(source, profile):
+            if column_mapping is None:
+                column_mapping = map_columns(df.columns)
+            if df.empty:
+                continue
+            yield clean_batch(df, column_mapping).drop_duplicates()
+
+    def extract_raw(self, source, profile: Optional['LayoutProfile'] = None) -> pd.DataFrame:
+        """
+        Extrai todas as páginas mantendo os cabeçalhos originais do arquivo.
+
+        Returns:
+            DataFrame com as linhas de todas as páginas
+        """
+        all_tables = [df for _, df in self.iter_raw_batches(source, profile)]
+
+        if not all_tables:
+            raise ValueError("Nenhuma tabela encontrada no arquivo")
+
+        # Combinar todas as tabelas
+        combined_df = pd.concat(all_tables, ignore_index=True)
+        logger.info(f"Total de linhas após combinar todas as páginas: {len(combined_df)}")
+        return combined_df
+
+    def extract(self, source, profile: Optional['LayoutProfile'] = None, compact: bool = False) -> pd.DataFrame:
+        """
+        Extrai a lista de senioridade com as colunas padronizadas.
+
+        Args:
+            source: Arquivo a extrair
+            profile: Perfil de layout opcional
+            compact: Converte o resultado para o esquema compacto
+                (schema.to_compact), descartando linhas sem RE numérico
+
+        Returns:
+            DataFrame com as colunas de REQUIRED_COLUMNS encontradas no arquivo
+        """
+        combined_df = self.extract_raw(source, profile)
+
+        # Identificar, renomear e limpar as colunas
+        column_mapping = profile.column_mapping if profile else map_columns(combined_df.columns)
+        combined_df = clean_batch(combined_df, column_mapping)
+
+        # Remover linhas duplicadas
+        combined_df = combined_df.drop_duplicates()
+
+        if compact:
+            combined_df = to_compact(combined_df, errors='drop')
+
+        logger.info(f"Colunas finais: {combined_df.columns.tolist()}")
+        logger.info(f"Número final de registros: {len(combined_df)}")
+        return combined_df
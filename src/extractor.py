@@ -1,50 +1,50 @@
-import pdfplumber
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Union, TYPE_CHECKING
 import logging
 from io import BytesIO
 
+from column_inference import infer_column_mapping, infer_re_column
+from excel_reader import DEFAULT_CHUNK_SIZE, read_excel_compact
+from extraction_engine import ExcelBackend, ExtractionEngine, PdfTableBackend, source_name
+
+if TYPE_CHECKING:
+    from extraction_cache import ExtractionCache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def extract_data(file: Union[BytesIO, str], config: Dict) -> pd.DataFrame:
+# Versão da lógica de extração; deve ser incrementada quando o resultado mudar,
+# para invalidar as tabelas guardadas no cache de extração
+EXTRACTOR_VERSION = '4'
+
+def extract_data(file: Union[BytesIO, str], config: Dict, cache: Optional['ExtractionCache'] = None) -> pd.DataFrame:
     """
     Extrai dados de um arquivo PDF ou Excel.
     
     Args:
         file: Arquivo PDF ou Excel (BytesIO ou caminho do arquivo)
         config: Dicionário com configurações de extração
+        cache: Cache de extração opcional; se o mesmo arquivo já foi extraído, a tabela é lida do disco
         
     Returns:
         DataFrame pandas com os dados extraídos
     """
+    if cache is not None:
+        return cache.get_or_extract(
+            file, 'extractor.extract_data', EXTRACTOR_VERSION,
+            lambda: extract_data(file, config), settings=config
+        )
+    
     try:
-        if isinstance(file, BytesIO):
-            if file.name.endswith('.pdf'):
-                with pdfplumber.open(file) as pdf:
-                    first_page = pdf.pages[0]
-                    table = first_page.extract_table()
-                    
-                    if not table:
-                        raise ValueError("Nenhuma tabela encontrada no PDF")
-                    
-                    # Converter para DataFrame
-                    df = pd.DataFrame(table[1:], columns=table[0])
-            else:  # Excel file
-                df = pd.read_excel(file)
-        else:  # File path
-            if file.endswith('.pdf'):
-                with pdfplumber.open(file) as pdf:
-                    first_page = pdf.pages[0]
-                    table = first_page.extract_table()
-                    
-                    if not table:
-                        raise ValueError("Nenhuma tabela encontrada no PDF")
-                    
-                    # Converter para DataFrame
-                    df = pd.DataFrame(table[1:], columns=table[0])
-            else:  # Excel file
-                df = pd.read_excel(file)
+        # PDF: todas as páginas pelo motor de extração; qualquer outro formato é lido como Excel
+        if source_name(file).lower().endswith('.pdf'):
+            backend = PdfTableBackend()
+        elif config.get('excel_streaming', False):
+            return _extract_excel_compact(file, config)
+        else:
+            backend = ExcelBackend()
+        df = ExtractionEngine(backend).extract_raw(file)
         
         if df.empty:
             raise ValueError("O arquivo não contém dados")
@@ -63,25 +63,15 @@ def extract_data(file: Union[BytesIO, str], config: Dict) -> pd.DataFrame:
             re_column = 'RE'
             logger.info("Coluna 'RE' encontrada diretamente")
         else:
-            # Procurar por colunas que possam conter o RE
-            for col in df.columns:
-                # Verificar se a coluna contém números
-                if df[col].astype(str).str.contains(r'\d').any():
-                    logger.info(f"Coluna '{col}' contém números")
-                    # Verificar se os números têm o formato típico de RE (geralmente 5-6 dígitos)
-                    sample_values = df[col].astype(str).str.extract(r'(\d{5,6})')[0].dropna()
-                    if not sample_values.empty:
-                        re_column = col
-                        logger.info(f"Coluna '{col}' contém números no formato de RE")
-                        break
-        
-        if re_column is None:
-            # Se não encontrou uma coluna específica, tentar usar a primeira coluna que contenha números
-            for col in df.columns:
-                if df[col].astype(str).str.contains(r'\d').any():
-                    re_column = col
-                    logger.info(f"Usando coluna '{col}' como RE (contém números)")
-                    break
+            # Inferir pela amostra das colunas (RE, senioridade, nomes, ...)
+            re_column = infer_re_column(df)
+            if re_column is not None:
+                logger.info(f"Usando coluna '{re_column}' como RE")
+                
+                # Sem cabeçalho reconhecido, as demais colunas padronizadas também são inferidas
+                for col, canonical in infer_column_mapping(df).items():
+                    if canonical != 'RE' and canonical not in df.columns:
+                        df[canonical] = df[col]
         
         if re_column is None:
             raise ValueError("Não foi possível identificar a coluna do RE")
@@ -117,11 +107,40 @@ def extract_data(file: Union[BytesIO, str], config: Dict) -> pd.DataFrame:
         logger.error(f"Erro ao extrair dados do arquivo: {str(e)}")
         raise
 
+def _extract_excel_compact(file: Union[BytesIO, str], config: Dict) -> pd.DataFrame:
+    """
+    Lê uma planilha em blocos, apenas com as colunas da lista e tipos compactos.
+    
+    O resultado já está no esquema compacto (ver schema.to_compact): RE
+    int32, SENIORIDADE Int32 e FUNÇÃO e EQUIPAMENTO categóricos.
+    
+    Args:
+        file: Arquivo Excel (BytesIO ou caminho do arquivo)
+        config: Dicionário com configurações de extração ('excel_chunk_size' opcional)
+        
+    Returns:
+        DataFrame pandas com os dados extraídos
+    """
+    df = read_excel_compact(file, config.get('excel_chunk_size', DEFAULT_CHUNK_SIZE))
+    logger.info(f"Número de linhas lidas da planilha: {len(df)}")
+    
+    # Remover linhas onde o RE não é um número válido (4-7 dígitos)
+    df = df[df['RE'].between(1000, 9999999)]
+    logger.info(f"Número de linhas após filtrar REs por tamanho: {len(df)}")
+    
+    if df.empty:
+        raise ValueError("Não foi possível encontrar REs válidos no arquivo")
+    
+    # Manter o RE como primeira coluna, como no modo padrão
+    columns_to_keep = ['RE'] + [col for col in df.columns if col != 'RE']
+    return df[columns_to_keep].reset_index(drop=True)
+
 class PDFExtractor:
     """Classe responsável por extrair dados de arquivos PDF de listas de senioridade."""
     
-    def __init__(self):
+    def __init__(self, cache: Optional['ExtractionCache'] = None):
         self.required_columns = ['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'RE', 'SENIORIDADE']
+        self.cache = cache
     
     def extract_table_from_pdf(self, pdf_path: str) -> pd.DataFrame:
         """
@@ -133,24 +152,38 @@ class PDFExtractor:
         Returns:
             DataFrame pandas com os dados extraídos
         """
+        if self.cache is not None:
+            return self.cache.get_or_extract(
+                pdf_path, 'extractor.PDFExtractor.extract_table_from_pdf', EXTRACTOR_VERSION,
+                lambda: self._extract_table(pdf_path)
+            )
+        return self._extract_table(pdf_path)
+    
+    def fingerprints(self, pdf_path: str) -> Optional[np.ndarray]:
+        """
+        Hashes das linhas da tabela do PDF guardados no cache de extração.
+        
+        Returns:
+            Array com um hash por linha (ver comparator.row_fingerprints), ou
+            None sem cache ou se o PDF ainda não foi extraído
+        """
+        if self.cache is None:
+            return None
+        return self.cache.fingerprints_for(
+            pdf_path, 'extractor.PDFExtractor.extract_table_from_pdf', EXTRACTOR_VERSION
+        )
+    
+    def _extract_table(self, pdf_path: str) -> pd.DataFrame:
+        """Extrai a tabela do PDF sem passar pelo cache."""
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Assumindo que a tabela está na primeira página
-                first_page = pdf.pages[0]
-                table = first_page.extract_table()
-                
-                if not table:
-                    raise ValueError("Nenhuma tabela encontrada no PDF")
-                
-                # Converter para DataFrame
-                df = pd.DataFrame(table[1:], columns=table[0])
-                
-                # Verificar se todas as colunas necessárias estão presentes
-                missing_columns = [col for col in self.required_columns if col not in df.columns]
-                if missing_columns:
-                    raise ValueError(f"Colunas ausentes no PDF: {missing_columns}")
-                
-                return df
+            df = ExtractionEngine(PdfTableBackend()).extract_raw(pdf_path)
+            
+            # Verificar se todas as colunas necessárias estão presentes
+            missing_columns = [col for col in self.required_columns if col not in df.columns]
+            if missing_columns:
+                raise ValueError(f"Colunas ausentes no PDF: {missing_columns}")
+            
+            return df
                 
         except Exception as e:
             logger.error(f"Erro ao extrair dados do PDF {pdf_path}: {str(e)}")
@@ -0,0 +1,258 @@
+import pdfplumber
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from extraction_engine import map_columns
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.expanduser('~'), '.config', 'senioridade', 'perfis')
+
+# Diferença máxima (em pontos) entre o tamanho da página e o do perfil
+PAGE_SIZE_TOLERANCE = 2
+
+class LayoutProfile:
+    """
+    Layout de um emissor de listas de senioridade.
+
+    Guarda o que a extração descobriria de novo a cada execução: a linha
+    e a posição do cabeçalho, as fronteiras das colunas e o mapeamento dos
+    cabeçalhos para os nomes padronizados. As configurações de tabela do
+    pdfplumber não são aprendidas: table_settings guarda as que foram
+    passadas a learn (vazio para o padrão do pdfplumber), para que a
+    extração com o perfil use as mesmas.
+    """
+
+    def __init__(self, name: str, page_size: List[float], header: List[str], header_row: int,
+                 header_top: float, boundaries: List[float], column_mapping: Dict[str, str],
+                 table_settings: Optional[Dict] = None):
+        self.name = name
+        self.page_size = page_size
+        self.header = header
+        self.header_row = header_row
+        self.header_top = header_top
+        self.boundaries = boundaries
+        self.column_mapping = column_mapping
+        self.table_settings = table_settings or {}
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Identificador do layout, derivado do tamanho da página, do cabeçalho
+        e da sua posição e das fronteiras das colunas; layouts com o mesmo
+        cabeçalho em outra altura (por exemplo, com um título acima da
+        tabela) têm perfis diferentes.
+        """
+        payload = json.dumps([[round(v) for v in self.page_size], self.header, self.header_row,
+                              round(self.header_top), [round(v) for v in self.boundaries]], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+    @property
+    def header_tokens(self) -> List[str]:
+        """Palavras do cabeçalho, usadas para reconhecer o layout na primeira página."""
+        return [token.upper() for cell in self.header for token in str(cell).split()]
+
+    @classmethod
+    def learn(cls, page, table_settings: Optional[Dict] = None, name: Optional[str] = None) -> Optional['LayoutProfile']:
+        """
+        Cria um perfil a partir da tabela de uma página extraída com sucesso.
+
+        A linha do cabeçalho é a primeira em que a coluna RE é reconhecida,
+        o que permite tabelas com linhas de título acima do cabeçalho.
+
+        Returns:
+            Perfil aprendido, ou None se a página não tiver uma tabela reconhecível
+        """
+        return cls.from_table(page.find_table(table_settings), [float(page.width), float(page.height)],
+                              table_settings, name)
+
+    @classmethod
+    def from_table(cls, table, page_size: List[float], table_settings: Optional[Dict] = None,
+                   name: Optional[str] = None) -> Optional['LayoutProfile']:
+        """Como learn, a partir da tabela já encontrada na página (page.find_table) e do tamanho da página."""
+        if table is None:
+            return None
+
+        rows = table.extract()
+        for header_row, row in enumerate(rows):
+            header = [cell or '' for cell in row]
+            mapping = map_columns(header)
+            if 'RE' not in mapping.values():
+                continue
+
+            cells = table.rows[header_row].cells
+            if any(cell is None for cell in cells):
+                return None
+
+            profile = cls(
+                name=name or '',
+                page_size=page_size,
+                header=header,
+                header_row=header_row,
+                header_top=cells[0][1],
+                boundaries=[cells[0][0]] + [cell[2] for cell in cells],
+                column_mapping=mapping,
+                table_settings=table_settings
+            )
+            if not profile.name:
+                profile.name = f"perfil-{profile.fingerprint}"
+            return profile
+
+        return None
+
+    def matches(self, page_size: List[float], words: set) -> bool:
+        """Confere se a primeira página tem o tamanho e as palavras do cabeçalho do perfil."""
+        if any(abs(a - b) > PAGE_SIZE_TOLERANCE for a, b in zip(self.page_size, page_size)):
+            return False
+        return all(token in words for token in self.header_tokens)
+
+    def header_distance(self, word_tops: Dict[str, List[float]]) -> float:
+        """
+        Distância (em pontos) entre a altura do cabeçalho do perfil e a
+        ocorrência mais próxima da primeira palavra do cabeçalho na página.
+
+        Args:
+            word_tops: Alturas (top) das palavras da página, por palavra em maiúsculas
+        """
+        tops = word_tops.get(self.header_tokens[0], []) if self.header_tokens else []
+        return min((abs(top - self.header_top) for top in tops), default=float('inf'))
+
+    def column_layout(self):
+        """Layout de colunas para a extração por coordenadas."""
+        from coordinate_extractor import ColumnLayout
+        return ColumnLayout(self.header, self.boundaries, self.header_top)
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'page_size': self.page_size,
+            'header': self.header,
+            'header_row': self.header_row,
+            'header_top': self.header_top,
+            'boundaries': self.boundaries,
+            'column_mapping': self.column_mapping,
+            'table_settings': self.table_settings
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LayoutProfile':
+        return cls(**data)
+
+class ProfileStore:
+    """
+    Perfis de layout gravados em disco (um arquivo JSON por perfil).
+
+    Ao abrir um PDF, detect() compara o tamanho e as palavras da primeira
+    página com os perfis conhecidos, sem rodar a detecção de tabela. Quando
+    nenhum perfil serve, learn() cria um a partir da primeira extração bem
+    sucedida e o grava para as próximas execuções.
+    """
+
+    def __init__(self, profile_dir: Optional[str] = None):
+        self.profile_dir = profile_dir or os.environ.get('SENIORIDADE_PROFILE_DIR', DEFAULT_PROFILE_DIR)
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self._profiles = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.profile_dir, f"{name}.json")
+
+    def profiles(self) -> List[LayoutProfile]:
+        """Perfis gravados, carregados uma única vez por instância."""
+        if self._profiles is None:
+            self._profiles = []
+            for filename in sorted(os.listdir(self.profile_dir)):
+                if not filename.endswith('.json'):
+                    continue
+                try:
+                    with open(os.path.join(self.profile_dir, filename), encoding='utf-8') as f:
+                        self._profiles.append(LayoutProfile.from_dict(json.load(f)))
+                except Exception as e:
+                    logger.warning(f"Perfil inválido ignorado ({filename}): {str(e)}")
+        return self._profiles
+
+    def get(self, name: str) -> Optional[LayoutProfile]:
+        for profile in self.profiles():
+            if profile.name == name:
+                return profile
+        return None
+
+    def save(self, profile: LayoutProfile) -> None:
+        """Grava (ou substitui) um perfil."""
+        with open(self._path(profile.name), 'w', encoding='utf-8') as f:
+            json.dump(profile.to_dict(), f, ensure_ascii=False, indent=2)
+        self._profiles = [p for p in self.profiles() if p.name != profile.name] + [profile]
+        logger.info(f"Perfil de layout gravado: {profile.name}")
+
+    def delete(self, name: str) -> None:
+        """Remove um perfil."""
+        if os.path.exists(self._path(name)):
+            os.remove(self._path(name))
+        self._profiles = [p for p in self.profiles() if p.name != name]
+
+    def detect(self, pdf_file) -> Optional[LayoutProfile]:
+        """
+        Encontra o perfil do PDF a partir da primeira página.
+
+        Args:
+            pdf_file: Arquivo PDF (pode ser um arquivo ou BytesIO)
+
+        Returns:
+            O perfil com mais palavras de cabeçalho em comum e, entre esses,
+            o de cabeçalho mais próximo da altura em que ele aparece na
+            página; ou None
+        """
+        if not self.profiles():
+            return None
+
+        with pdfplumber.open(pdf_file) as pdf:
+            page = pdf.pages[0]
+            page_size = [float(page.width), float(page.height)]
+            page_words = page.extract_words()
+
+        words = {word['text'].upper() for word in page_words}
+        word_tops = {}
+        for word in page_words:
+            word_tops.setdefault(word['text'].upper(), []).append(word['top'])
+
+        candidates = [p for p in self.profiles() if p.matches(page_size, words)]
+        if not candidates:
+            logger.info("Nenhum perfil de layout corresponde ao PDF")
+            return None
+
+        profile = max(candidates, key=lambda p: (len(p.header_tokens), -p.header_distance(word_tops)))
+        logger.info(f"Perfil de layout detectado: {profile.name}")
+        return profile
+
+    def learn(self, pdf_file, table_settings: Optional[Dict] = None, name: Optional[str] = None,
+              first_page: Optional[Tuple[List[float], object]] = None) -> Optional[LayoutProfile]:
+        """
+        Cria e grava o perfil de um PDF a partir da sua primeira página.
+
+        Args:
+            pdf_file: Arquivo PDF (pode ser um arquivo ou BytesIO)
+            table_settings: Configurações de tabela do pdfplumber usadas na
+                extração, guardadas no perfil
+            name: Nome do perfil (padrão: derivado do layout)
+            first_page: Tamanho da primeira página e a tabela já encontrada
+                nela (ExtractionBackend.first_page); sem isso, o PDF é reaberto
+
+        Returns:
+            Perfil criado, ou None se a primeira página não tiver tabela reconhecível
+        """
+        if first_page is not None:
+            page_size, table = first_page
+            profile = LayoutProfile.from_table(table, page_size, table_settings, name)
+        else:
+            with pdfplumber.open(pdf_file) as pdf:
+                profile = LayoutProfile.learn(pdf.pages[0], table_settings, name)
+
+        if profile is None:
+            logger.warning("Não foi possível criar um perfil de layout para o PDF")
+            return None
+
+        self.save(profile)
+        return profile
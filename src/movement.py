@@ -0,0 +1,188 @@
+import logging
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from comparator import join_by_re
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Colunas do relatório de movimentação, uma linha por RE presente nas duas listas
+MOVEMENT_COLUMNS = ['RE', 'NOME', 'FUNÇÃO', 'EQUIPAMENTO', 'POSIÇÃO ANTIGA', 'POSIÇÃO NOVA',
+                    'VARIAÇÃO', 'ULTRAPASSOU', 'ULTRAPASSADO POR']
+
+def list_positions(df: pd.DataFrame) -> np.ndarray:
+    """
+    Posição de cada linha na lista (a partir de 1), pela SENIORIDADE.
+
+    Empates e SENIORIDADE ausente ou não numérica seguem a ordem das linhas
+    (ausentes no fim); sem a coluna SENIORIDADE vale a ordem das linhas.
+    """
+    if 'SENIORIDADE' not in df.columns:
+        return np.arange(1, len(df) + 1)
+
+    seniority = pd.to_numeric(df['SENIORIDADE'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    missing = np.isnan(seniority)
+    # np.lexsort ordena pela última chave primeiro: ausentes no fim, depois SENIORIDADE e linha
+    order = np.lexsort((np.arange(len(df)), np.where(missing, 0.0, seniority), missing))
+    positions = np.empty(len(df), dtype=np.int64)
+    positions[order] = np.arange(1, len(df) + 1)
+    return positions
+
+def smaller_before(values: np.ndarray) -> np.ndarray:
+    """
+    Para cada posição, conta os valores anteriores menores que o seu.
+
+    Os valores devem ser uma permutação de 0..n-1. A contagem é feita bit a
+    bit, do mais significativo ao menos, como nos passos de junção do
+    merge sort: em cada nível, os valores com o mesmo prefixo formam um grupo
+    e cada valor com o bit ligado soma os valores do grupo, anteriores a ele,
+    com o bit desligado. Depois, cada grupo é separado de forma estável em
+    desligados e ligados, o que dá os grupos do nível seguinte sem ordenar.
+    Cada nível é O(n) (somas acumuladas e indexação), e são O(log n)
+    níveis: O(n log n) no total, sem comparar pares.
+
+    Returns:
+        Array int64 com as contagens
+    """
+    values = np.asarray(values, dtype=np.int64)
+    size = len(values)
+    counts = np.zeros(size, dtype=np.int64)
+    if size < 2:
+        return counts
+
+    # Valores na ordem estável pelo prefixo já visto e, para cada posição
+    # dessa ordem, o início e o fim (exclusivo) do seu grupo
+    order = np.arange(size)
+    group_start = np.zeros(size, dtype=np.int64)
+    group_end = np.full(size, size, dtype=np.int64)
+    positions = np.arange(size)
+
+    for bit in range(int(values.max()).bit_length() - 1, -1, -1):
+        zeros = ((values[order] >> bit) & 1) == 0
+
+        # Zeros anteriores dentro do mesmo grupo (contagem exclusiva) e o total do grupo
+        zeros_through = np.cumsum(zeros)
+        zeros_before = zeros_through - zeros
+        before = zeros_before - zeros_before[group_start]
+        group_zeros = zeros_through[group_end - 1] - zeros_before[group_start]
+
+        ones = ~zeros
+        counts[order[ones]] += before[ones]
+
+        # Separação estável de cada grupo: desligados primeiro, depois ligados
+        split = group_start + group_zeros
+        target = np.where(zeros, group_start + before, split + (positions - group_start) - before)
+        order[target] = order.copy()
+        group_start[target] = np.where(zeros, group_start, split)
+        group_end[target] = np.where(zeros, split, group_end)
+    return counts
+
+def rank_movement(old_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula a movimentação na lista de cada RE presente nas duas listas.
+
+    A VARIAÇÃO é a posição antiga menos a nova (positiva quando o piloto
+    subiu) e inclui o efeito de entradas e saídas. ULTRAPASSOU conta os
+    pilotos, entre os presentes nas duas listas, que estavam à frente e
+    ficaram atrás; ULTRAPASSADO POR, o contrário. As contagens são as
+    inversões entre as duas ordens, calculadas em O(n log n).
+
+    Args:
+        old_df: Lista antiga
+        new_df: Lista nova
+
+    Returns:
+        DataFrame com as colunas MOVEMENT_COLUMNS disponíveis, na ordem da
+        lista nova
+    """
+    try:
+        _, _, common_old, common_new = join_by_re(old_df['RE'].to_numpy(), new_df['RE'].to_numpy())
+        old_positions = list_positions(old_df)[common_old]
+        new_positions = list_positions(new_df)[common_new]
+
+        # Ordem relativa dos pilotos comuns em cada lista (0..m-1)
+        old_rank = np.empty(len(common_old), dtype=np.int64)
+        old_rank[np.argsort(old_positions, kind='stable')] = np.arange(len(common_old))
+        new_rank = np.empty(len(common_new), dtype=np.int64)
+        new_rank[np.argsort(new_positions, kind='stable')] = np.arange(len(common_new))
+
+        # Percorrendo na ordem antiga, ultrapassou quem vinha antes e ficou
+        # atrás (maior na ordem nova); foi ultrapassado por quem vinha depois
+        # e ficou à frente
+        by_old = np.argsort(old_rank)
+        sequence = new_rank[by_old]
+        smaller = smaller_before(sequence)
+        previous = np.arange(len(sequence))
+        overtook = np.empty(len(sequence), dtype=np.int64)
+        overtaken = np.empty(len(sequence), dtype=np.int64)
+        overtook[by_old] = previous - smaller
+        overtaken[by_old] = sequence - smaller
+
+        movement = pd.DataFrame({'RE': new_df['RE'].to_numpy()[common_new]})
+        for column in ['NOME', 'FUNÇÃO', 'EQUIPAMENTO']:
+            if column in new_df.columns:
+                movement[column] = new_df[column].to_numpy()[common_new]
+                if isinstance(new_df[column].dtype, pd.CategoricalDtype):
+                    movement[column] = movement[column].astype(new_df[column].dtype)
+        movement['POSIÇÃO ANTIGA'] = old_positions
+        movement['POSIÇÃO NOVA'] = new_positions
+        movement['VARIAÇÃO'] = old_positions - new_positions
+        movement['ULTRAPASSOU'] = overtook
+        movement['ULTRAPASSADO POR'] = overtaken
+
+        movement = movement.sort_values('POSIÇÃO NOVA', kind='stable').reset_index(drop=True)
+        logger.info(f"Movimentação calculada para {len(movement)} pilotos: "
+                    f"{int((movement['VARIAÇÃO'] > 0).sum())} subiram, "
+                    f"{int((movement['VARIAÇÃO'] < 0).sum())} desceram")
+        return movement
+
+    except Exception as e:
+        logger.error(f"Erro ao calcular a movimentação na lista: {str(e)}")
+        raise
+
+def movement_summary(movement: pd.DataFrame, by: str) -> pd.DataFrame:
+    """
+    Agrega a movimentação por grupo (por exemplo, EQUIPAMENTO ou FUNÇÃO).
+
+    Args:
+        movement: Resultado de rank_movement
+        by: Coluna usada para agrupar
+
+    Returns:
+        DataFrame indexado pelo grupo, com o número de pilotos, a variação
+        média, mediana, maior subida e maior queda, quantos subiram e
+        desceram e o total de ultrapassagens
+    """
+    if by not in movement.columns:
+        raise ValueError(f"A coluna '{by}' não foi encontrada na movimentação")
+
+    groups = movement[by]
+    variation = movement['VARIAÇÃO'].groupby(groups, observed=True, sort=True)
+    return pd.DataFrame({
+        'PILOTOS': variation.size(),
+        'VARIAÇÃO MÉDIA': variation.mean().round(2),
+        'VARIAÇÃO MEDIANA': variation.median(),
+        'MAIOR SUBIDA': variation.max(),
+        'MAIOR QUEDA': variation.min(),
+        'SUBIRAM': (movement['VARIAÇÃO'] > 0).groupby(groups, observed=True, sort=True).sum(),
+        'DESCERAM': (movement['VARIAÇÃO'] < 0).groupby(groups, observed=True, sort=True).sum(),
+        'ULTRAPASSAGENS': movement['ULTRAPASSOU'].groupby(groups, observed=True, sort=True).sum(),
+    })
+
+def analyze_movement(old_df: pd.DataFrame, new_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Movimentação por piloto e agregada por EQUIPAMENTO e FUNÇÃO.
+
+    Returns:
+        Dicionário com 'pilotos' (rank_movement) e um resumo por coluna de
+        agrupamento presente ('EQUIPAMENTO', 'FUNÇÃO')
+    """
+    movement = rank_movement(old_df, new_df)
+    result = {'pilotos': movement}
+    for column in ['EQUIPAMENTO', 'FUNÇÃO']:
+        if column in movement.columns:
+            result[column] = movement_summary(movement, column)
+    return result
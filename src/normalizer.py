@@ -1,12 +1,129 @@
 import pandas as pd
+import numpy as np
 import re
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 import logging
 import unicodedata
 
+from schema import INTEGER_COLUMNS, is_compact, to_compact
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_NON_DIGITS = re.compile(r'\D')
+
+def _factorize(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Como pd.factorize(values, use_na_sentinel=False), também para textos com NUL.
+
+    Colunas só de texto usam a tabela de strings C do pandas, que corta
+    cada valor no primeiro '\x00' ('\x00A' e '\x00B' virariam um único
+    valor); nesse caso raro, os valores são agrupados por um dicionário.
+    """
+    if not any('\x00' in value for value in values.tolist() if type(value) is str):
+        return pd.factorize(values, use_na_sentinel=False)
+    
+    positions = {}
+    codes = np.fromiter((positions.setdefault(value, len(positions)) for value in values.tolist()),
+                        dtype=np.intp, count=len(values))
+    uniques = np.empty(len(positions), dtype=object)
+    uniques[:] = list(positions)
+    return codes, uniques
+
+def _collapse_text(text: str) -> str:
+    """Maiúsculas, sem espaços nas pontas e com um único espaço entre as palavras."""
+    return ' '.join(text.strip().upper().split())
+
+def _keep_digits(text: str) -> str:
+    """Remove os caracteres não numéricos."""
+    # isdecimal aceita os mesmos dígitos que \d; o caso comum dispensa a regex
+    return text if text.isdecimal() else _NON_DIGITS.sub('', text)
+
+def _seniority_or_empty(text: str) -> str:
+    """Senioridade como inteiro sem zeros à esquerda, ou "" se não houver dígitos."""
+    digits = _keep_digits(text)
+    return str(int(digits)) if digits else ""
+
+def _normalize_column(series: pd.Series, normalize) -> pd.Series:
+    """
+    Normaliza uma coluna chamando normalize (sobre o texto do valor) uma
+    única vez por valor distinto (_factorize) e espalhando o resultado
+    pelas linhas; valores ausentes viram "".
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Categórica: as categorias já são os valores distintos; o código -1 (ausente) pega o último, ""
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories.to_numpy(dtype=object)
+    else:
+        codes, uniques = _factorize(series)
+    
+    normalized = np.full(len(uniques) + 1, "", dtype=object)
+    present = np.flatnonzero(~pd.isna(uniques))
+    normalized[present] = [normalize(str(value)) for value in uniques[present]]
+    return pd.Series(normalized[codes], index=series.index, name=series.name, dtype=object)
+
+def _drop_duplicate_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Equivalente a df.drop_duplicates(), comparando linhas inteiras apenas
+    entre as que repetem o RE (linhas iguais têm necessariamente o mesmo RE).
+    """
+    if 'RE' not in df.columns:
+        return df.drop_duplicates()
+    
+    candidates = df['RE'].duplicated(keep=False).to_numpy()
+    if not candidates.any():
+        return df
+    
+    duplicated = np.zeros(len(df), dtype=bool)
+    duplicated[candidates] = df[candidates].duplicated().to_numpy()
+    return df[~duplicated]
+
+class _CombiningMarks(dict):
+    """
+    Tabela de str.translate que remove as marcas combinantes (categoria Mn).
+
+    Cada code point é classificado uma única vez, na primeira vez em que
+    aparece, em vez de consultar unicodedata.category a cada caractere.
+    """
+
+    def __missing__(self, code_point: int) -> Optional[int]:
+        value = None if unicodedata.category(chr(code_point)) == 'Mn' else code_point
+        self[code_point] = value
+        return value
+
+_COMBINING_MARKS = _CombiningMarks()
+
+_SPECIAL_CHARS = re.compile(r'[^a-zA-Z0-9\s]')
+
+# Valores distintos guardados entre chamadas de normalize_data (nomes e
+# funções se repetem de uma lista mensal para a seguinte)
+_VALUE_CACHE_SIZE = 200000
+
+def strip_accents(text: str) -> str:
+    """Remove os acentos (decomposição NFD sem as marcas combinantes)."""
+    if text.isascii():
+        return text
+    return unicodedata.normalize('NFD', text).translate(_COMBINING_MARKS)
+
+def _normalize_value(text: str, remove_accents: bool, standardize_case: bool,
+                     remove_special_chars: bool) -> str:
+    """Normaliza um valor já convertido para texto, como normalize_data."""
+    text = text.strip()
+    if remove_accents:
+        text = strip_accents(text)
+    if standardize_case:
+        text = text.upper()
+    if remove_special_chars:
+        text = _SPECIAL_CHARS.sub('', text)
+    return text
+
+_normalize_value_cached = lru_cache(maxsize=_VALUE_CACHE_SIZE)(_normalize_value)
+
+def clear_normalization_cache() -> None:
+    """Descarta os valores normalizados guardados."""
+    _normalize_value_cached.cache_clear()
+
 class DataNormalizer:
     """Classe responsável por normalizar e limpar os dados extraídos dos PDFs."""
     
@@ -19,12 +136,21 @@ class DataNormalizer:
             'RE': self._normalize_re,
             'SENIORIDADE': self._normalize_seniority
         }
+        # Versões por coluna (uma chamada por valor distinto), usadas por normalize_dataframe
+        self.series_mappings = {
+            'FUNÇÃO': self._normalize_text_series,
+            'EQUIPAMENTO': self._normalize_text_series,
+            'NOME': self._normalize_text_series,
+            'NOME DE GUERRA': self._normalize_text_series,
+            'RE': self._normalize_re_series,
+            'SENIORIDADE': self._normalize_seniority_series
+        }
     
     def _normalize_text(self, text: str) -> str:
         """Normaliza texto removendo espaços extras e convertendo para maiúsculas."""
         if pd.isna(text):
             return ""
-        return ' '.join(str(text).strip().upper().split())
+        return _collapse_text(str(text))
     
     def _normalize_function(self, text: str) -> str:
         """Normaliza função do piloto."""
@@ -47,21 +173,43 @@ class DataNormalizer:
         if pd.isna(text):
             return ""
         # Remove caracteres não numéricos
-        return re.sub(r'\D', '', str(text))
+        return _keep_digits(str(text))
     
     def _normalize_seniority(self, text: str) -> str:
         """Normaliza senioridade."""
         if pd.isna(text):
             return ""
         # Remove caracteres não numéricos e converte para inteiro
-        return str(int(re.sub(r'\D', '', str(text))))
+        return str(int(_keep_digits(str(text))))
+    
+    def _normalize_text_series(self, series: pd.Series) -> pd.Series:
+        """_normalize_text aplicado à coluna, uma vez por valor distinto."""
+        return _normalize_column(series, _collapse_text)
+    
+    def _normalize_re_series(self, series: pd.Series) -> pd.Series:
+        """_normalize_re aplicado à coluna, uma vez por valor distinto (mantém zeros à esquerda)."""
+        return _normalize_column(series, _keep_digits)
+    
+    def _normalize_seniority_series(self, series: pd.Series) -> pd.Series:
+        """
+        _normalize_seniority aplicado à coluna, uma vez por valor distinto.
+        
+        Valores sem nenhum dígito viram "" em vez de interromper a normalização.
+        """
+        return _normalize_column(series, _seniority_or_empty)
     
     def normalize_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normaliza todos os dados do DataFrame.
         
+        Cada valor distinto de uma coluna é normalizado uma única vez, com o
+        mesmo resultado dos métodos por célula (column_mappings), exceto numa mudança de
+        comportamento: uma SENIORIDADE sem nenhum dígito (vazia, "N/A")
+        vira "" em vez de interromper a normalização com ValueError.
+        
         Args:
-            df: DataFrame com dados brutos
+            df: DataFrame com dados brutos (texto ou no esquema compacto;
+                o resultado mantém o mesmo formato)
             
         Returns:
             DataFrame com dados normalizados
@@ -70,17 +218,25 @@ class DataNormalizer:
         
         # Criar cópia para não modificar o original
         normalized_df = df.copy()
+        compact = is_compact(df)
         
-        # Aplicar normalização para cada coluna
-        for column, normalizer in self.column_mappings.items():
+        # Aplicar normalização para cada coluna (uma vez por valor distinto)
+        for column, normalizer in self.series_mappings.items():
             if column in normalized_df.columns:
-                normalized_df[column] = normalized_df[column].apply(normalizer)
+                # No esquema compacto RE e SENIORIDADE já são inteiros
+                if compact and column in INTEGER_COLUMNS:
+                    continue
+                normalized_df[column] = normalizer(normalized_df[column])
         
         # Remover linhas duplicadas
-        normalized_df = normalized_df.drop_duplicates()
+        normalized_df = _drop_duplicate_rows(normalized_df)
         
-        # Remover linhas com RE vazio
-        normalized_df = normalized_df[normalized_df['RE'] != ""]
+        if compact:
+            # O esquema compacto não tem RE vazio; só refaz as categorias e os nomes internados
+            normalized_df = to_compact(normalized_df)
+        else:
+            # Remover linhas com RE vazio
+            normalized_df = normalized_df[normalized_df['RE'].to_numpy() != ""]
         
         logger.info("Normalização concluída!")
         return normalized_df 
@@ -100,27 +256,25 @@ def normalize_data(df: pd.DataFrame, config: Dict) -> pd.DataFrame:
         # Criar cópia para não modificar o original
         normalized_df = df.copy()
         
+        options = (
+            bool(config.get('remove_accents', True)),
+            bool(config.get('standardize_case', True)),
+            bool(config.get('remove_special_chars', True))
+        )
+        
         # Aplicar normalizações básicas
         for column in normalized_df.columns:
-            # Converter para string e remover espaços extras
-            normalized_df[column] = normalized_df[column].astype(str).str.strip()
-            
-            # Remover acentos se configurado
-            if config.get('remove_accents', True):
-                normalized_df[column] = normalized_df[column].apply(
-                    lambda x: ''.join(c for c in unicodedata.normalize('NFD', x)
-                                    if unicodedata.category(c) != 'Mn')
-                )
-            
-            # Padronizar maiúsculas/minúsculas se configurado
-            if config.get('standardize_case', True):
-                normalized_df[column] = normalized_df[column].str.upper()
+            # Converter para string antes de agrupar os valores
+            text = normalized_df[column].astype(str)
             
-            # Remover caracteres especiais se configurado
-            if config.get('remove_special_chars', True):
-                normalized_df[column] = normalized_df[column].apply(
-                    lambda x: re.sub(r'[^a-zA-Z0-9\s]', '', x)
-                )
+            if config.get('factorize', True):
+                # Cada valor distinto é normalizado uma única vez (com cache entre chamadas)
+                codes, uniques = _factorize(text)
+                normalized = np.array([_normalize_value_cached(value, *options) for value in uniques],
+                                      dtype=object)
+                normalized_df[column] = normalized[codes]
+            else:
+                normalized_df[column] = text.map(lambda x: _normalize_value(x, *options))
         
         # Remover linhas duplicadas
         normalized_df = normalized_df.drop_duplicates()
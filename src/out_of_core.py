@@ -0,0 +1,377 @@
+import logging
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from comparator import _column_values, collect_differences, diff_fields, join_by_re
+from schema import is_compact
+from table_io import read_table, write_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Comparação fora da memória: cada lista é gravada em disco em blocos
+# ordenados pelo RE (runs) e as duas são lidas de volta aos poucos, numa
+# junção por intercalação (merge join). Em memória ficam só o run sendo
+# montado, um bloco de cada run aberto e as diferenças encontradas.
+
+# Linhas acumuladas antes de ordenar e gravar um run
+DEFAULT_RUN_ROWS = 50000
+
+# Linhas de cada arquivo de um run, a unidade lida durante a intercalação
+DEFAULT_BLOCK_ROWS = 5000
+
+# Máximo de runs de uma lista intercalados ao mesmo tempo; acima disso, os
+# runs são fundidos em passadas intermediárias
+MAX_FAN_IN = 16
+
+# Colunas auxiliares gravadas junto com a lista
+KEY_COLUMN = '__RE'
+POSITION_COLUMN = '__POSIÇÃO'
+
+def _re_keys(values) -> np.ndarray:
+    """REs como texto (a forma de compare_tables), para ordenar as duas listas do mesmo jeito."""
+    return pd.Series(values, dtype=object).astype(str).to_numpy().astype(str)
+
+class SortedSpill:
+    """
+    Lista de senioridade gravada em disco em runs ordenados pelo RE.
+
+    Os lotes (por exemplo, as páginas de pdf_extractor.iter_table_batches)
+    são acumulados até run_rows linhas, ordenados pelo RE e gravados em
+    arquivos de block_rows linhas no formato de table_io. Cada linha guarda
+    a sua posição na lista, de modo que a ordem original pode ser
+    recuperada. Com mais de MAX_FAN_IN runs, finish os funde até restarem
+    no máximo MAX_FAN_IN.
+    """
+
+    def __init__(self, directory: str, run_rows: int = DEFAULT_RUN_ROWS, block_rows: int = DEFAULT_BLOCK_ROWS):
+        self.directory = directory
+        self.run_rows = run_rows
+        self.block_rows = block_rows
+        self.runs: List[List[str]] = []
+        self.rows = 0
+        self.columns: Optional[List[str]] = None
+        self.dtypes: Dict[str, object] = {}
+        self.compact = True
+        self._pending: List[pd.DataFrame] = []
+        self._pending_rows = 0
+        self._files = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[pd.DataFrame], directory: str, **options) -> 'SortedSpill':
+        """Grava todos os lotes e finaliza os runs."""
+        spill = cls(directory, **options)
+        for batch in batches:
+            spill.add(batch)
+        spill.finish()
+        return spill
+
+    def add(self, df: pd.DataFrame) -> None:
+        """Acrescenta um lote ao final da lista; grava um run ao completar run_rows linhas."""
+        if df.empty:
+            return
+        if 'RE' not in df.columns:
+            raise ValueError("A coluna 'RE' não foi encontrada no lote")
+
+        if self.columns is None:
+            self.columns = list(df.columns)
+            self.dtypes = {column: df[column].dtype for column in df.columns}
+        elif list(df.columns) != self.columns:
+            df = df.reindex(columns=self.columns)
+        self.compact = self.compact and is_compact(df)
+
+        df = df.reset_index(drop=True)
+        df[KEY_COLUMN] = _re_keys(df['RE'])
+        df[POSITION_COLUMN] = np.arange(self.rows, self.rows + len(df), dtype=np.int64)
+        self.rows += len(df)
+        self._pending.append(df)
+        self._pending_rows += len(df)
+        if self._pending_rows >= self.run_rows:
+            self._write_run()
+
+    def finish(self) -> None:
+        """Grava o run pendente e funde os runs excedentes (até MAX_FAN_IN)."""
+        if self._pending:
+            self._write_run()
+        while len(self.runs) > MAX_FAN_IN:
+            logger.info(f"Fundindo {len(self.runs)} runs em grupos de {MAX_FAN_IN}")
+            groups = [self.runs[start:start + MAX_FAN_IN] for start in range(0, len(self.runs), MAX_FAN_IN)]
+            merged = []
+            for group in groups:
+                chunks = (chunk for chunk, _ in _merge_sorted([self._iter_run(run) for run in group]))
+                merged.append(self._write_blocks(chunks))
+                for path in (path for run in group for path in run):
+                    os.remove(path)
+            self.runs = merged
+
+    def _write_run(self) -> None:
+        df = pd.concat(self._pending, ignore_index=True)
+        self._pending = []
+        self._pending_rows = 0
+        order = np.argsort(df[KEY_COLUMN].to_numpy(), kind='stable')
+        self.runs.append(self._write_blocks([df.iloc[order]]))
+
+    def _write_blocks(self, chunks: Iterable[pd.DataFrame]) -> List[str]:
+        """Grava frames já ordenados em arquivos de block_rows linhas; retorna os caminhos."""
+        paths = []
+        pending = []
+        pending_rows = 0
+
+        def write(df):
+            path = os.path.join(self.directory, f"bloco{self._files:06d}.npz")
+            self._files += 1
+            write_table(df, path, compressed=False)
+            paths.append(path)
+
+        for chunk in chunks:
+            pending.append(chunk)
+            pending_rows += len(chunk)
+            if pending_rows < self.block_rows:
+                continue
+            df = pd.concat(pending, ignore_index=True)
+            full = len(df) - len(df) % self.block_rows
+            for start in range(0, full, self.block_rows):
+                write(df.iloc[start:start + self.block_rows])
+            pending = [df.iloc[full:]]
+            pending_rows = len(df) - full
+
+        if pending_rows:
+            write(pd.concat(pending, ignore_index=True))
+        return paths
+
+    def _read_block(self, path: str) -> pd.DataFrame:
+        """Lê um bloco, com os tipos numéricos e os ausentes (None) da lista original."""
+        df = read_table(path)
+        for column, dtype in self.dtypes.items():
+            if df[column].dtype == object:
+                values = df[column].to_numpy()
+                missing = pd.isna(values)
+                if missing.any():
+                    values[missing] = None
+                    df[column] = values
+            elif df[column].dtype != dtype and pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                df[column] = df[column].astype(dtype)
+        return df
+
+    def _iter_run(self, run: List[str]) -> Iterator[pd.DataFrame]:
+        for path in run:
+            yield self._read_block(path)
+
+    def streams(self) -> List[Iterator[pd.DataFrame]]:
+        """Um iterador de blocos ordenados por run, na ordem da lista."""
+        if self._pending:
+            raise RuntimeError("SortedSpill.finish deve ser chamado antes da leitura")
+        return [self._iter_run(run) for run in self.runs]
+
+def _merge_sorted(streams: List[Iterator[pd.DataFrame]]) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Intercala fluxos de blocos ordenados pelo RE (KEY_COLUMN).
+
+    Cada fluxo mantém em memória só o bloco corrente. Um trecho é emitido
+    quando todos os seus REs são menores que o último RE carregado dos
+    fluxos ainda não esgotados; assim, cada RE aparece por inteiro (todas as
+    suas linhas, de todos os fluxos) em um único trecho.
+
+    Yields:
+        (trecho ordenado pelo RE, índice do fluxo de cada linha); linhas do
+        mesmo RE seguem a ordem dos fluxos e, dentro de cada um, a de leitura
+    """
+    count = len(streams)
+    buffers: List[Optional[pd.DataFrame]] = [None] * count
+    keys: List[np.ndarray] = [np.array([], dtype=str)] * count
+    active = [True] * count
+
+    def extend(i):
+        block = next(streams[i], None)
+        if block is None:
+            active[i] = False
+            return
+        buffers[i] = block if buffers[i] is None or buffers[i].empty else pd.concat([buffers[i], block], ignore_index=True)
+        keys[i] = buffers[i][KEY_COLUMN].to_numpy().astype(str)
+
+    while True:
+        for i in range(count):
+            while active[i] and not len(keys[i]):
+                extend(i)
+
+        limits = [keys[i][-1] for i in range(count) if active[i]]
+        if limits:
+            bound = min(limits)
+            cuts = [int(np.searchsorted(keys[i], bound, side='left')) for i in range(count)]
+            if not any(cuts):
+                # Todo o trecho disponível tem o RE do limite: carregar mais blocos
+                for i in range(count):
+                    if active[i] and keys[i][-1] == bound:
+                        extend(i)
+                continue
+        else:
+            cuts = [len(keys[i]) for i in range(count)]
+            if not any(cuts):
+                return
+
+        parts = []
+        for i, cut in enumerate(cuts):
+            if cut:
+                parts.append(buffers[i].iloc[:cut])
+                buffers[i] = buffers[i].iloc[cut:]
+                keys[i] = keys[i][cut:]
+        chunk = pd.concat(parts, ignore_index=True)
+        sources = np.repeat(np.arange(count), cuts)
+        order = np.argsort(chunk[KEY_COLUMN].to_numpy().astype(str), kind='stable')
+        yield chunk.iloc[order].reset_index(drop=True), sources[order]
+
+def compare_spills(base: SortedSpill, compare: SortedSpill, reconcile: bool = False,
+                   columnar: bool = False) -> Dict:
+    """
+    Compara duas listas gravadas com SortedSpill por intercalação, sem carregá-las inteiras.
+
+    O resultado é o mesmo de comparator.compare_tables (mesmos registros,
+    na mesma ordem): as entradas, saídas e linhas alteradas encontradas em
+    cada trecho são guardadas e, ao final, ordenadas pela posição nas listas.
+
+    Args:
+        base: Lista base
+        compare: Lista de comparação
+        reconcile: Pareia saídas e entradas com nomes muito semelhantes
+            (desligado por padrão, como em compare_tables)
+        columnar: Devolve em 'differences' o ChangeSet em vez da lista de registros
+
+    Returns:
+        Dicionário no formato de compare_tables
+    """
+    try:
+        logger.info(f"Total de registros na tabela base: {base.rows}")
+        logger.info(f"Total de registros na tabela de comparação: {compare.rows}")
+
+        # Como em compare_tables, REs inteiros só quando as duas listas são compactas
+        text_re = not (base.compact and compare.compact)
+        base_streams = base.streams()
+        entered_parts, left_parts = [], []
+        changed_base_parts, changed_compare_parts, mask_parts = [], [], []
+        common = 0
+
+        for chunk, sources in _merge_sorted(base_streams + compare.streams()):
+            if text_re:
+                chunk['RE'] = chunk[KEY_COLUMN]
+            from_base = sources < len(base_streams)
+            base_chunk = chunk[from_base].reset_index(drop=True)
+            compare_chunk = chunk[~from_base].reset_index(drop=True)
+
+            entered, left, common_base, common_compare = join_by_re(
+                base_chunk[KEY_COLUMN].to_numpy(), compare_chunk[KEY_COLUMN].to_numpy()
+            )
+            entered_parts.append(compare_chunk.iloc[entered])
+            left_parts.append(base_chunk.iloc[left])
+            common += len(common_base)
+
+            masks = diff_fields(_column_values(base_chunk), _column_values(compare_chunk), common_base, common_compare)
+            if masks:
+                changed = np.logical_or.reduce(list(masks.values()))
+                changed_base_parts.append(base_chunk.iloc[common_base[changed]])
+                changed_compare_parts.append(compare_chunk.iloc[common_compare[changed]])
+                mask_parts.append({column: mask[changed] for column, mask in masks.items()})
+
+        logger.info(f"REs em comum: {common}")
+
+        # Ordem de compare_tables: entradas e mudanças pela lista de
+        # comparação, saídas pela lista base
+        base_columns = base.columns + [KEY_COLUMN, POSITION_COLUMN]
+        compare_columns = compare.columns + [KEY_COLUMN, POSITION_COLUMN]
+        entered_df = _sorted_by_position(_concat(entered_parts, compare_columns))
+        left_df = _sorted_by_position(_concat(left_parts, base_columns))
+        changed_base_df = _concat(changed_base_parts, base_columns)
+        changed_compare_df = _concat(changed_compare_parts, compare_columns)
+        order = np.argsort(changed_compare_df[POSITION_COLUMN].to_numpy(), kind='stable')
+        masks = {
+            column: np.concatenate([part[column] for part in mask_parts])[order]
+            for column in (mask_parts[0] if mask_parts else {})
+        }
+
+        # Só as linhas com diferenças são montadas em memória
+        base_rows = pd.concat([left_df, changed_base_df.iloc[order]], ignore_index=True)
+        compare_rows = pd.concat([entered_df, changed_compare_df.iloc[order]], ignore_index=True)
+        differences, entered, left, reconciled = collect_differences(
+            _column_values(base_rows), _column_values(compare_rows),
+            np.arange(len(entered_df)), np.arange(len(left_df)),
+            len(left_df) + np.arange(len(order)), len(entered_df) + np.arange(len(order)),
+            masks, reconcile
+        )
+
+        logger.info(f"Total de diferenças encontradas: {len(differences)}")
+
+        return {
+            'differences': differences if columnar else differences.to_records(),
+            'total_base': base.rows,
+            'total_compare': compare.rows,
+            'total_differences': len(differences),
+            'entered': len(entered),
+            'left': len(left),
+            'reconciled': len(reconciled)
+        }
+
+    except Exception as e:
+        logger.error(f"Erro ao comparar as listas gravadas em disco: {str(e)}")
+        raise
+
+def _concat(parts: List[pd.DataFrame], columns: List[str]) -> pd.DataFrame:
+    frames = [part for part in parts if len(part)]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+def _sorted_by_position(df: pd.DataFrame) -> pd.DataFrame:
+    order = np.argsort(df[POSITION_COLUMN].to_numpy(), kind='stable')
+    return df.iloc[order].reset_index(drop=True)
+
+def compare_out_of_core(base_batches: Iterable[pd.DataFrame], compare_batches: Iterable[pd.DataFrame],
+                        work_dir: Optional[str] = None, run_rows: int = DEFAULT_RUN_ROWS,
+                        block_rows: int = DEFAULT_BLOCK_ROWS, reconcile: bool = False,
+                        columnar: bool = False) -> Dict:
+    """
+    Compara duas listas lidas em lotes, com memória limitada independentemente do tamanho delas.
+
+    Cada lista é gravada em disco em runs ordenados pelo RE (SortedSpill) e
+    comparada por intercalação (compare_spills). Os arquivos temporários são
+    removidos ao final.
+
+    Args:
+        base_batches: Lotes da lista base (por exemplo, iter_table_batches
+            ou excel_reader.iter_excel_chunks)
+        compare_batches: Lotes da lista de comparação
+        work_dir: Diretório dos arquivos temporários (padrão: o do sistema)
+        run_rows: Linhas mantidas em memória antes de gravar um run
+        block_rows: Linhas lidas de cada run por vez na intercalação
+        reconcile: Pareia saídas e entradas com nomes muito semelhantes
+            (desligado por padrão, como em compare_tables)
+        columnar: Devolve em 'differences' o ChangeSet em vez da lista de registros
+
+    Returns:
+        Dicionário no formato de comparator.compare_tables
+    """
+    directory = tempfile.mkdtemp(prefix='senioridade-', dir=work_dir)
+    try:
+        options = {'run_rows': run_rows, 'block_rows': block_rows}
+        base = SortedSpill.from_batches(base_batches, os.path.join(directory, 'base'), **options)
+        compare = SortedSpill.from_batches(compare_batches, os.path.join(directory, 'comparacao'), **options)
+        if base.columns is None or compare.columns is None:
+            raise ValueError("Nenhuma linha encontrada em uma ou ambas as listas")
+        logger.info(f"Listas gravadas em {len(base.runs)} + {len(compare.runs)} runs")
+        return compare_spills(base, compare, reconcile, columnar)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def compare_files_out_of_core(base_file, compare_file, **options) -> Dict:
+    """
+    Compara dois arquivos (PDF ou Excel) fora da memória, extraindo página
+    por página (ver compare_out_of_core para as opções).
+    """
+    from extraction_engine import ExtractionEngine, backend_for
+    return compare_out_of_core(
+        ExtractionEngine(backend_for(base_file)).iter_batches(base_file),
+        ExtractionEngine(backend_for(compare_file)).iter_batches(compare_file),
+        **options
+    )
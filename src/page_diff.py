@@ -0,0 +1,135 @@
+import pdfplumber
+import hashlib
+import logging
+from difflib import SequenceMatcher
+from pdfminer.pdftypes import PDFStream, resolve1
+from typing import Dict, List, Tuple
+
+from extraction_engine import page_streams, page_text
+from pdf_extractor import extract_table_from_pages
+from comparator import compare_tables
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _font_fingerprint(font) -> bytes:
+    """Identificação de uma fonte: nome, tipo, codificação e mapa para Unicode."""
+    font = resolve1(font)
+    parts = [repr(resolve1(font.get(key))) for key in ('BaseFont', 'Subtype', 'Encoding')]
+    to_unicode = resolve1(font.get('ToUnicode'))
+    data = to_unicode.get_data() if isinstance(to_unicode, PDFStream) else b''
+    return '|'.join(parts).encode('utf-8') + data
+
+def _content_hash(page) -> str:
+    """
+    Hash dos content streams da página, sem interpretar o texto.
+
+    Entram também os Form XObjects usados pela página (o texto pode estar
+    neles, com a página só chamando '/Fm1 Do') e as fontes de cada um,
+    já que a mesma sequência de bytes desenha outro texto com outra fonte.
+    """
+    digest = hashlib.sha1()
+    streams, resources = page_streams(page)
+    for stream in streams:
+        digest.update(stream.get_data())
+    for resource in resources:
+        fonts = resolve1((resource or {}).get('Font')) or {}
+        for name in sorted(fonts, key=str):
+            digest.update(str(name).encode('utf-8') + _font_fingerprint(fonts[name]))
+    return digest.hexdigest()
+
+def _text_hash(page) -> str:
+    """Hash da sequência de caracteres da página."""
+    return hashlib.sha1(page_text(page).encode('utf-8')).hexdigest()
+
+def page_hashes(pdf_file, method: str = 'content') -> List[str]:
+    """
+    Calcula o hash de cada página do PDF.
+    
+    Args:
+        pdf_file: Arquivo PDF (pode ser um arquivo ou BytesIO)
+        method: 'content' usa os bytes dos content streams da página e dos
+            formulários (XObjects) que ela usa, com as fontes, sem análise
+            de layout (muito mais rápido); 'text' usa a sequência de
+            caracteres, que ignora diferenças que não afetam o texto
+    
+    Returns:
+        Lista de hashes, na ordem das páginas
+    """
+    if method not in ('content', 'text'):
+        raise ValueError(f"Método de hash inválido: {method}")
+    
+    page_hash = _content_hash if method == 'content' else _text_hash
+    hashes = []
+    with pdfplumber.open(pdf_file) as pdf:
+        for page in pdf.pages:
+            hashes.append(page_hash(page))
+            page.flush_cache()
+    return hashes
+
+def changed_pages(old_hashes: List[str], new_hashes: List[str]) -> Tuple[List[int], List[int]]:
+    """
+    Alinha as páginas das duas listas e retorna as que mudaram.
+
+    As páginas são alinhadas como sequências (difflib), de modo que uma
+    página inserida no meio não faz todas as seguintes parecerem diferentes.
+
+    Returns:
+        Tupla (páginas alteradas da lista antiga, páginas alteradas da lista nova),
+        numeradas a partir de 1
+    """
+    matcher = SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    old_equal = set()
+    new_equal = set()
+    for block in matcher.get_matching_blocks():
+        old_equal.update(range(block.a, block.a + block.size))
+        new_equal.update(range(block.b, block.b + block.size))
+
+    old_changed = [i + 1 for i in range(len(old_hashes)) if i not in old_equal]
+    new_changed = [i + 1 for i in range(len(new_hashes)) if i not in new_equal]
+    return old_changed, new_changed
+
+def compare_pdfs_by_page(old_pdf, new_pdf, method: str = 'content') -> Dict:
+    """
+    Compara duas listas em PDF extraindo apenas as páginas que mudaram.
+
+    Páginas com o mesmo texto nas duas listas são tratadas como "sem
+    mudanças" para todos os seus REs: como cada RE aparece uma única vez na
+    lista, um RE numa página idêntica não pode ter entrado, saído ou mudado.
+
+    Args:
+        old_pdf: PDF da lista base
+        new_pdf: PDF da lista de comparação
+        method: Forma de calcular o hash das páginas (ver page_hashes)
+
+    Returns:
+        Dicionário no formato de compare_tables, com os totais referentes às
+        páginas comparadas e as chaves adicionais 'pages_compared' e
+        'pages_skipped'
+    """
+    old_hashes = page_hashes(old_pdf, method)
+    old_changed, new_changed = changed_pages(old_hashes, page_hashes(new_pdf, method))
+    skipped = len(old_hashes) - len(old_changed)
+    logger.info(f"Páginas alteradas: {len(old_changed)} na lista base, {len(new_changed)} na lista nova "
+                f"({skipped} páginas idênticas ignoradas)")
+
+    if not old_changed and not new_changed:
+        return {
+            'differences': [],
+            'total_base': 0,
+            'total_compare': 0,
+            'total_differences': 0,
+            'entered': 0,
+            'left': 0,
+            'reconciled': 0,
+            'pages_compared': (0, 0),
+            'pages_skipped': skipped
+        }
+
+    old_df = extract_table_from_pages(old_pdf, pages=old_changed)
+    new_df = extract_table_from_pages(new_pdf, pages=new_changed)
+
+    result = compare_tables(old_df, new_df)
+    result['pages_compared'] = (len(old_changed), len(new_changed))
+    result['pages_skipped'] = skipped
+    return result
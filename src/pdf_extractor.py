@@ -1,100 +1,170 @@
-import pdfplumber
 import pandas as pd
 import logging
-from typing import List, Dict, Optional
+import re
+from typing import Callable, Iterable, Iterator, Dict, Optional, TYPE_CHECKING
+
+from extraction_engine import REQUIRED_COLUMNS, ExtractionEngine, PdfTableBackend, PdfWordsBackend
+from schema import to_compact
+
+if TYPE_CHECKING:
+    from extraction_cache import ExtractionCache
+    from layout_profiles import LayoutProfile, ProfileStore
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def extract_table_from_pdf(pdf_file) -> pd.DataFrame:
+# Versão da lógica de extração; deve ser incrementada quando o resultado mudar,
+# para invalidar as tabelas guardadas no cache de extração
+EXTRACTOR_VERSION = '2'
+
+def iter_table_batches(pdf_file) -> Iterator[pd.DataFrame]:
+    """
+    Extrai a lista de senioridade página por página, sem montar o documento inteiro.
+    
+    Cada lote já vem com as colunas padronizadas e limpas, como em
+    extract_table_from_pdf. Os caches de objetos de cada página do pdfplumber
+    são liberados logo após a extração, de modo que o consumo de memória não
+    cresce com o número de páginas. Duplicatas são removidas apenas dentro de
+    cada lote.
+    
+    Args:
+        pdf_file: Arquivo PDF (pode ser um arquivo ou BytesIO)
+        
+    Yields:
+        Um DataFrame por página com tabela
+    """
+    return ExtractionEngine(PdfTableBackend()).iter_batches(pdf_file)
+
+def extract_table_from_pages(pdf_file, pages: Optional[Iterable[int]] = None,
+                             text_filter: Optional[Callable[[str], bool]] = None,
+                             stop_when: Optional[Callable[[pd.DataFrame], bool]] = None,
+                             table_settings: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Extrai a tabela apenas das páginas de interesse.
+    
+    O cabeçalho vem sempre da primeira página. Nas demais, o texto bruto é
+    verificado antes (text_filter) e a detecção de tabela só roda nas
+    páginas aprovadas. A leitura para assim que stop_when aprovar o que já
+    foi extraído; ele recebe só o lote novo de cada página, e quem precisa
+    do acumulado guarda o que interessa (ver find_re_rows).
+    
+    Args:
+        pdf_file: Arquivo PDF (pode ser um arquivo ou BytesIO)
+        pages: Números das páginas (a partir de 1) a considerar (padrão: todas)
+        text_filter: Recebe o texto bruto da página, lido dos content streams
+            (ver extraction_engine.content_text), e decide se ela deve ser extraída
+        stop_when: Recebe o DataFrame de cada página extraída e decide se a
+            leitura pode parar
+        table_settings: Configurações de tabela do pdfplumber
+        
+    Returns:
+        DataFrame com as colunas padronizadas, apenas das páginas extraídas
+    """
+    backend = PdfTableBackend(table_settings, pages=pages, text_filter=text_filter)
+    batches = []
+    columns = REQUIRED_COLUMNS
+    for batch in ExtractionEngine(backend).iter_batches(pdf_file):
+        columns = batch.columns
+        batches.append(batch)
+        if stop_when is not None and stop_when(batch):
+            break
+    
+    if not batches:
+        return pd.DataFrame(columns=columns)
+    
+    return pd.concat(batches, ignore_index=True).drop_duplicates()
+
+def find_re_rows(pdf_file, re_values: Iterable[str], table_settings: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Busca as linhas de REs específicos sem extrair o PDF inteiro.
+    
+    Só passam pela extração de tabela as páginas cujo texto contém algum dos
+    REs procurados, e a leitura termina quando todos forem encontrados.
+    
+    Args:
+        pdf_file: Arquivo PDF (pode ser um arquivo ou BytesIO)
+        re_values: REs procurados
+        table_settings: Configurações de tabela do pdfplumber
+        
+    Returns:
+        DataFrame com as linhas encontradas (vazio se nenhum RE for encontrado)
+    """
+    wanted = {str(value).strip() for value in re_values}
+    # REs ainda não encontrados, atualizados a cada página extraída
+    missing = set(wanted)
+    
+    def has_wanted(text: str) -> bool:
+        # Só os REs que faltam, como palavras inteiras ('123' não casa com '91234')
+        pattern = r'(?<!\w)(?:' + '|'.join(re.escape(value) for value in missing) + r')(?!\w)'
+        return bool(missing) and re.search(pattern, text) is not None
+    
+    def found_all(batch: pd.DataFrame) -> bool:
+        if 'RE' in batch.columns:
+            missing.difference_update(batch['RE'])
+        return not missing
+    
+    df = extract_table_from_pages(pdf_file, text_filter=has_wanted, stop_when=found_all,
+                                  table_settings=table_settings)
+    if 'RE' not in df.columns:
+        raise ValueError("Não foi possível identificar a coluna RE no PDF")
+    
+    return df[df['RE'].isin(wanted)].reset_index(drop=True)
+
+def _extract(pdf_file, profile: Optional['LayoutProfile'], profiles: Optional['ProfileStore'],
+             parallel: bool, max_workers: Optional[int], fast: bool, compact: bool) -> pd.DataFrame:
+    """Extração de extract_table_from_pdf, com o perfil já detectado."""
+    table_settings = profile.table_settings if profile else None
+    
+    if fast:
+        layout = profile.column_layout() if profile else None
+        backend = PdfWordsBackend(table_settings, layout)
+    else:
+        backend = PdfTableBackend(table_settings, parallel=parallel, max_workers=max_workers)
+    
+    combined_df = ExtractionEngine(backend).extract(pdf_file, profile, compact=compact)
+    
+    # Guardar o layout de um tipo de documento novo para as próximas execuções
+    if profiles is not None and profile is None:
+        profiles.learn(pdf_file, table_settings, first_page=backend.first_page)
+    
+    return combined_df
+
+def extract_table_from_pdf(pdf_file, parallel: bool = False, max_workers: Optional[int] = None,
+                           cache: Optional['ExtractionCache'] = None, fast: bool = False,
+                           profiles: Optional['ProfileStore'] = None, compact: bool = False) -> pd.DataFrame:
     """
     Extrai tabelas de todas as páginas de um arquivo PDF, focando nas colunas específicas de listas de senioridade.
     
     Args:
         pdf_file: Arquivo PDF (pode ser um arquivo ou BytesIO)
+        parallel: Se True, distribui intervalos de páginas entre um pool de processos
+        max_workers: Número máximo de processos no modo paralelo (padrão: número de CPUs)
+        cache: Cache de extração opcional; se o mesmo arquivo já foi extraído, a tabela é lida do disco
+        fast: Se True, lê as páginas após a primeira pelas posições das colunas (ver coordinate_extractor)
+        profiles: Perfis de layout opcionais; o perfil detectado fornece a linha do cabeçalho,
+            as fronteiras e o mapeamento das colunas, e um PDF sem perfil gera um novo
+        compact: Se True, retorna a lista no esquema compacto (ver schema.to_compact)
         
     Returns:
         DataFrame pandas com os dados extraídos
     """
     try:
-        all_tables = []
-        with pdfplumber.open(pdf_file) as pdf:
-            logger.info(f"Total de páginas no PDF: {len(pdf.pages)}")
-            
-            # Processar cada página
-            for page_num, page in enumerate(pdf.pages, 1):
-                logger.info(f"Processando página {page_num}")
-                
-                # Extrair a tabela da página
-                table = page.extract_table()
-                
-                if table:
-                    # Se for a primeira página, usar os cabeçalhos
-                    if page_num == 1:
-                        df = pd.DataFrame(table[1:], columns=table[0])
-                    else:
-                        # Para outras páginas, usar os mesmos cabeçalhos da primeira página
-                        df = pd.DataFrame(table[1:], columns=all_tables[0].columns)
-                    
-                    # Log das colunas encontradas
-                    logger.info(f"Colunas encontradas na página {page_num}: {df.columns.tolist()}")
-                    
-                    # Limpar os dados
-                    df = df.replace('', pd.NA).dropna(how='all')
-                    logger.info(f"Número de linhas na página {page_num} após limpeza: {len(df)}")
-                    
-                    all_tables.append(df)
-                else:
-                    logger.warning(f"Nenhuma tabela encontrada na página {page_num}")
-            
-            if not all_tables:
-                raise ValueError("Nenhuma tabela encontrada no PDF")
-            
-            # Combinar todas as tabelas
-            combined_df = pd.concat(all_tables, ignore_index=True)
-            logger.info(f"Total de linhas após combinar todas as páginas: {len(combined_df)}")
-            
-            # Identificar e renomear colunas
-            column_mapping = {}
-            for col in combined_df.columns:
-                col_upper = str(col).upper()
-                if 'FUNÇÃO' in col_upper or 'FUNCAO' in col_upper:
-                    column_mapping[col] = 'FUNÇÃO'
-                elif 'EQUIPAMENTO' in col_upper:
-                    column_mapping[col] = 'EQUIPAMENTO'
-                elif 'NOME' in col_upper and 'GUERRA' not in col_upper:
-                    column_mapping[col] = 'NOME'
-                elif 'GUERRA' in col_upper:
-                    column_mapping[col] = 'NOME DE GUERRA'
-                elif 'RE' in col_upper:
-                    column_mapping[col] = 'RE'
-                elif 'SENIORIDADE' in col_upper:
-                    column_mapping[col] = 'SENIORIDADE'
-            
-            # Renomear colunas
-            combined_df = combined_df.rename(columns=column_mapping)
-            
-            # Manter apenas as colunas necessárias
-            required_columns = ['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'RE', 'SENIORIDADE']
-            available_columns = [col for col in required_columns if col in combined_df.columns]
-            
-            if not available_columns:
-                raise ValueError("Não foi possível identificar as colunas necessárias no PDF")
-            
-            combined_df = combined_df[available_columns]
-            
-            # Limpar dados
-            for col in combined_df.columns:
-                combined_df[col] = combined_df[col].astype(str).str.strip()
-            
-            # Remover linhas duplicadas
-            combined_df = combined_df.drop_duplicates()
-            
-            logger.info(f"Colunas finais: {combined_df.columns.tolist()}")
-            logger.info(f"Número final de registros: {len(combined_df)}")
-            
-            return combined_df
-            
+        profile = profiles.detect(pdf_file) if profiles is not None else None
+        
+        if cache is not None:
+            # O modo de leitura e o perfil detectado mudam o resultado, então
+            # entram na chave do cache junto com o esquema
+            settings = {'compact': compact, 'fast': fast, 'profile': profile.to_dict() if profile else None}
+            df = cache.get_or_extract(
+                pdf_file, 'pdf_extractor.extract_table_from_pdf', EXTRACTOR_VERSION,
+                lambda: _extract(pdf_file, profile, profiles, parallel, max_workers, fast, compact),
+                settings=settings
+            )
+            # O cache guarda só os valores; os tipos do esquema (Int32, nomes internados) são refeitos
+            return to_compact(df) if compact else df
+        
+        return _extract(pdf_file, profile, profiles, parallel, max_workers, fast, compact)
+        
     except Exception as e:
         logger.error(f"Erro ao extrair dados do PDF: {str(e)}")
         raise 
\ No newline at end of file
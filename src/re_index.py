@@ -0,0 +1,117 @@
+import logging
+import re as regex
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from comparator import _column_values, _first_positions, _row, _values_differ
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _re_keys(values) -> np.ndarray:
+    """REs como texto sem espaços, a forma usada nas buscas."""
+    return np.array([str(value).strip() for value in values], dtype=object)
+
+def parse_re_list(text: str) -> List[str]:
+    """Separa uma lista de REs digitada (vírgulas, ponto e vírgula, espaços ou quebras de linha)."""
+    return [re for re in regex.split(r'[\s,;]+', str(text)) if re]
+
+class REIndex:
+    """
+    Índice das duas listas de uma comparação pelo RE.
+
+    O índice é montado uma única vez (hash do RE para a posição da primeira
+    linha em cada lista); cada consulta é então uma busca O(1), sem filtrar
+    as listas inteiras. Vários REs são buscados de uma vez em lookup_many.
+    """
+
+    def __init__(self, old_df: pd.DataFrame, new_df: pd.DataFrame):
+        if 'RE' not in old_df.columns or 'RE' not in new_df.columns:
+            raise ValueError("A coluna 'RE' não foi encontrada em uma ou ambas as listas")
+
+        self.old_columns = _column_values(old_df)
+        self.new_columns = _column_values(new_df)
+        self.fields = [column for column in old_df.columns if column in new_df.columns]
+
+        old_re = _re_keys(self.old_columns['RE'])
+        new_re = _re_keys(self.new_columns['RE'])
+        old_first = _first_positions(old_re)
+        new_first = _first_positions(new_re)
+        self._old_index = pd.Index(old_re[old_first])
+        self._new_index = pd.Index(new_re[new_first])
+        self._old_first = old_first
+        self._new_first = new_first
+
+    def _result(self, old_position: int, new_position: int) -> Dict:
+        """Resultado de um RE no formato de app.analyze_re_changes."""
+        if old_position < 0 and new_position < 0:
+            return {
+                'status': 'not_found',
+                'message': 'RE não encontrado em nenhuma das listas'
+            }
+
+        if old_position < 0:
+            return {
+                'status': 'new_entry',
+                'message': 'RE encontrado apenas na lista nova',
+                'data': _row(self.new_columns, new_position)
+            }
+
+        old_row = _row(self.old_columns, old_position)
+        if new_position < 0:
+            return {
+                'status': 'exit',
+                'message': 'RE encontrado apenas na lista antiga',
+                'data': old_row
+            }
+
+        new_row = _row(self.new_columns, new_position)
+        changes = [
+            {'campo': column, 'valor_antigo': old_row[column], 'valor_novo': new_row[column]}
+            for column in self.fields
+            if _values_differ(old_row[column], new_row[column])
+        ]
+        return {
+            'status': 'changed',
+            'message': 'RE encontrado em ambas as listas com mudanças',
+            'data': {
+                'antigo': old_row,
+                'novo': new_row,
+                'mudancas': changes
+            }
+        }
+
+    @staticmethod
+    def _positions(index: pd.Index, first: np.ndarray, queries: pd.Index) -> np.ndarray:
+        """Posição da primeira linha de cada RE consultado, ou -1 se ele não estiver na lista."""
+        found = index.get_indexer(queries)
+        hit = found >= 0
+        positions = np.full(len(queries), -1, dtype=np.int64)
+        positions[hit] = first[found[hit]]
+        return positions
+
+    def lookup_many(self, res: Iterable) -> Dict[str, Dict]:
+        """
+        Busca vários REs de uma vez.
+
+        Args:
+            res: REs procurados (texto ou número)
+
+        Returns:
+            Dicionário {RE: resultado}, na ordem dos REs pedidos, com a linha
+            antiga, a nova e as mudanças campo a campo (ver app.analyze_re_changes)
+        """
+        keys = list(dict.fromkeys(_re_keys(res)))
+        queries = pd.Index(keys, dtype=object)
+        old_positions = self._positions(self._old_index, self._old_first, queries)
+        new_positions = self._positions(self._new_index, self._new_first, queries)
+        return {
+            key: self._result(old_position, new_position)
+            for key, old_position, new_position in zip(keys, old_positions.tolist(), new_positions.tolist())
+        }
+
+    def lookup(self, re) -> Dict:
+        """Busca um único RE (ver lookup_many)."""
+        return next(iter(self.lookup_many([re]).values()))
@@ -0,0 +1,152 @@
+import logging
+import re as regex
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from normalizer import strip_accents
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Semelhança mínima (0 a 1) para uma saída e uma entrada serem o mesmo piloto
+DEFAULT_THRESHOLD = 0.9
+
+# Peso do NOME na semelhança; o restante vem do NOME DE GUERRA
+NAME_WEIGHT = 0.75
+
+# Blocos com mais pares que isso (palavras muito comuns, como SILVA) são
+# ignorados; os pilotos continuam comparáveis pelas demais chaves
+MAX_BLOCK_PAIRS = 1000
+
+# Palavras que não identificam ninguém e não formam blocos
+STOPWORDS = {'DA', 'DE', 'DO', 'DAS', 'DOS', 'E'}
+
+def name_key(value) -> str:
+    """Nome normalizado para comparação: sem acentos, maiúsculo, só letras, dígitos e espaços simples."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    text = strip_accents(str(value)).upper()
+    return ' '.join(regex.sub(r'[^A-Z0-9]+', ' ', text).split())
+
+def blocking_keys(name: str, war_name: str) -> Set[str]:
+    """
+    Chaves de bloco de um piloto: cada palavra do NOME e do NOME DE GUERRA,
+    cada par de palavras vizinhas e o par primeiro + último nome. Os pares
+    mantêm pequenos os blocos de sobrenomes comuns e, em nomes de três ou
+    mais palavras, ao menos um deles sobrevive a um erro de digitação.
+    """
+    words = [word for word in name.split() if word not in STOPWORDS and len(word) > 1]
+    keys = set(words)
+    keys.update(word for word in war_name.split() if word not in STOPWORDS and len(word) > 1)
+    keys.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    if len(words) >= 2:
+        keys.add(f"{words[0]} {words[-1]}")
+    return keys
+
+def similarity(old_name: str, old_war: str, new_name: str, new_war: str) -> float:
+    """Semelhança entre dois pilotos pelo NOME e, se houver, pelo NOME DE GUERRA."""
+    score = SequenceMatcher(None, old_name, new_name).ratio()
+    if old_war and new_war:
+        score = NAME_WEIGHT * score + (1 - NAME_WEIGHT) * SequenceMatcher(None, old_war, new_war).ratio()
+    return score
+
+# Caracteres que name_key mantém
+ALPHABET = np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ', dtype=np.uint8)
+
+def _char_counts(texts: List[str]) -> np.ndarray:
+    """Contagem de cada caractere de ALPHABET em cada texto (já normalizado por name_key)."""
+    counts = np.zeros((len(texts), 128), dtype=np.int32)
+    for position, text in enumerate(texts):
+        if text:
+            counts[position] = np.bincount(np.frombuffer(text.encode('ascii'), dtype=np.uint8), minlength=128)
+    return counts[:, ALPHABET]
+
+def _quick_bound(first: np.ndarray, first_positions: np.ndarray,
+                 second: np.ndarray, second_positions: np.ndarray) -> np.ndarray:
+    """
+    Limite superior de SequenceMatcher.ratio para cada par (first_positions[k],
+    second_positions[k]), pelas contagens de caracteres: o mesmo de
+    SequenceMatcher.quick_ratio, vetorizado e sem montar uma matriz por par.
+    """
+    matches = np.zeros(len(first_positions), dtype=np.int64)
+    for column in range(first.shape[1]):
+        matches += np.minimum(first[first_positions, column], second[second_positions, column])
+    total = first.sum(axis=1)[first_positions] + second.sum(axis=1)[second_positions]
+    return np.where(total > 0, 2 * matches / np.maximum(total, 1), 1.0)
+
+def match_exits_entries(exit_names: np.ndarray, exit_war_names: np.ndarray,
+                        entry_names: np.ndarray, entry_war_names: np.ndarray,
+                        threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[int, int, float]]:
+    """
+    Pareia saídas e entradas que provavelmente são o mesmo piloto (RE alterado ou digitado errado).
+
+    Só são pontuados os pares que compartilham alguma chave de bloco
+    (blocking_keys), em vez de todas as combinações. Cada saída e cada
+    entrada entra em no máximo um par, escolhido pela maior semelhança.
+
+    Args:
+        exit_names, exit_war_names: NOME e NOME DE GUERRA das saídas
+        entry_names, entry_war_names: NOME e NOME DE GUERRA das entradas
+        threshold: Semelhança mínima
+
+    Returns:
+        Lista de (posição da saída, posição da entrada, semelhança), em
+        ordem decrescente de semelhança
+    """
+    exits = [(name_key(name), name_key(war)) for name, war in zip(exit_names, exit_war_names)]
+    entries = [(name_key(name), name_key(war)) for name, war in zip(entry_names, entry_war_names)]
+
+    blocks: Dict[str, Tuple[List[int], List[int]]] = defaultdict(lambda: ([], []))
+    for position, (name, war) in enumerate(exits):
+        for key in blocking_keys(name, war):
+            blocks[key][0].append(position)
+    for position, (name, war) in enumerate(entries):
+        for key in blocking_keys(name, war):
+            blocks[key][1].append(position)
+
+    candidates = set()
+    for exit_positions, entry_positions in blocks.values():
+        if exit_positions and entry_positions and len(exit_positions) * len(entry_positions) <= MAX_BLOCK_PAIRS:
+            candidates.update((i, j) for i in exit_positions for j in entry_positions)
+
+    if not candidates:
+        logger.info("Reconciliação: nenhum par candidato")
+        return []
+
+    # Descarta de uma vez os pares cujo limite superior não alcança o limite;
+    # só os restantes passam pelo cálculo completo de similarity()
+    pairs = np.array(sorted(candidates), dtype=np.int64)
+    exit_positions, entry_positions = pairs[:, 0], pairs[:, 1]
+    exit_name_counts = _char_counts([name for name, _ in exits])
+    entry_name_counts = _char_counts([name for name, _ in entries])
+    exit_war_counts = _char_counts([war for _, war in exits])
+    entry_war_counts = _char_counts([war for _, war in entries])
+    weighted = (exit_war_counts.sum(axis=1)[exit_positions] > 0) & (entry_war_counts.sum(axis=1)[entry_positions] > 0)
+    name_bound = _quick_bound(exit_name_counts, exit_positions, entry_name_counts, entry_positions)
+    war_bound = _quick_bound(exit_war_counts, exit_positions, entry_war_counts, entry_positions)
+    bound = np.where(weighted, NAME_WEIGHT * name_bound + (1 - NAME_WEIGHT) * war_bound, name_bound)
+    survivors = pairs[bound >= threshold - 1e-9]
+
+    scored = []
+    for i, j in survivors.tolist():
+        score = similarity(exits[i][0], exits[i][1], entries[j][0], entries[j][1])
+        if score >= threshold:
+            scored.append((score, i, j))
+
+    # Atribuição gulosa: maiores semelhanças primeiro, cada lado usado uma vez
+    matches = []
+    used_exits = set()
+    used_entries = set()
+    for score, i, j in sorted(scored, key=lambda item: (-item[0], item[1], item[2])):
+        if i in used_exits or j in used_entries:
+            continue
+        used_exits.add(i)
+        used_entries.add(j)
+        matches.append((i, j, score))
+
+    logger.info(f"Reconciliação: {len(candidates)} pares candidatos, {len(matches)} saídas/entradas pareadas")
+    return matches
@@ -2,7 +2,9 @@ import pandas as pd
 from datetime import datetime
 import os
 import logging
-from typing import Dict
+from typing import Dict, Optional
+
+from change_set import ChangeSet
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,12 +21,15 @@ class ReportGenerator:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return os.path.join(self.output_dir, f"{prefix}_{timestamp}")
     
-    def generate_excel_report(self, changes_df: pd.DataFrame) -> str:
+    def generate_excel_report(self, changes_df: pd.DataFrame,
+                              transitions: Optional[Dict[str, pd.DataFrame]] = None) -> str:
         """
         Gera relatório em Excel com as mudanças detectadas.
         
         Args:
             changes_df: DataFrame com as mudanças detectadas
+            transitions: Matrizes de transição (transitions.transition_matrices),
+                uma aba por matriz
             
         Returns:
             Caminho do arquivo gerado
@@ -39,12 +44,18 @@ class ReportGenerator:
             # Escrever relatório principal
             changes_df.to_excel(writer, sheet_name='Mudanças', index=False)
             
-            # Criar sumário
+            # Criar sumário (em colunas categóricas, sem os tipos que não ocorreram)
+            counts = changes_df['Mudança'].value_counts()
+            counts = counts[counts > 0]
             summary = pd.DataFrame({
-                'Tipo de Mudança': changes_df['Mudança'].value_counts().index,
-                'Quantidade': changes_df['Mudança'].value_counts().values
+                'Tipo de Mudança': counts.index.astype(str),
+                'Quantidade': counts.values
             })
             summary.to_excel(writer, sheet_name='Sumário', index=False)
+            
+            # Uma aba por matriz de transição (de nas linhas, para nas colunas)
+            for name, matrix in (transitions or {}).items():
+                matrix.to_excel(writer, sheet_name=f'Transição {name}'[:31])
         
         logger.info(f"Relatório Excel gerado: {filename}")
         return filename
@@ -70,17 +81,19 @@ class ReportGenerator:
         logger.info(f"Relatório CSV gerado: {filename}")
         return filename
     
-    def generate_reports(self, changes_df: pd.DataFrame) -> dict:
+    def generate_reports(self, changes_df: pd.DataFrame,
+                         transitions: Optional[Dict[str, pd.DataFrame]] = None) -> dict:
         """
         Gera relatórios em múltiplos formatos.
         
         Args:
             changes_df: DataFrame com as mudanças detectadas
+            transitions: Matrizes de transição, incluídas no relatório Excel
             
         Returns:
             Dicionário com os caminhos dos arquivos gerados
         """
-        excel_file = self.generate_excel_report(changes_df)
+        excel_file = self.generate_excel_report(changes_df, transitions)
         csv_file = self.generate_csv_report(changes_df)
         
         return {
@@ -88,19 +101,40 @@ class ReportGenerator:
             'csv': csv_file
         }
 
-def generate_report(comparison_results: Dict) -> str:
+def generate_report(comparison_results: Dict, max_rows: Optional[int] = None) -> str:
     """
     Gera um relatório HTML com os resultados da comparação.
     
     Args:
         comparison_results: Dicionário com os resultados da comparação
+            (com 'transitions', inclui as matrizes de transição)
+        max_rows: Número máximo de diferenças detalhadas; as demais entram
+            só nas contagens por tipo
         
     Returns:
         String contendo o relatório em HTML
     """
     try:
-        # Criar DataFrame com as diferenças
-        differences_df = pd.DataFrame(comparison_results['differences'])
+        # Criar DataFrame com as diferenças; de um ChangeSet, só as linhas
+        # exibidas são formatadas
+        differences = comparison_results['differences']
+        shown = differences[:max_rows] if max_rows is not None else differences
+        if isinstance(differences, ChangeSet):
+            differences_df = shown.to_frame()
+            type_counts = differences.counts()
+        else:
+            differences_df = pd.DataFrame(shown)
+            type_counts = pd.DataFrame(differences).get('Tipo', pd.Series(dtype=object)).value_counts()
+        counts = ''.join(f"<p>{label}: {count}</p>" for label, count in type_counts.items())
+        omitted = len(differences) - len(shown)
+        omitted_note = f"<p>{omitted} diferenças omitidas.</p>" if omitted else ''
+        
+        # Matrizes de transição, quando a comparação as incluiu
+        transitions = ''.join(
+            f"<h3>{name}</h3>{matrix.to_html()}"
+            for name, matrix in comparison_results.get('transitions', {}).items()
+        )
+        transitions_section = f"<h2>Transições</h2>{transitions}" if transitions else ''
         
         # Gerar HTML
         html = f"""
@@ -127,10 +161,19 @@ def generate_report(comparison_results: Dict) -> str:
                 <p>Total na Lista Base: {comparison_results['total_base']}</p>
                 <p>Total na Lista de Comparação: {comparison_results['total_compare']}</p>
                 <p>Total de Diferenças Encontradas: {comparison_results['total_differences']}</p>
+                <p>Entradas: {comparison_results.get('entered', 0)}</p>
+                <p>Saídas: {comparison_results.get('left', 0)}</p>
+                <p>Possíveis Mudanças de RE (fora das entradas e saídas): {comparison_results.get('reconciled', 0)}</p>
             </div>
             
+            <h2>Diferenças por Tipo</h2>
+            {counts}
+            
             <h2>Diferenças Detalhadas</h2>
             {differences_df.to_html(index=False) if not differences_df.empty else '<p>Nenhuma diferença encontrada.</p>'}
+            {omitted_note}
+            
+            {transitions_section}
         </body>
         </html>
         """
@@ -0,0 +1,123 @@
+import logging
+import sys
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Esquema compacto das listas de senioridade em memória:
+#   - RE: int32 (obrigatório em todas as linhas);
+#   - SENIORIDADE: Int32 (inteiro que aceita ausentes);
+#   - FUNÇÃO e EQUIPAMENTO: categóricos (poucos valores distintos);
+#   - NOME e NOME DE GUERRA: texto com strings internadas, de modo que o
+#     mesmo nome em duas listas é um único objeto na memória.
+# As demais colunas são mantidas como estão.
+RE_DTYPE = 'int32'
+SENIORITY_DTYPE = 'Int32'
+INTEGER_COLUMNS = ['RE', 'SENIORIDADE']
+CATEGORY_COLUMNS = ['FUNÇÃO', 'EQUIPAMENTO']
+NAME_COLUMNS = ['NOME', 'NOME DE GUERRA']
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+def _to_int32(series: pd.Series) -> pd.Series:
+    """Converte para Int32; valores não inteiros, negativos ou fora do intervalo viram NA."""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        numbers = series.astype('float64')
+    else:
+        text = series.astype(str).str.strip().where(series.notna())
+        numbers = pd.to_numeric(text, errors='coerce').astype('float64')
+
+    values = numbers.to_numpy(na_value=np.nan)
+    valid = np.isfinite(values) & (values >= 0) & (values <= _INT32_MAX) & (np.floor(values) == values)
+    integers = np.where(valid, values, 0).astype(np.int32)
+    return pd.Series(pd.arrays.IntegerArray(integers, ~valid), index=series.index, name=series.name)
+
+def intern_strings(series: pd.Series) -> pd.Series:
+    """Substitui os textos da coluna pelas versões internadas (sys.intern)."""
+    values = [sys.intern(value) if type(value) is str else value for value in series.tolist()]
+    return pd.Series(values, index=series.index, name=series.name, dtype=object)
+
+def is_compact(df: pd.DataFrame) -> bool:
+    """Confere se o DataFrame já está no esquema compacto."""
+    return 'RE' in df.columns and str(df['RE'].dtype) == RE_DTYPE
+
+def to_compact(df: pd.DataFrame, errors: str = 'raise') -> pd.DataFrame:
+    """
+    Converte uma lista de senioridade para o esquema compacto.
+
+    A conversão é validada: todo RE deve ser um inteiro não negativo que
+    caiba em 32 bits, e toda SENIORIDADE preenchida também. Valores de
+    SENIORIDADE em branco viram ausentes.
+
+    Args:
+        df: DataFrame com as colunas padronizadas (texto ou já compacto)
+        errors: 'raise' interrompe com ValueError ao encontrar valores
+            inválidos; 'drop' descarta as linhas com RE inválido e deixa a
+            SENIORIDADE inválida como ausente, registrando um aviso
+
+    Returns:
+        Novo DataFrame no esquema compacto, com o mesmo índice
+    """
+    if errors not in ('raise', 'drop'):
+        raise ValueError(f"Valor inválido para errors: {errors}")
+    if 'RE' not in df.columns:
+        raise ValueError("A coluna 'RE' não foi encontrada na lista")
+
+    try:
+        compact = df.copy()
+
+        for column in INTEGER_COLUMNS:
+            if column not in compact.columns:
+                continue
+            original = compact[column]
+            converted = _to_int32(original)
+            invalid = converted.isna()
+            if column == 'SENIORIDADE' and invalid.any():
+                # SENIORIDADE em branco é aceita como ausente
+                invalid &= original.notna() & (original.astype(str).str.strip() != '')
+            if invalid.any():
+                examples = original[invalid].astype(str).head(5).tolist()
+                message = f"{int(invalid.sum())} valores inválidos na coluna {column}: {examples}"
+                if errors == 'raise':
+                    raise ValueError(message)
+                logger.warning(message)
+            compact[column] = converted
+
+        if compact['RE'].isna().any():
+            compact = compact[compact['RE'].notna()]
+        compact['RE'] = compact['RE'].astype(RE_DTYPE)
+        if 'SENIORIDADE' in compact.columns:
+            compact['SENIORIDADE'] = compact['SENIORIDADE'].astype(SENIORITY_DTYPE)
+
+        for column in CATEGORY_COLUMNS:
+            if column in compact.columns and not isinstance(compact[column].dtype, pd.CategoricalDtype):
+                compact[column] = compact[column].astype('category')
+
+        for column in NAME_COLUMNS:
+            if column in compact.columns:
+                compact[column] = intern_strings(compact[column])
+
+        return compact
+
+    except Exception as e:
+        logger.error(f"Erro ao converter a lista para o esquema compacto: {str(e)}")
+        raise
+
+def to_text(df: pd.DataFrame, columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Converte colunas do esquema compacto de volta para texto (ausentes como "").
+
+    Args:
+        df: DataFrame no esquema compacto
+        columns: Colunas a converter (padrão: todas as do esquema presentes)
+    """
+    text_df = df.copy()
+    columns = columns or [col for col in INTEGER_COLUMNS + CATEGORY_COLUMNS if col in df.columns]
+    for column in columns:
+        series = text_df[column]
+        text_df[column] = series.astype(object).where(series.notna(), '').astype(str)
+    return text_df
@@ -0,0 +1,256 @@
+import json
+import logging
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from extraction_cache import file_hash
+from table_io import read_columns, read_table, write_table
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser('~'), '.local', 'share', 'senioridade', 'snapshots')
+INDEX_FILE = 'index.json'
+LOCK_FILE = 'index.lock'
+TABLE_SUFFIX = '.npz'
+FINGERPRINT_SUFFIX = '.fp.npy'
+
+class SnapshotStore:
+    """
+    Arquivo local das listas de senioridade já extraídas (snapshots).
+
+    Cada lista é gravada no formato colunar de table_io, com os hashes das
+    linhas (comparator.row_fingerprints) ao lado, e registrada no índice
+    (index.json) com rótulo, origem, hash do conteúdo do arquivo, data de
+    gravação, número de linhas e colunas. Assim, comparar uma lista nova com
+    a última guardada exige extrair só a lista nova, e o mesmo arquivo nunca
+    é extraído duas vezes.
+
+    As listas são carregadas sob demanda e podem ser lidas só em parte das
+    colunas, sem descompactar as demais.
+    """
+
+    def __init__(self, store_dir: Optional[str] = None):
+        self.store_dir = store_dir or os.environ.get('SENIORIDADE_SNAPSHOT_DIR', DEFAULT_STORE_DIR)
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def _path(self, snapshot_id: str, suffix: str = TABLE_SUFFIX) -> str:
+        return os.path.join(self.store_dir, snapshot_id + suffix)
+
+    def _read_index(self) -> List[Dict]:
+        try:
+            with open(os.path.join(self.store_dir, INDEX_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _write_index(self, entries: List[Dict]) -> None:
+        path = os.path.join(self.store_dir, INDEX_FILE)
+        tmp_path = f"{path}.{os.getpid()}.{os.urandom(4).hex()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _index_lock(self):
+        """
+        Trava exclusiva do índice durante uma leitura-alteração-gravação, para
+        que gravações simultâneas (vários processos ou requisições) não
+        percam entradas umas das outras.
+        """
+        with open(os.path.join(self.store_dir, LOCK_FILE), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _entry(self, snapshot_id: str) -> Dict:
+        for entry in self._read_index():
+            if entry['id'] == snapshot_id:
+                return entry
+        raise KeyError(f"Snapshot não encontrado: {snapshot_id}")
+
+    def save(self, df: pd.DataFrame, label: Optional[str] = None, source: Optional[str] = None,
+             content_hash: Optional[str] = None) -> str:
+        """
+        Grava uma lista como novo snapshot.
+
+        Args:
+            df: Lista de senioridade (texto ou esquema compacto)
+            label: Rótulo do snapshot (padrão: data e hora da gravação)
+            source: Nome do arquivo de origem
+            content_hash: Hash do conteúdo do arquivo de origem (ver
+                extraction_cache.file_hash); se já houver um snapshot com o
+                mesmo hash, ele é mantido e o seu id é retornado
+
+        Returns:
+            Id do snapshot
+        """
+        if content_hash is not None:
+            existing = self.find(content_hash)
+            if existing is not None:
+                logger.info(f"Lista já guardada como snapshot {existing}")
+                return existing
+
+        try:
+            created_at = datetime.now()
+            suffix = (content_hash or os.urandom(8).hex())[:12]
+            snapshot_id = f"{created_at.strftime('%Y%m%d%H%M%S%f')}-{suffix}"
+
+            from comparator import row_fingerprints
+            write_table(df, self._path(snapshot_id))
+            # Hashes calculados sobre a tabela como será carregada (tipos de table_io)
+            with open(self._path(snapshot_id, FINGERPRINT_SUFFIX), 'wb') as f:
+                np.save(f, row_fingerprints(read_table(self._path(snapshot_id))))
+
+            with self._index_lock():
+                # Outra gravação do mesmo arquivo pode ter terminado antes desta
+                if content_hash is not None:
+                    existing = self.find(content_hash)
+                    if existing is not None:
+                        self._remove_files(snapshot_id)
+                        logger.info(f"Lista já guardada como snapshot {existing}")
+                        return existing
+                entries = self._read_index()
+                entries.append({
+                    'id': snapshot_id,
+                    'label': label or created_at.strftime('%Y-%m-%d %H:%M'),
+                    'source': source,
+                    'content_hash': content_hash,
+                    'created_at': created_at.isoformat(timespec='seconds'),
+                    'rows': len(df),
+                    'columns': [str(column) for column in df.columns],
+                })
+                self._write_index(entries)
+            logger.info(f"Snapshot {snapshot_id} gravado ({len(df)} linhas)")
+            return snapshot_id
+
+        except Exception as e:
+            logger.error(f"Erro ao gravar o snapshot: {str(e)}")
+            raise
+
+    def get_or_extract(self, file: Union[BytesIO, str], extract: Callable[[], pd.DataFrame],
+                       label: Optional[str] = None, source: Optional[str] = None) -> str:
+        """
+        Retorna o snapshot do arquivo, extraindo e gravando a lista só se ele ainda não foi guardado.
+
+        Args:
+            file: Arquivo de origem (caminho ou BytesIO), usado para o hash do conteúdo
+            extract: Função sem argumentos que extrai a lista do arquivo
+            label: Rótulo do snapshot, se for criado
+            source: Nome do arquivo de origem (padrão: o caminho, quando houver)
+
+        Returns:
+            Id do snapshot
+        """
+        content_hash = file_hash(file)
+        existing = self.find(content_hash)
+        if existing is not None:
+            logger.info(f"Lista carregada do snapshot {existing}, sem nova extração")
+            return existing
+        if source is None and isinstance(file, (str, os.PathLike)):
+            source = os.path.basename(file)
+        return self.save(extract(), label=label, source=source, content_hash=content_hash)
+
+    def find(self, content_hash: str) -> Optional[str]:
+        """Id do snapshot gravado a partir do arquivo com esse hash, ou None."""
+        for entry in self._read_index():
+            if entry.get('content_hash') == content_hash:
+                return entry['id']
+        return None
+
+    def list_snapshots(self) -> pd.DataFrame:
+        """Metadados dos snapshots, do mais antigo ao mais recente."""
+        entries = self._read_index()
+        columns = ['id', 'label', 'source', 'content_hash', 'created_at', 'rows', 'columns']
+        return pd.DataFrame(entries, columns=columns)
+
+    def latest(self, exclude: Optional[str] = None) -> Optional[Dict]:
+        """Metadados do snapshot mais recente (opcionalmente ignorando um id), ou None."""
+        entries = [entry for entry in self._read_index() if entry['id'] != exclude]
+        return entries[-1] if entries else None
+
+    def metadata(self, snapshot_id: str) -> Dict:
+        """Metadados de um snapshot."""
+        return dict(self._entry(snapshot_id))
+
+    def columns(self, snapshot_id: str) -> List[str]:
+        """Colunas gravadas no snapshot, sem carregar os dados."""
+        return read_columns(self._path(snapshot_id))
+
+    def load(self, snapshot_id: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Carrega um snapshot.
+
+        Args:
+            snapshot_id: Id do snapshot
+            columns: Colunas a carregar (padrão: todas); as demais não são lidas do disco
+
+        Returns:
+            DataFrame com as colunas pedidas
+        """
+        self._entry(snapshot_id)
+        return read_table(self._path(snapshot_id), columns)
+
+    def fingerprints(self, snapshot_id: str) -> Optional[np.ndarray]:
+        """Hashes das linhas do snapshot, para ListComparator.compare_lists e compare_tables."""
+        try:
+            return np.load(self._path(snapshot_id, FINGERPRINT_SUFFIX))
+        except FileNotFoundError:
+            return None
+
+    def delete(self, snapshot_id: str) -> None:
+        """Remove um snapshot e a sua entrada no índice."""
+        with self._index_lock():
+            entries = self._read_index()
+            remaining = [entry for entry in entries if entry['id'] != snapshot_id]
+            if len(remaining) == len(entries):
+                raise KeyError(f"Snapshot não encontrado: {snapshot_id}")
+            self._write_index(remaining)
+        self._remove_files(snapshot_id)
+        logger.info(f"Snapshot {snapshot_id} removido")
+
+    def _remove_files(self, snapshot_id: str) -> None:
+        for suffix in (TABLE_SUFFIX, FINGERPRINT_SUFFIX):
+            try:
+                os.remove(self._path(snapshot_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    def prune(self, keep: Optional[int] = None, older_than: Optional[datetime] = None) -> int:
+        """
+        Remove snapshots antigos.
+
+        Args:
+            keep: Mantém só os keep snapshots mais recentes
+            older_than: Remove os gravados antes desta data
+
+        Returns:
+            Número de snapshots removidos
+        """
+        entries = self._read_index()
+        removed = []
+        for position, entry in enumerate(entries):
+            too_many = keep is not None and position < len(entries) - keep
+            too_old = older_than is not None and datetime.fromisoformat(entry['created_at']) < older_than
+            if too_many or too_old:
+                removed.append(entry['id'])
+
+        for snapshot_id in removed:
+            self.delete(snapshot_id)
+        logger.info(f"{len(removed)} snapshots removidos")
+        return len(removed)
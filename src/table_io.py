@@ -0,0 +1,113 @@
+import json
+import logging
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Formato colunar compacto (arquivo .npz do NumPy, sem pickle):
+#   - colunas numéricas são gravadas como o próprio array;
+#   - colunas de texto e categóricas são codificadas por dicionário
+#     (valores distintos + códigos inteiros, -1 para ausentes).
+# Como o .npz é lido sob demanda, carregar só algumas colunas não
+# descompacta as demais.
+
+META_KEY = '__meta__'
+
+def _codes_dtype(size: int):
+    """Menor tipo inteiro com sinal capaz de guardar os códigos do dicionário."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+def write_table(df: pd.DataFrame, path: str, compressed: bool = True) -> None:
+    """
+    Grava um DataFrame no formato colunar compacto.
+
+    Args:
+        df: DataFrame a ser gravado (o índice não é preservado)
+        path: Caminho do arquivo .npz
+        compressed: Compacta o arquivo (zlib); arquivos temporários podem
+            dispensar a compactação, que domina o tempo de gravação
+    """
+    arrays = {}
+    columns = []
+    for position, column in enumerate(df.columns):
+        series = df[column]
+        key = f'c{position}'
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories.astype(str).to_numpy(dtype=str)
+            arrays[f'{key}_values'] = categories
+            arrays[f'{key}_codes'] = series.cat.codes.to_numpy().astype(_codes_dtype(len(categories)))
+            kind = 'category'
+        elif pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            if series.hasnans and pd.api.types.is_extension_array_dtype(series.dtype):
+                series = series.astype('float64')
+            arrays[key] = series.to_numpy()
+            kind = 'numeric'
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            values = np.asarray([str(value) for value in uniques], dtype=str)
+            arrays[f'{key}_values'] = values
+            arrays[f'{key}_codes'] = codes.astype(_codes_dtype(len(values)))
+            kind = 'text'
+        columns.append({'name': str(column), 'key': key, 'kind': kind})
+
+    meta = {'columns': columns, 'rows': len(df)}
+    arrays[META_KEY] = np.array(json.dumps(meta, ensure_ascii=False))
+
+    with open(path, 'wb') as f:
+        if compressed:
+            np.savez_compressed(f, **arrays)
+        else:
+            np.savez(f, **arrays)
+
+def read_columns(path: str) -> List[str]:
+    """Retorna os nomes das colunas gravadas, sem carregar os dados."""
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data[META_KEY]))
+    return [column['name'] for column in meta['columns']]
+
+def read_table(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Lê um DataFrame gravado com write_table.
+
+    Args:
+        path: Caminho do arquivo .npz
+        columns: Colunas a carregar (padrão: todas)
+
+    Returns:
+        DataFrame com as colunas pedidas, na ordem gravada
+    """
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data[META_KEY]))
+        selected = meta['columns']
+        if columns is not None:
+            missing = [col for col in columns if col not in {c['name'] for c in selected}]
+            if missing:
+                raise KeyError(f"Colunas ausentes no arquivo {path}: {missing}")
+            selected = [c for c in selected if c['name'] in columns]
+
+        result = {}
+        for column in selected:
+            key = column['key']
+            if column['kind'] == 'numeric':
+                result[column['name']] = data[key]
+            elif column['kind'] == 'category':
+                result[column['name']] = pd.Categorical.from_codes(
+                    data[f'{key}_codes'].astype(np.int64), categories=data[f'{key}_values']
+                )
+            else:
+                values = data[f'{key}_values'].astype(object)
+                codes = data[f'{key}_codes']
+                column_values = np.empty(len(codes), dtype=object)
+                valid = codes >= 0
+                column_values[valid] = values[codes[valid]]
+                column_values[~valid] = pd.NA
+                result[column['name']] = column_values
+
+    return pd.DataFrame(result, index=pd.RangeIndex(meta['rows']))
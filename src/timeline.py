@@ -0,0 +1,226 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from comparator import COMPARED_COLUMNS, _column_values, diff_fields, join_by_re
+from movement import list_positions
+from schema import CATEGORY_COLUMNS, SENIORITY_DTYPE, is_compact, to_compact
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Colunas da tabela de mudanças entre snapshots consecutivos
+EVENT_COLUMNS = ['RE', 'SNAPSHOT', 'TIPO', 'CAMPO', 'VALOR ANTIGO', 'VALOR NOVO']
+
+def _events(re: np.ndarray, snapshot: int, kind: str, field: Optional[str] = None,
+            old_values: Optional[np.ndarray] = None, new_values: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Bloco da tabela de mudanças com o mesmo tipo e campo."""
+    empty = np.full(len(re), None, dtype=object)
+    return pd.DataFrame({
+        'RE': re,
+        'SNAPSHOT': np.full(len(re), snapshot, dtype=np.int32),
+        'TIPO': kind,
+        'CAMPO': field,
+        'VALOR ANTIGO': empty if old_values is None else old_values,
+        'VALOR NOVO': empty if new_values is None else new_values,
+    }, columns=EVENT_COLUMNS)
+
+class SeniorityTimeline:
+    """
+    Histórico colunar de várias listas de senioridade (snapshots) em sequência.
+
+    Cada snapshot é guardado no esquema compacto (schema.to_compact), só com
+    o RE, a posição na lista e as colunas comparadas. Ao adicionar um
+    snapshot, apenas a diferença para o anterior é calculada; as mudanças
+    ficam numa tabela única (RE, snapshot, tipo, campo, valores).
+
+    As consultas por piloto usam índices ordenados por (RE, snapshot),
+    montados uma vez após a última inclusão: cada consulta é uma busca
+    binária, sem refazer comparações.
+    """
+
+    def __init__(self, columns: List[str] = COMPARED_COLUMNS):
+        self.columns = columns
+        self.labels: List[str] = []
+        self._frames: List[pd.DataFrame] = []
+        self._events: List[pd.DataFrame] = []
+        self._previous_columns: Optional[Dict[str, np.ndarray]] = None
+        self._previous_fingerprints: Optional[np.ndarray] = None
+        self._history: Optional[Dict] = None
+        self._history_re: Optional[np.ndarray] = None
+        self._changes: Optional[Dict] = None
+        self._changes_re: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[Tuple[str, pd.DataFrame]],
+                       columns: List[str] = COMPARED_COLUMNS) -> 'SeniorityTimeline':
+        """Monta o histórico a partir de pares (rótulo, lista), em ordem cronológica."""
+        timeline = cls(columns)
+        for label, df in snapshots:
+            timeline.add_snapshot(label, df)
+        return timeline
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def add_snapshot(self, label: str, df: pd.DataFrame, fingerprints: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Acrescenta a lista seguinte ao histórico e calcula as mudanças para a anterior.
+
+        Args:
+            label: Rótulo do snapshot (por exemplo, '2024-01'); deve ser único
+            df: Lista de senioridade, em texto ou no esquema compacto
+            fingerprints: Hashes das linhas da lista (comparator.row_fingerprints);
+                com os do snapshot anterior, só os REs com hashes diferentes
+                têm os campos comparados
+
+        Returns:
+            Mudanças em relação ao snapshot anterior (colunas EVENT_COLUMNS);
+            vazio para o primeiro snapshot
+        """
+        if label in self.labels:
+            raise ValueError(f"O snapshot '{label}' já está no histórico")
+
+        try:
+            compact = df if is_compact(df) else to_compact(df, errors='drop')
+            columns = ['RE'] + [column for column in self.columns if column in compact.columns]
+            frame = compact[columns].reset_index(drop=True)
+            frame.insert(1, 'POSIÇÃO', pd.array(list_positions(frame), dtype=SENIORITY_DTYPE))
+            if fingerprints is not None and len(fingerprints) != len(frame):
+                logger.warning(f"Hashes de linha incompatíveis com o snapshot '{label}'; ignorando")
+                fingerprints = None
+
+            snapshot = len(self.labels)
+            current_columns = _column_values(frame)
+            if self._previous_columns is None:
+                events = _events(np.array([], dtype=frame['RE'].dtype), snapshot, 'ENTRADA')
+            else:
+                events = self._diff(self._previous_columns, current_columns, snapshot,
+                                    self._previous_fingerprints, fingerprints)
+
+            self.labels.append(label)
+            self._frames.append(frame)
+            self._events.append(events)
+            self._previous_columns = current_columns
+            self._previous_fingerprints = fingerprints
+            self._history = None
+            self._changes = None
+            logger.info(f"Snapshot '{label}' adicionado: {len(frame)} pilotos, {len(events)} mudanças")
+            return events.assign(SNAPSHOT=label)
+
+        except Exception as e:
+            logger.error(f"Erro ao adicionar o snapshot '{label}': {str(e)}")
+            raise
+
+    def _diff(self, old_columns: Dict[str, np.ndarray], new_columns: Dict[str, np.ndarray], snapshot: int,
+              old_fingerprints: Optional[np.ndarray], new_fingerprints: Optional[np.ndarray]) -> pd.DataFrame:
+        """Mudanças entre dois snapshots consecutivos, montadas coluna a coluna."""
+        old_re = old_columns['RE']
+        new_re = new_columns['RE']
+        entered, left, common_old, common_new = join_by_re(old_re, new_re)
+        if old_fingerprints is not None and new_fingerprints is not None and list(old_columns) == list(new_columns):
+            differ = old_fingerprints[common_old] != new_fingerprints[common_new]
+            common_old, common_new = common_old[differ], common_new[differ]
+
+        blocks = [
+            _events(new_re[entered], snapshot, 'ENTRADA'),
+            _events(old_re[left], snapshot, 'SAÍDA'),
+        ]
+        masks = diff_fields(old_columns, new_columns, common_old, common_new, self.columns, normalize=False)
+        for column, mask in masks.items():
+            rows = np.flatnonzero(mask)
+            if len(rows):
+                blocks.append(_events(new_re[common_new[rows]], snapshot, f"MUDANÇA DE {column}", column,
+                                      old_columns[column][common_old[rows]],
+                                      new_columns[column][common_new[rows]]))
+        return pd.concat(blocks, ignore_index=True)
+
+    def _build_indexes(self) -> None:
+        """Ordena histórico e mudanças por (RE, snapshot) para as consultas por piloto."""
+        if self._history is not None:
+            return
+
+        history = pd.concat(
+            [frame.assign(SNAPSHOT=np.int32(i)) for i, frame in enumerate(self._frames)],
+            ignore_index=True
+        )
+        for column in CATEGORY_COLUMNS:
+            if column in history.columns:
+                history[column] = history[column].astype('category')
+        order = np.lexsort((history['SNAPSHOT'].to_numpy(), history['RE'].to_numpy()))
+        self._history = {column: history[column].array.take(order) for column in history.columns}
+        self._history_re = np.asarray(self._history['RE'], dtype=np.int64)
+
+        changes = pd.concat(self._events, ignore_index=True)
+        order = np.lexsort((np.arange(len(changes)), changes['SNAPSHOT'].to_numpy(),
+                            changes['RE'].to_numpy(dtype=np.int64)))
+        self._changes = {column: changes[column].array.take(order) for column in changes.columns}
+        self._changes_re = np.asarray(self._changes['RE'], dtype=np.int64)
+
+    def _rows(self, re, changes: bool = False) -> slice:
+        """Intervalo das linhas de um RE no histórico ou nas mudanças (busca binária)."""
+        self._build_indexes()
+        keys = self._changes_re if changes else self._history_re
+        re = int(re)
+        start, end = np.searchsorted(keys, [re, re + 1])
+        return slice(int(start), int(end))
+
+    def _frame(self, table: Dict, rows, columns: List[str]) -> pd.DataFrame:
+        """DataFrame com as linhas indicadas, trocando o código do snapshot pelo rótulo."""
+        data = {column: table[column][rows] for column in columns}
+        if 'SNAPSHOT' in data:
+            data['SNAPSHOT'] = np.asarray(self.labels, dtype=object)[np.asarray(data['SNAPSHOT'])]
+        return pd.DataFrame(data, columns=columns)
+
+    def pilot_history(self, re) -> pd.DataFrame:
+        """
+        Linhas do piloto em cada snapshot em que aparece.
+
+        Args:
+            re: RE do piloto (número ou texto)
+
+        Returns:
+            DataFrame com SNAPSHOT, POSIÇÃO e as colunas comparadas
+        """
+        rows = self._rows(re)
+        columns = ['SNAPSHOT'] + [column for column in self._history if column not in ('RE', 'SNAPSHOT')]
+        return self._frame(self._history, rows, columns)
+
+    def pilot_changes(self, re) -> pd.DataFrame:
+        """Mudanças do piloto entre snapshots consecutivos (entradas, saídas e campos)."""
+        rows = self._rows(re, changes=True)
+        return self._frame(self._changes, rows, EVENT_COLUMNS)
+
+    def seniority_trajectory(self, re) -> pd.DataFrame:
+        """
+        SENIORIDADE e posição do piloto em todos os snapshots.
+
+        Returns:
+            DataFrame indexado pelo rótulo do snapshot, com ausentes (NA) nos
+            snapshots em que o piloto não está na lista
+        """
+        rows = self._rows(re)
+        snapshots = np.asarray(self._history['SNAPSHOT'][rows])
+
+        # Posição de cada snapshot nas linhas do piloto; -1 onde ele não aparece
+        positions = np.full(len(self.labels), -1, dtype=np.int64)
+        positions[snapshots] = np.arange(len(snapshots))
+
+        columns = [column for column in ['SENIORIDADE', 'POSIÇÃO'] if column in self._history]
+        data = {column: pd.array(self._history[column][rows]).take(positions, allow_fill=True) for column in columns}
+        return pd.DataFrame(data, index=pd.Index(self.labels, name='SNAPSHOT'))
+
+    def equipment_changes(self, re) -> pd.DataFrame:
+        """Mudanças de EQUIPAMENTO do piloto, com o snapshot em que foram observadas."""
+        rows = self._rows(re, changes=True)
+        fields = np.asarray(self._changes['CAMPO'][rows], dtype=object)
+        selected = np.arange(rows.start, rows.stop)[fields == 'EQUIPAMENTO']
+        return self._frame(self._changes, selected, EVENT_COLUMNS)
+
+    def changes_at(self, label: str) -> pd.DataFrame:
+        """Mudanças entre o snapshot indicado e o anterior."""
+        if label not in self.labels:
+            raise KeyError(f"Snapshot '{label}' não encontrado no histórico")
+        return self._events[self.labels.index(label)].assign(SNAPSHOT=label)
@@ -0,0 +1,148 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from comparator import _normalize_values, join_by_re
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Colunas com matriz de transição própria; a combinação das duas tem a sua
+TRANSITION_COLUMNS = ['FUNÇÃO', 'EQUIPAMENTO']
+COMBINED = 'FUNÇÃO E EQUIPAMENTO'
+
+# Rótulo dos valores ausentes nas matrizes
+MISSING_LABEL = 'N/A'
+
+def _codes(old_values, new_values, normalize: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Numera juntos os valores das duas listas.
+
+    Com normalize, os valores são normalizados como em
+    comparator.diff_fields (normalize_text, uma vez por valor distinto):
+    valores que compare_tables não conta como mudança ficam com o mesmo
+    código.
+
+    Returns:
+        Tupla (códigos da lista antiga, códigos da lista nova, rótulos); os
+        rótulos são os valores como texto em ordem alfabética, com
+        MISSING_LABEL por último quando há ausentes
+    """
+    old_values = np.asarray(old_values, dtype=object)
+    new_values = np.asarray(new_values, dtype=object)
+    codes, uniques = pd.factorize(np.concatenate([old_values, new_values]))
+    if normalize:
+        merged, uniques = pd.factorize(_normalize_values(np.asarray(uniques, dtype=object)))
+        present = codes >= 0
+        codes[present] = merged[codes[present]]
+    labels = np.array([str(value) for value in uniques], dtype=object)
+    order = np.argsort(labels, kind='stable')
+    labels = labels[order]
+    remap = np.empty(len(order) + 1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    # Ausentes (-1 em pd.factorize) ficam com o último código
+    remap[-1] = len(order)
+    if (codes < 0).any():
+        labels = np.append(labels, MISSING_LABEL)
+    codes = remap[codes]
+    return codes[:len(old_values)], codes[len(old_values):], labels
+
+def _count(old_codes: np.ndarray, new_codes: np.ndarray, labels: np.ndarray) -> pd.DataFrame:
+    """Matriz de contagens: cada par (antigo, novo) vira um único inteiro, contado com np.bincount."""
+    size = len(labels)
+    counts = np.bincount(old_codes * size + new_codes, minlength=size * size).reshape(size, size)
+    return pd.DataFrame(counts, index=pd.Index(labels, name='DE'), columns=pd.Index(labels, name='PARA'))
+
+def transition_matrix(old_values, new_values, normalize: bool = True) -> pd.DataFrame:
+    """
+    Conta os pilotos que foram de cada valor para cada outro.
+
+    Os valores das duas listas são numerados juntos (os mesmos rótulos nas
+    linhas e nas colunas) e os pares são contados de uma vez, sem agrupar
+    linha a linha.
+
+    Args:
+        old_values: Valores na lista antiga, um por piloto
+        new_values: Valores na lista nova, alinhados com old_values
+        normalize: Conta os valores normalizados (acentos, maiúsculas e
+            espaços), como compare_tables os compara
+
+    Returns:
+        DataFrame quadrado com os valores antigos nas linhas ('DE'), os
+        novos nas colunas ('PARA') e, na diagonal, os que não mudaram
+    """
+    return _count(*_codes(old_values, new_values, normalize))
+
+def transition_matrices(old_df: pd.DataFrame, new_df: pd.DataFrame,
+                        common_old: Optional[np.ndarray] = None,
+                        common_new: Optional[np.ndarray] = None,
+                        normalize: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    Matrizes de transição de FUNÇÃO, EQUIPAMENTO e da combinação dos dois
+    entre duas listas, para os REs presentes nas duas.
+
+    A combinação é contada pelos códigos das duas colunas (função *
+    equipamentos + equipamento), sem montar um texto por piloto.
+
+    Args:
+        old_df: Lista antiga
+        new_df: Lista nova
+        common_old: Posições dos REs comuns na lista antiga (join_by_re)
+        common_new: Posições dos mesmos REs na lista nova; sem as duas, as
+            listas são juntadas pelo RE aqui
+        normalize: Conta os valores normalizados, como compare_tables os
+            compara (ver transition_matrix)
+
+    Returns:
+        Dicionário com uma matriz (transition_matrix) por coluna presente
+        nas duas listas e, com as duas colunas, COMBINED
+    """
+    try:
+        if common_old is None or common_new is None:
+            _, _, common_old, common_new = join_by_re(old_df['RE'].to_numpy(), new_df['RE'].to_numpy())
+
+        columns: List[str] = [column for column in TRANSITION_COLUMNS
+                              if column in old_df.columns and column in new_df.columns]
+        codes = {column: _codes(old_df[column].to_numpy()[common_old], new_df[column].to_numpy()[common_new],
+                                normalize)
+                 for column in columns}
+        matrices = {column: _count(*codes[column]) for column in columns}
+
+        if len(columns) == len(TRANSITION_COLUMNS):
+            old_function, new_function, function_labels = codes[TRANSITION_COLUMNS[0]]
+            old_equipment, new_equipment, equipment_labels = codes[TRANSITION_COLUMNS[1]]
+            size = len(equipment_labels)
+            pairs, uniques = pd.factorize(np.concatenate([old_function * size + old_equipment,
+                                                          new_function * size + new_equipment]), sort=True)
+            labels = function_labels[uniques // size] + ' / ' + equipment_labels[uniques % size]
+            matrices[COMBINED] = _count(pairs[:len(common_old)], pairs[len(common_old):], labels)
+
+        for name, matrix in matrices.items():
+            moved = int(matrix.to_numpy().sum() - np.trace(matrix.to_numpy()))
+            logger.info(f"Transições de {name}: {moved} de {len(common_new)} pilotos mudaram")
+        return matrices
+
+    except Exception as e:
+        logger.error(f"Erro ao calcular as transições: {str(e)}")
+        raise
+
+def transition_pairs(matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transições de uma matriz em formato longo, só as mudanças (fora da
+    diagonal), da mais frequente para a menos.
+
+    Returns:
+        DataFrame com as colunas DE, PARA e PILOTOS
+    """
+    counts = matrix.to_numpy().copy()
+    np.fill_diagonal(counts, 0)
+    rows, columns = np.nonzero(counts)
+    pairs = pd.DataFrame({
+        'DE': matrix.index.to_numpy()[rows],
+        'PARA': matrix.columns.to_numpy()[columns],
+        'PILOTOS': counts[rows, columns],
+    })
+    return pairs.sort_values(['PILOTOS', 'DE', 'PARA'], ascending=[False, True, True],
+                             kind='stable').reset_index(drop=True)
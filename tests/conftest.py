@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos ficam em src/ e se importam pelo nome, como em app.py e nos benchmarks
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
@@ -0,0 +1,116 @@
+"""
+Gera os PDFs usados pelos testes (listas de senioridade sintéticas).
+
+Os arquivos gerados ficam versionados ao lado deste script, para que os
+testes não dependam do reportlab; só é preciso rodá-lo de novo ao mudar
+as listas.
+
+Uso:
+    python tests/fixtures/make_pdfs.py
+"""
+import os
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfgen import canvas
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+HEADER = ['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'RE', 'SENIORIDADE']
+FUNCTIONS = ['CMTE', 'COP', 'INSTRUTOR']
+EQUIPMENT = ['A320', 'B737', 'E195']
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+
+# Sem data de criação nem ID aleatório: gerar de novo dá os mesmos bytes
+rl_config.invariant = 1
+
+COLUMN_WIDTHS = [60, 70, 170, 90, 60, 70]
+
+def row(number):
+    """Linha do piloto de número `number` (a partir de 1); RE = 10000 + número."""
+    return [FUNCTIONS[number % 3], EQUIPMENT[number % 3], f'PILOTO NUMERO {number} DA SILVA',
+            f'PIL{number}', str(10000 + number), str(number)]
+
+def make_pdf(path, pages=3, rows=18, title=False, header_every_page=True, changes=None):
+    """
+    Lista com `pages` páginas de `rows` pilotos cada.
+
+    Args:
+        title: Coloca um título acima da tabela na primeira página (as
+            tabelas das páginas seguintes começam mais acima)
+        header_every_page: Repete o cabeçalho em todas as páginas
+        changes: {número do piloto: {índice da coluna: valor}} aplicados às linhas
+    """
+    styles = getSampleStyleSheet()
+    story = []
+    number = 1
+    for page in range(pages):
+        if title and page == 0:
+            story += [Paragraph('LISTA DE SENIORIDADE DOS PILOTOS', styles['Title']), Spacer(1, 40)]
+        data = [HEADER] if header_every_page or page == 0 else []
+        for _ in range(rows):
+            values = row(number)
+            for column, value in (changes or {}).get(number, {}).items():
+                values[column] = value
+            data.append(values)
+            number += 1
+        table = Table(data, colWidths=COLUMN_WIDTHS)
+        table.setStyle(TableStyle([('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+                                   ('FONTSIZE', (0, 0), (-1, -1), 7)]))
+        story += [table, PageBreak()]
+    SimpleDocTemplate(path, pagesize=landscape(A4)).build(story[:-1])
+
+def make_form_pdf(path, pages=2, rows=18, changes=None):
+    """
+    Lista desenhada dentro de Form XObjects: o content stream de cada
+    página só chama o formulário ('/FormXob... Do'), com os mesmos nomes
+    de formulário em listas diferentes.
+    """
+    pdf = canvas.Canvas(path, pagesize=landscape(A4))
+    _, height = landscape(A4)
+    xs = [40]
+    for width in COLUMN_WIDTHS:
+        xs.append(xs[-1] + width)
+    number = 1
+    for page in range(pages):
+        data = [HEADER]
+        for _ in range(rows):
+            values = row(number)
+            for column, value in (changes or {}).get(number, {}).items():
+                values[column] = value
+            data.append(values)
+            number += 1
+        ys = [height - 60 - 14 * line for line in range(len(data) + 1)]
+
+        name = f'tabela{page}'
+        pdf.beginForm(name)
+        pdf.setFont('Helvetica', 7)
+        for line, values in enumerate(data):
+            for x, value in zip(xs, values):
+                pdf.drawString(x + 2, ys[line] - 10, value)
+        # Uma linha por traço (pdfminer não lê um caminho com várias linhas)
+        for x in xs:
+            pdf.line(x, ys[0], x, ys[-1])
+        for y in ys:
+            pdf.line(xs[0], y, xs[-1], y)
+        # pdfminer perde o último operador de um stream sem espaço no fim
+        pdf.saveState()
+        pdf.restoreState()
+        pdf.endForm()
+        pdf.doForm(name)
+        pdf.showPage()
+    pdf.save()
+
+def main():
+    make_pdf(os.path.join(FIXTURES, 'lista.pdf'))
+    make_pdf(os.path.join(FIXTURES, 'lista_titulo.pdf'), title=True)
+    # Segunda página com um piloto que mudou de equipamento
+    changed = {25: {1: 'B787'}}
+    make_pdf(os.path.join(FIXTURES, 'lista_mudada.pdf'), changes=changed)
+    make_form_pdf(os.path.join(FIXTURES, 'formularios.pdf'))
+    make_form_pdf(os.path.join(FIXTURES, 'formularios_mudada.pdf'), changes=changed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from change_set import ChangeSet
+from comparator import ListComparator, compare_tables, diff_fields, row_fingerprints
+from schema import to_compact
+
+def _list(res, equipment):
+    return pd.DataFrame({
+        'RE': res,
+        'NOME': [f'PILOTO {re}' for re in res],
+        'NOME DE GUERRA': [f'P{re}' for re in res],
+        'FUNÇÃO': ['CMTE'] * len(res),
+        'EQUIPAMENTO': [equipment] * len(res),
+        'SENIORIDADE': [str(i + 1) for i in range(len(res))],
+    })
+
+def test_differences_are_json_records():
+    result = compare_tables(_list(['1', '2'], 'A320'), _list(['2', '3'], 'B737'))
+    assert json.loads(json.dumps(result)) == result
+    assert [record['Tipo'] for record in result['differences']] == [
+        'ENTRADA', 'SAÍDA', 'MUDANÇA DE EQUIPAMENTO', 'MUDANÇA DE SENIORIDADE'
+    ]
+
+def test_columnar_differences_match_records():
+    old_df, new_df = _list(['1', '2'], 'A320'), _list(['2', '3'], 'B737')
+    records = compare_tables(old_df.copy(), new_df.copy())['differences']
+    changes = compare_tables(old_df.copy(), new_df.copy(), columnar=True)['differences']
+    assert isinstance(changes, ChangeSet)
+    assert changes.to_records() == records
+    with pytest.raises(TypeError):
+        hash(changes)
+
+@pytest.mark.parametrize('normalize', [True, False])
+def test_missing_values_with_different_markers_are_equal(normalize):
+    old_columns = {'NOME DE GUERRA': np.array([None, pd.NA, np.nan, None, 'PIL5', 'NAN'], dtype=object)}
+    new_columns = {'NOME DE GUERRA': np.array([pd.NA, np.nan, None, 'PIL4', None, np.nan], dtype=object)}
+    positions = np.arange(6)
+    masks = diff_fields(old_columns, new_columns, positions, positions,
+                        columns=['NOME DE GUERRA'], normalize=normalize)
+    assert masks['NOME DE GUERRA'].tolist() == [False, False, False, True, True, True]
+
+def test_unchanged_row_with_missing_cell_is_not_a_change():
+    old_df = _list(['1', '2'], 'A320')
+    new_df = old_df.copy()
+    old_df['NOME DE GUERRA'] = pd.array([pd.NA, 'P2'], dtype=object)
+    new_df['NOME DE GUERRA'] = [None, 'P2']
+    assert compare_tables(old_df, new_df)['differences'] == []
+
+def _changed_pair(rows=200):
+    old_df = _list([str(10000 + n) for n in range(rows)], 'A320')
+    new_df = old_df.copy()
+    new_df.loc[[3, 50], 'EQUIPAMENTO'] = 'B737'
+    new_df.loc[120, 'NOME DE GUERRA'] = 'OUTRO'
+    # A lista nova em outra ordem: os hashes seguem as linhas, não as posições
+    return old_df, new_df.iloc[::-1].reset_index(drop=True)
+
+def test_fingerprints_do_not_depend_on_the_column_types():
+    old_df, _ = _changed_pair()
+    assert np.array_equal(row_fingerprints(old_df), row_fingerprints(to_compact(old_df)))
+    changed = old_df.copy()
+    changed.loc[7, 'SENIORIDADE'] = '999'
+    assert (row_fingerprints(old_df) != row_fingerprints(changed)).tolist() == [n == 7 for n in range(200)]
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_fingerprints_only_skip_unchanged_rows(compact, monkeypatch):
+    old_df, new_df = _changed_pair()
+    if compact:
+        old_df, new_df = to_compact(old_df), to_compact(new_df)
+    expected = compare_tables(old_df.copy(), new_df.copy())['differences']
+    assert len(expected) == 3
+
+    import comparator
+    compared = []
+    original = comparator.diff_fields
+
+    def recording_diff_fields(old_columns, new_columns, old_positions, new_positions, *args, **kwargs):
+        compared.append(len(old_positions))
+        return original(old_columns, new_columns, old_positions, new_positions, *args, **kwargs)
+
+    monkeypatch.setattr(comparator, 'diff_fields', recording_diff_fields)
+    result = compare_tables(old_df.copy(), new_df.copy(), row_fingerprints(old_df), row_fingerprints(new_df))
+    assert result['differences'] == expected
+    # Só as três linhas com hashes diferentes têm os campos comparados
+    assert compared == [3]
+
+    lists = ListComparator().compare_lists(old_df.copy(), new_df.copy(),
+                                           row_fingerprints(old_df), row_fingerprints(new_df))
+    assert sorted(lists['RE'].astype(str)) == ['10003', '10050', '10120']
@@ -0,0 +1,24 @@
+import os
+
+import pdfplumber
+
+from coordinate_extractor import ColumnLayout, iter_page_tables_fast
+from pdf_extractor import extract_table_from_pdf
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+TITLED = os.path.join(FIXTURES, 'lista_titulo.pdf')
+
+def test_fast_mode_keeps_rows_after_a_titled_first_page():
+    table = extract_table_from_pdf(TITLED)
+    fast = extract_table_from_pdf(TITLED, fast=True)
+    assert len(table) == 54
+    assert fast.equals(table)
+
+def test_layout_from_titled_page_finds_the_table_top_on_each_page():
+    with pdfplumber.open(TITLED) as pdf:
+        layout, _ = ColumnLayout.from_page(pdf.pages[0])
+        # A tabela das páginas seguintes começa acima do cabeçalho da primeira
+        assert pdf.pages[1].find_table().bbox[1] < layout.top
+    tables = [table for _, table in iter_page_tables_fast(TITLED, layout)]
+    assert all(table[0] == layout.header for table in tables)
+    assert [row[4] for table in tables for row in table[1:]] == [str(10000 + n) for n in range(1, 55)]
@@ -0,0 +1,45 @@
+import logging
+
+import pandas as pd
+from openpyxl import Workbook
+
+from excel_reader import iter_excel_chunks, read_excel_compact
+
+HEADER = ['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'RE', 'SENIORIDADE']
+
+def _write(path, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+def test_non_integer_numbers_become_missing_with_a_warning(tmp_path, caplog):
+    path = tmp_path / 'lista.xlsx'
+    _write(path, [
+        ['CMTE', 'A320', 'PILOTO UM', 'PIL1', 10001, 1],
+        ['COP', 'B737', 'PILOTO DOIS', 'PIL2', 10002, 12.5],
+        ['COP', 'B737', 'PILOTO TRES', 'PIL3', 10003.5, 3],
+        ['CMTE', 'E195', 'PILOTO QUATRO', 'PIL4', '10004', '0004'],
+    ])
+
+    with caplog.at_level(logging.WARNING, logger='excel_reader'):
+        df = read_excel_compact(str(path))
+
+    # RE inválido descarta a linha; SENIORIDADE inválida fica ausente
+    assert df['RE'].tolist() == [10001, 10002, 10004]
+    assert df['SENIORIDADE'].tolist() == [1, pd.NA, 4]
+    assert str(df['SENIORIDADE'].dtype) == 'Int32'
+    assert 'SENIORIDADE' in caplog.text and '12.5' in caplog.text
+
+def test_chunks_match_the_whole_sheet(tmp_path):
+    path = tmp_path / 'lista.xlsx'
+    rows = [['CMTE', 'A320', f'PILOTO {n}', f'PIL{n}', 10000 + n, n] for n in range(1, 26)]
+    _write(path, rows)
+
+    chunks = list(iter_excel_chunks(str(path), chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    df = read_excel_compact(str(path), chunk_size=10)
+    assert df['RE'].tolist() == [10000 + n for n in range(1, 26)]
+    assert df['SENIORIDADE'].tolist() == list(range(1, 26))
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from extraction_cache import ExtractionCache
+
+def _extracted():
+    # Como sai da extração: células vazias como None e o índice original
+    return pd.DataFrame({
+        'RE': ['10001', '10002', '10003'],
+        'NOME DE GUERRA': ['PIL1', None, 'PIL3'],
+        'SENIORIDADE': ['1', '2', None],
+    }, index=[4, 7, 9])
+
+def test_miss_and_hit_return_the_same_table(tmp_path):
+    source = tmp_path / 'lista.pdf'
+    source.write_bytes(b'%PDF conteudo')
+    cache = ExtractionCache(str(tmp_path / 'cache'))
+    calls = []
+
+    def extract():
+        calls.append(1)
+        return _extracted()
+
+    miss = cache.get_or_extract(str(source), 'teste', '1', extract)
+    hit = cache.get_or_extract(str(source), 'teste', '1', extract)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(miss, hit)
+    assert isinstance(miss.index, pd.RangeIndex)
+    assert miss['NOME DE GUERRA'].isna().tolist() == [False, True, False]
+    assert cache.fingerprints_for(str(source), 'teste', '1') is not None
+
+def test_settings_are_part_of_the_key(tmp_path):
+    source = tmp_path / 'lista.pdf'
+    source.write_bytes(b'%PDF conteudo')
+    cache = ExtractionCache(str(tmp_path / 'cache'))
+    calls = []
+
+    def extract():
+        calls.append(1)
+        return _extracted()
+
+    cache.get_or_extract(str(source), 'teste', '1', extract, settings={'fast': False})
+    cache.get_or_extract(str(source), 'teste', '1', extract, settings={'fast': True})
+    cache.get_or_extract(str(source), 'teste', '1', extract, settings={'fast': True})
+    assert len(calls) == 2
@@ -0,0 +1,50 @@
+import logging
+import os
+
+import pytest
+
+from extraction_engine import ExtractionBackend, ExtractionEngine, PdfTableBackend
+from layout_profiles import LayoutProfile
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+HEADER = ['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'RE', 'SENIORIDADE']
+
+class _TablesBackend(ExtractionBackend):
+    """Backend com tabelas prontas, uma por página."""
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def iter_page_tables(self, source):
+        return enumerate(self.tables, 1)
+
+def _row(number):
+    return ['CMTE', 'A320', f'PILOTO {number}', f'P{number}', str(1000 + number), str(number)]
+
+def test_continuation_pages_without_header_keep_their_first_row():
+    tables = [[HEADER, _row(1), _row(2)], [_row(3), _row(4)], [HEADER, _row(5)]]
+    df = ExtractionEngine(_TablesBackend(tables)).extract(None)
+    assert df['SENIORIDADE'].tolist() == ['1', '2', '3', '4', '5']
+
+def test_profile_header_row_only_trims_the_first_page():
+    title = ['LISTA DE SENIORIDADE', None, None, None, None, None]
+    profile = LayoutProfile('teste', [595.0, 842.0], HEADER, 1, 40.0, [0.0] * 7, {column: column for column in HEADER})
+    tables = [[title, HEADER, _row(1)], [_row(2), _row(3)], [_row(4)]]
+    df = ExtractionEngine(_TablesBackend(tables)).extract(None, profile)
+    assert df['SENIORIDADE'].tolist() == ['1', '2', '3', '4']
+
+def test_backend_must_implement_iter_page_tables():
+    class _Incomplete(ExtractionBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        _Incomplete()
+
+def test_pages_beyond_the_document_are_ignored(caplog):
+    backend = PdfTableBackend(pages=[3, 7, 0, 2])
+    with caplog.at_level(logging.WARNING, logger='extraction_engine'):
+        df = ExtractionEngine(backend).extract(os.path.join(FIXTURES, 'lista.pdf'))
+    # Páginas 3 e 2 (18 linhas cada), na ordem pedida
+    assert df['RE'].tolist() == [str(10000 + n) for n in list(range(37, 55)) + list(range(19, 37))]
+    assert '[7, 0]' in caplog.text
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from column_inference import clear_mapping_cache
+from extractor import extract_data
+
+def _letters(n):
+    return chr(ord('A') + n // 26) + chr(ord('A') + n % 26)
+
+def _rows(count=30, first_re=10000):
+    return [[['CMTE', 'COP'][n % 2], ['A320', 'B737'][n % 2], f'PILOTO {_letters(n)} DA SILVA',
+             f'PIL{_letters(n)}', str(first_re + n), str(n)] for n in range(1, count + 1)]
+
+def test_header_with_re_does_not_infer_other_columns(tmp_path):
+    clear_mapping_cache()
+    path = tmp_path / 'lista.xlsx'
+    # REs de 4 dígitos, crescentes, parecem SENIORIDADE para a inferência; com
+    # 'RE' no cabeçalho, a coluna que falta não pode ser suprida com o RE
+    df = pd.DataFrame([row[:5] for row in _rows(first_re=1000)],
+                      columns=['FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA', 'RE'])
+    df.to_excel(path, index=False)
+
+    result = extract_data(str(path), {})
+    assert result.columns.tolist() == ['RE', 'FUNÇÃO', 'EQUIPAMENTO', 'NOME', 'NOME DE GUERRA']
+    assert result['RE'].tolist() == [str(1000 + n) for n in range(1, 31)]
+
+def test_header_without_re_infers_the_columns(tmp_path):
+    clear_mapping_cache()
+    path = tmp_path / 'lista.xlsx'
+    df = pd.DataFrame(_rows(), columns=['A', 'B', 'C', 'D', 'E', 'F'])
+    df.to_excel(path, index=False)
+
+    result = extract_data(str(path), {})
+    assert result['RE'].tolist() == [str(10000 + n) for n in range(1, 31)]
+    assert result['SENIORIDADE'].astype(str).tolist() == [str(n) for n in range(1, 31)]
+    assert result['NOME'].tolist()[:2] == ['PILOTO AB DA SILVA', 'PILOTO AC DA SILVA']
+    assert result['NOME DE GUERRA'].tolist()[:2] == ['PILAB', 'PILAC']
@@ -0,0 +1,53 @@
+import random
+
+import numpy as np
+import pytest
+
+from comparator import join_by_re, re_codes
+
+def _naive_join(old_re, new_re):
+    """Junção de referência com dicionários RE -> primeira posição."""
+    old_first, new_first = {}, {}
+    for position, re in enumerate(old_re):
+        old_first.setdefault(re, position)
+    for position, re in enumerate(new_re):
+        new_first.setdefault(re, position)
+    entered = [position for re, position in new_first.items() if re not in old_first]
+    left = [position for re, position in old_first.items() if re not in new_first]
+    common_old = [old_first[re] for re in new_first if re in old_first]
+    common_new = [position for re, position in new_first.items() if re in old_first]
+    return [entered, left, common_old, common_new]
+
+def _lists(seed, rows, low, high, as_text):
+    rng = random.Random(seed)
+    # Com repetições, fora de ordem e com REs só de uma das listas
+    old_re = [rng.randint(low, high) for _ in range(rows)]
+    new_re = [rng.randint(low, high) for _ in range(rows + 7)]
+    if as_text:
+        return np.array([str(re) for re in old_re], dtype=object), np.array([str(re) for re in new_re], dtype=object)
+    return np.array(old_re, dtype=np.int32), np.array(new_re, dtype=np.int32)
+
+# REs próximos entre si (códigos por subtração) e espalhados (códigos por factorize)
+@pytest.mark.parametrize('low, high', [(10000, 10400), (1000, 9999999)])
+@pytest.mark.parametrize('as_text', [False, True])
+@pytest.mark.parametrize('seed', range(3))
+def test_join_matches_naive_join(seed, as_text, low, high):
+    old_re, new_re = _lists(seed, 300, low, high, as_text)
+    result = join_by_re(old_re, new_re)
+    expected = _naive_join(old_re.tolist(), new_re.tolist())
+    assert [part.tolist() for part in result] == expected
+
+def test_codes_are_shared_between_lists():
+    for old_re, new_re in [_lists(0, 50, 10000, 10100, False), _lists(0, 50, 10000, 10100, True)]:
+        old_codes, new_codes, size = re_codes(old_re, new_re)
+        values = np.concatenate([old_re, new_re]).tolist()
+        codes = np.concatenate([old_codes, new_codes]).tolist()
+        assert 0 <= min(codes) and max(codes) < size
+        # Mesmo RE, mesmo código, nas duas listas
+        assert len({(value, code) for value, code in zip(values, codes)}) == len(set(values))
+
+def test_empty_lists():
+    empty = np.array([], dtype=object)
+    entered, left, common_old, common_new = join_by_re(empty, np.array(['1', '2'], dtype=object))
+    assert entered.tolist() == [0, 1] and left.tolist() == [] and common_old.tolist() == []
+    assert [part.tolist() for part in join_by_re(empty, empty)] == [[], [], [], []]
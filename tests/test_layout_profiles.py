@@ -0,0 +1,35 @@
+import os
+
+from layout_profiles import ProfileStore
+from pdf_extractor import extract_table_from_pdf
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def test_layouts_with_the_header_at_other_heights_keep_separate_profiles(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    plain = store.learn(os.path.join(FIXTURES, 'lista.pdf'))
+    titled = store.learn(os.path.join(FIXTURES, 'lista_titulo.pdf'))
+
+    # Mesmo tamanho de página e cabeçalho; só a altura do cabeçalho muda
+    assert plain.header == titled.header
+    assert plain.header_top != titled.header_top
+    assert plain.name != titled.name
+    assert sorted(os.listdir(tmp_path)) == sorted([f'{plain.name}.json', f'{titled.name}.json'])
+
+    reloaded = ProfileStore(str(tmp_path))
+    assert reloaded.detect(os.path.join(FIXTURES, 'lista.pdf')).name == plain.name
+    assert reloaded.detect(os.path.join(FIXTURES, 'lista_titulo.pdf')).name == titled.name
+
+def test_extraction_with_the_detected_profile(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    path = os.path.join(FIXTURES, 'lista_titulo.pdf')
+    # A primeira extração aprende o perfil; a segunda o usa
+    first = extract_table_from_pdf(path, profiles=store)
+    profile = store.profiles()[0]
+    assert profile.table_settings == {}
+    assert store.detect(path) is profile
+
+    for fast in (False, True):
+        df = extract_table_from_pdf(path, profiles=store, fast=fast)
+        assert df['RE'].tolist() == first['RE'].tolist() == [str(10000 + n) for n in range(1, 55)]
+    assert len(store.profiles()) == 1
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from movement import rank_movement, smaller_before
+
+@pytest.mark.parametrize('size', [0, 1, 2, 3, 7, 64, 100, 513])
+def test_smaller_before_matches_brute_force(size):
+    rng = np.random.default_rng(size)
+    for _ in range(10):
+        values = rng.permutation(size)
+        expected = [int((values[:i] < values[i]).sum()) for i in range(size)]
+        assert smaller_before(values).tolist() == expected
+
+def test_overtakes_match_pairwise_counts():
+    rng = np.random.default_rng(0)
+    size = 300
+    res = [str(1000 + i) for i in range(size)]
+    old_df = pd.DataFrame({'RE': res, 'SENIORIDADE': [str(i + 1) for i in range(size)]})
+    # Ordem nova embaralhada, com algumas saídas e entradas
+    new_df = pd.DataFrame({'RE': res[20:] + ['9001', '9002'],
+                           'SENIORIDADE': [str(i) for i in rng.permutation(size - 18) + 1]})
+
+    movement = rank_movement(old_df, new_df)
+    old = movement['POSIÇÃO ANTIGA'].to_numpy()
+    new = movement['POSIÇÃO NOVA'].to_numpy()
+    overtook = [int(((old < old[i]) & (new > new[i])).sum()) for i in range(len(old))]
+    overtaken = [int(((old > old[i]) & (new < new[i])).sum()) for i in range(len(old))]
+    assert movement['ULTRAPASSOU'].tolist() == overtook
+    assert movement['ULTRAPASSADO POR'].tolist() == overtaken
@@ -0,0 +1,123 @@
+import itertools
+import random
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from normalizer import (DataNormalizer, _normalize_value_cached, clear_normalization_cache,
+                        normalize_data, strip_accents)
+
+# Espaços de str.split() além do ASCII, dígitos não ASCII, acentos, o
+# caractere NUL e caracteres que mudam de tamanho em upper()
+ALPHABET = list('abcXYZ 019') + ['\t', '\n', '\xa0', ' ', '　', '\x1f',
+                                  '٣', '０', 'é', 'Ç', 'ß', 'ﬁ', '\x00', '-', '.']
+
+def _random_values(rng, count):
+    values = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            values.append(None)
+        elif roll < 0.08:
+            values.append(np.nan)
+        elif roll < 0.1:
+            values.append(rng.randint(0, 10**6))
+        else:
+            values.append(''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12))))
+    return values
+
+def _per_row_seniority(normalizer, text):
+    # Sem dígitos, a versão por linha falha em int(''); a por coluna devolve ""
+    if not pd.isna(text) and not re.search(r'\d', str(text)):
+        return ""
+    return normalizer._normalize_seniority(text)
+
+def _per_row(normalizer, column, series):
+    if column == 'SENIORIDADE':
+        return series.apply(lambda text: _per_row_seniority(normalizer, text))
+    return series.apply(normalizer.column_mappings[column])
+
+@pytest.mark.parametrize('seed', range(5))
+def test_series_versions_match_per_row_functions(seed):
+    rng = random.Random(seed)
+    normalizer = DataNormalizer()
+    for column, by_value in normalizer.series_mappings.items():
+        series = pd.Series(_random_values(rng, 500), dtype=object)
+        assert by_value(series).tolist() == _per_row(normalizer, column, series).tolist(), column
+        # Só textos (inclusive com NUL), sem ausentes nem números
+        texts = series[series.map(lambda v: isinstance(v, str))]
+        assert by_value(texts).tolist() == _per_row(normalizer, column, texts).tolist(), column
+        # Categórica, com ausentes: normalizada pelas categorias
+        categorical = series.where(series.map(lambda v: isinstance(v, str)), None).astype('category')
+        assert by_value(categorical).tolist() == _per_row(normalizer, column, categorical.astype(object)).tolist(), column
+
+@pytest.mark.parametrize('seed', range(3))
+def test_normalize_dataframe_matches_per_row_version(seed):
+    rng = random.Random(seed)
+    normalizer = DataNormalizer()
+    rows = 3000
+    # Poucos valores distintos em FUNÇÃO/EQUIPAMENTO exercitam a normalização por valor único
+    df = pd.DataFrame({
+        'FUNÇÃO': [rng.choice([' cmte', 'CMTE ', 'cop\t', None]) for _ in range(rows)],
+        'EQUIPAMENTO': pd.Categorical([rng.choice(['a320', ' A320', 'b737', None]) for _ in range(rows)]),
+        'NOME': _random_values(rng, rows),
+        'NOME DE GUERRA': _random_values(rng, rows),
+        'RE': [rng.choice(['00123', ' 45-6', '', None, '7 8 9', '٣4']) for _ in range(rows)],
+        'SENIORIDADE': [rng.choice(['0012', '7', ' 3 ', '000', '', None, 'x']) for _ in range(rows)],
+    })
+
+    expected = df.copy()
+    expected['EQUIPAMENTO'] = expected['EQUIPAMENTO'].astype(object)
+    for column in normalizer.column_mappings:
+        expected[column] = _per_row(normalizer, column, expected[column])
+    expected = expected.drop_duplicates()
+    expected = expected[expected['RE'] != ""]
+
+    result = normalizer.normalize_dataframe(df)
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_seniority_without_digits_becomes_empty():
+    normalizer = DataNormalizer()
+    series = pd.Series(['', '  ', 'N/A', None, '0007'], dtype=object)
+    assert normalizer._normalize_seniority_series(series).tolist() == ['', '', '', '', '7']
+    with pytest.raises(ValueError):
+        normalizer._normalize_seniority('N/A')
+
+def _strip_accents_per_character(text):
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
+
+def test_strip_accents_matches_per_character_version():
+    rng = random.Random(0)
+    values = [v for v in _random_values(rng, 2000) if isinstance(v, str)]
+    values += ['JOÃO', 'Conceição', 'Ñandú', 'ﬁ', 'x\u0301']
+    assert [strip_accents(v) for v in values] == [_strip_accents_per_character(v) for v in values]
+
+@pytest.mark.parametrize('options', list(itertools.product([True, False], repeat=3)))
+def test_normalize_data_factorized_matches_per_value(options):
+    rng = random.Random(1)
+    df = pd.DataFrame({
+        'NOME': _random_values(rng, 1000),
+        'FUNÇÃO': [rng.choice(['cmte', ' Cmte ', 'Côp', None]) for _ in range(1000)],
+    })
+    config = dict(zip(['remove_accents', 'standardize_case', 'remove_special_chars'], options))
+    expected = normalize_data(df, {**config, 'factorize': False})
+    pd.testing.assert_frame_equal(normalize_data(df, config), expected)
+
+def test_normalize_data_reuses_values_between_calls():
+    clear_normalization_cache()
+    df = pd.DataFrame({'NOME': ['José Silva', 'ANA', 'José Silva'], 'RE': ['1', '2', '1']})
+    first = normalize_data(df, {})
+    misses = _normalize_value_cached.cache_info().misses
+    # A lista seguinte repete os mesmos valores: nenhum é normalizado de novo
+    second = normalize_data(df, {})
+    assert _normalize_value_cached.cache_info().misses == misses
+    pd.testing.assert_frame_equal(first, second)
+    assert first['NOME'].tolist() == ['JOSE SILVA', 'ANA']
+
+def test_normalize_data_keeps_values_that_differ_after_a_nul():
+    # pd.factorize sozinho agruparia os dois nomes (tabela de strings C)
+    df = pd.DataFrame({'NOME': ['\x00ana', '\x00bia'], 'RE': ['1', '2']})
+    assert normalize_data(df, {})['NOME'].tolist() == ['ANA', 'BIA']
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from comparator import compare_tables
+from out_of_core import compare_out_of_core
+from schema import to_compact
+
+def _lists(rows=1500, seed=0):
+    """Duas listas com saídas, entradas, mudanças, ausentes, REs repetidos e ordem embaralhada."""
+    rng = np.random.default_rng(seed)
+    positions = np.arange(rows)
+    old_df = pd.DataFrame({
+        'FUNÇÃO': np.array(['CMTE', 'COP', 'INSTRUTOR'], dtype=object)[positions % 3],
+        'EQUIPAMENTO': np.array(['A320', 'B737', 'E195'], dtype=object)[positions % 3],
+        'NOME': [f'PILOTO {i:05d} DA SILVA' for i in positions],
+        'NOME DE GUERRA': [f'PIL{i:05d}' for i in positions],
+        'RE': [str(10000 + i) for i in positions],
+        'SENIORIDADE': [str(i + 1) for i in positions],
+    })
+    new_df = old_df[positions % 50 != 0].copy()
+    changed = rng.random(len(new_df)) < 0.05
+    new_df.loc[changed, 'EQUIPAMENTO'] = 'B787'
+    new_df.loc[rng.random(len(new_df)) < 0.01, 'NOME DE GUERRA'] = None
+    # Pilotos com RE novo e o mesmo nome (pareados com reconcile=True)
+    rekeyed = old_df[positions % 50 == 0].head(5).assign(RE=lambda df: '9' + df['RE'])
+    new_df = pd.concat([new_df, rekeyed], ignore_index=True)
+    new_df = new_df.iloc[rng.permutation(len(new_df))].reset_index(drop=True)
+    # REs repetidos nas duas listas, um deles com outro equipamento
+    old_df = pd.concat([old_df, old_df.iloc[[10, 20]]], ignore_index=True)
+    new_df = pd.concat([new_df, new_df.iloc[[30]].assign(EQUIPAMENTO='X')], ignore_index=True)
+    return old_df, new_df
+
+def _batches(df, rows=400):
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+@pytest.mark.parametrize('compact', [False, True])
+@pytest.mark.parametrize('reconcile', [False, True])
+@pytest.mark.parametrize('run_rows, block_rows', [(50000, 5000), (300, 64), (97, 31)])
+def test_out_of_core_matches_compare_tables(compact, reconcile, run_rows, block_rows):
+    old_df, new_df = _lists()
+    if compact:
+        old_df, new_df = to_compact(old_df), to_compact(new_df)
+
+    expected = compare_tables(old_df.copy(), new_df.copy(), reconcile=reconcile)
+    result = compare_out_of_core(_batches(old_df), _batches(new_df), run_rows=run_rows,
+                                 block_rows=block_rows, reconcile=reconcile)
+    assert result == expected
+    assert expected['total_differences'] > 0
+    if reconcile:
+        assert expected['reconciled'] == 5
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from page_diff import changed_pages, compare_pdfs_by_page, page_hashes
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def _pair(name):
+    return os.path.join(FIXTURES, f'{name}.pdf'), os.path.join(FIXTURES, f'{name}_mudada.pdf')
+
+# Nas duas listas mudadas, o piloto 25 (segunda página) trocou de equipamento
+@pytest.mark.parametrize('name', ['lista', 'formularios'])
+@pytest.mark.parametrize('method', ['content', 'text'])
+def test_only_the_changed_page_is_compared(name, method):
+    old_pdf, new_pdf = _pair(name)
+    assert changed_pages(page_hashes(old_pdf, method), page_hashes(new_pdf, method)) == ([2], [2])
+
+    result = compare_pdfs_by_page(old_pdf, new_pdf, method)
+    assert result['pages_compared'] == (1, 1)
+    assert [(record['RE'], record['Detalhes']) for record in result['differences']] == [
+        ('10025', 'De: B737 Para: B787')
+    ]
+
+def test_text_in_form_xobjects_changes_the_content_hash():
+    # O content stream das páginas é o mesmo nas duas listas ('/FormXob... Do')
+    old_pdf, new_pdf = _pair('formularios')
+    old_hashes, new_hashes = page_hashes(old_pdf), page_hashes(new_pdf)
+    assert old_hashes[0] == new_hashes[0]
+    assert old_hashes[1] != new_hashes[1]
+
+def test_identical_lists_have_no_differences():
+    old_pdf, _ = _pair('lista')
+    result = compare_pdfs_by_page(old_pdf, old_pdf)
+    assert result['differences'] == []
+    assert result['pages_skipped'] == 3
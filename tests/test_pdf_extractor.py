@@ -0,0 +1,84 @@
+import os
+from io import BytesIO
+
+import pandas as pd
+import pdfplumber
+import pytest
+
+from extraction_engine import _page_ranges, content_text, page_text
+from pdf_extractor import extract_table_from_pdf, find_re_rows, iter_table_batches
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LISTA = os.path.join(FIXTURES, 'lista.pdf')
+
+@pytest.fixture
+def parsed_pages(monkeypatch):
+    """Números das páginas que passaram pela detecção de tabela."""
+    pages = []
+    original = pdfplumber.page.Page.find_tables
+
+    def find_tables(page, *args, **kwargs):
+        pages.append(page.page_number)
+        return original(page, *args, **kwargs)
+
+    monkeypatch.setattr(pdfplumber.page.Page, 'find_tables', find_tables)
+    return pages
+
+def test_content_text_matches_the_page_characters():
+    with pdfplumber.open(LISTA) as pdf:
+        for page in pdf.pages:
+            assert content_text(page).replace(' ', '') == page_text(page).replace(' ', '')
+
+def test_find_re_rows_reads_only_the_pages_with_missing_res(parsed_pages):
+    # 18 pilotos por página: 10030 na segunda e 10050 na terceira
+    rows = find_re_rows(LISTA, ['10050', '10030'])
+    assert rows['RE'].tolist() == ['10030', '10050']
+    assert rows['NOME DE GUERRA'].tolist() == ['PIL30', 'PIL50']
+    assert sorted(set(parsed_pages)) == [1, 2, 3]
+
+    parsed_pages.clear()
+    find_re_rows(LISTA, ['10002', '10003'])
+    # Encontrados na primeira página, a leitura para ali
+    assert sorted(set(parsed_pages)) == [1]
+
+def test_find_re_rows_matches_whole_res_only(parsed_pages):
+    # '1004' é prefixo dos REs 10040..10049 (terceira página), mas não é um RE
+    assert find_re_rows(LISTA, ['1004']).empty
+    assert sorted(set(parsed_pages)) == [1]
+
+def test_page_ranges_cover_every_page_once():
+    for total_pages in (1, 3, 10, 11):
+        for chunks in (1, 2, 3, 4, 20):
+            ranges = _page_ranges(total_pages, chunks)
+            assert [page for start, end in ranges for page in range(start, end)] == list(range(total_pages))
+            assert max(end - start for start, end in ranges) - min(end - start for start, end in ranges) <= 1
+
+@pytest.mark.parametrize('name', ['lista.pdf', 'lista_titulo.pdf'])
+def test_parallel_extraction_matches_serial(name):
+    path = os.path.join(FIXTURES, name)
+    serial = extract_table_from_pdf(path)
+    assert len(serial) == 54
+    # Dois processos, a partir do caminho e de um upload em memória
+    pd.testing.assert_frame_equal(extract_table_from_pdf(path, parallel=True, max_workers=2), serial)
+    with open(path, 'rb') as f:
+        upload = BytesIO(f.read())
+    pd.testing.assert_frame_equal(extract_table_from_pdf(upload, parallel=True, max_workers=3), serial)
+
+@pytest.mark.parametrize('name', ['lista.pdf', 'lista_titulo.pdf'])
+def test_streaming_batches_match_full_extraction(name, monkeypatch):
+    path = os.path.join(FIXTURES, name)
+    flushed = []
+    original = pdfplumber.page.Page.flush_cache
+
+    def flush_cache(page):
+        flushed.append(page.page_number)
+        return original(page)
+
+    monkeypatch.setattr(pdfplumber.page.Page, 'flush_cache', flush_cache)
+    batches = list(iter_table_batches(path))
+    # Um lote por página, e cada página liberada ao ser lida
+    assert [len(batch) for batch in batches] == [18, 18, 18]
+    assert flushed == [1, 2, 3]
+
+    full = extract_table_from_pdf(path)
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), full.reset_index(drop=True))
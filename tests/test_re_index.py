@@ -0,0 +1,38 @@
+import pandas as pd
+
+from re_index import REIndex
+
+def _list(res, equipment='A320'):
+    return pd.DataFrame({
+        'RE': res,
+        'NOME': [f'PILOTO {re}' for re in res],
+        'EQUIPAMENTO': [equipment] * len(res),
+    })
+
+def test_lookup_many_statuses():
+    old_df = _list(['1', '2', '3'])
+    new_df = _list(['2', '3', '4'], equipment='B737')
+    results = REIndex(old_df, new_df).lookup_many(['1', '2', '4', '9'])
+    assert [result['status'] for result in results.values()] == ['exit', 'changed', 'new_entry', 'not_found']
+    assert results['2']['data']['mudancas'] == [
+        {'campo': 'EQUIPAMENTO', 'valor_antigo': 'A320', 'valor_novo': 'B737'}
+    ]
+
+def test_lookup_many_with_empty_new_list():
+    old_df = _list(['1', '2'])
+    results = REIndex(old_df, old_df.iloc[:0]).lookup_many(['1', '9'])
+    assert results['1']['status'] == 'exit'
+    assert results['9']['status'] == 'not_found'
+
+def test_lookup_many_with_empty_old_list():
+    new_df = _list(['1', '2'])
+    results = REIndex(new_df.iloc[:0], new_df).lookup_many(['2', '9'])
+    assert results['2']['status'] == 'new_entry'
+    assert results['9']['status'] == 'not_found'
+
+def test_lookup_many_with_both_lists_empty():
+    empty = _list([])
+    assert REIndex(empty, empty).lookup('1')['status'] == 'not_found'
+
+def test_lookup_many_with_no_res():
+    assert REIndex(_list(['1']), _list(['1'])).lookup_many([]) == {}
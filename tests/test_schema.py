@@ -0,0 +1,61 @@
+import os
+
+import pandas as pd
+import pytest
+
+from pdf_extractor import extract_table_from_pdf
+from schema import is_compact, to_compact, to_text
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def _text_list():
+    return pd.DataFrame({
+        'FUNÇÃO': ['CMTE', 'COP', 'CMTE'],
+        'EQUIPAMENTO': ['A320', 'B737', 'A320'],
+        'NOME': ['PILOTO UM', 'PILOTO DOIS', 'PILOTO TRES'],
+        'NOME DE GUERRA': ['UM', 'DOIS', 'TRES'],
+        'RE': ['10001', '10002', '10003'],
+        'SENIORIDADE': ['1', '', '3'],
+    })
+
+def test_compact_types_and_round_trip():
+    df = _text_list()
+    compact = to_compact(df)
+    assert is_compact(compact) and not is_compact(df)
+    assert str(compact['RE'].dtype) == 'int32'
+    assert str(compact['SENIORIDADE'].dtype) == 'Int32'
+    assert isinstance(compact['FUNÇÃO'].dtype, pd.CategoricalDtype)
+    # SENIORIDADE em branco vira ausente e volta como ""
+    assert compact['SENIORIDADE'].isna().tolist() == [False, True, False]
+    pd.testing.assert_frame_equal(to_text(compact).astype({'FUNÇÃO': object, 'EQUIPAMENTO': object}), df)
+
+def test_names_are_shared_between_lists():
+    old = to_compact(_text_list())
+    new = _text_list()
+    # Textos iguais, mas objetos diferentes (como ao ler outra lista)
+    new['NOME'] = [''.join(list(name)) for name in new['NOME']]
+    assert not any(a is b for a, b in zip(_text_list()['NOME'], new['NOME']))
+    new = to_compact(new)
+    assert all(a is b for a, b in zip(old['NOME'], new['NOME']))
+
+@pytest.mark.parametrize('column, value', [('RE', '10A02'), ('RE', '-5'), ('SENIORIDADE', '2.5'),
+                                           ('RE', str(2 ** 31))])
+def test_invalid_values_raise_or_are_dropped(column, value):
+    df = _text_list()
+    df.loc[1, column] = value
+    with pytest.raises(ValueError):
+        to_compact(df)
+
+    compact = to_compact(df, errors='drop')
+    if column == 'RE':
+        assert compact['RE'].tolist() == [10001, 10003]
+    else:
+        assert compact['SENIORIDADE'].tolist() == [1, pd.NA, 3]
+
+def test_compact_extraction_matches_the_text_extraction():
+    path = os.path.join(FIXTURES, 'lista.pdf')
+    text = extract_table_from_pdf(path)
+    compact = extract_table_from_pdf(path, compact=True)
+    pd.testing.assert_frame_equal(compact, to_compact(text))
+    assert compact['RE'].tolist() == list(range(10001, 10055))
+    assert compact.memory_usage(deep=True).sum() < text.memory_usage(deep=True).sum()
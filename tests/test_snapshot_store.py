@@ -0,0 +1,88 @@
+import importlib
+import os
+import sys
+from io import BytesIO
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from comparator import row_fingerprints
+from normalizer import DataNormalizer
+from snapshot_store import SnapshotStore
+
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api')
+
+def _extracted():
+    return pd.DataFrame({
+        'FUNÇÃO': [' cmte', 'COP', 'cop'],
+        'EQUIPAMENTO': ['A320', 'b737 ', None],
+        'NOME': ['PILOTO UM', 'PILOTO  DOIS', 'PILOTO TRES'],
+        'NOME DE GUERRA': ['PIL1', None, 'PIL3'],
+        'RE': ['10001', '10002', '10003'],
+        'SENIORIDADE': ['1', '2', '3'],
+    })
+
+def test_round_trip(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    df = DataNormalizer().normalize_dataframe(_extracted())
+    snapshot_id = store.save(df, label='teste', source='lista.pdf')
+
+    loaded = store.load(snapshot_id)
+    pd.testing.assert_frame_equal(loaded.astype(object), df.reset_index(drop=True).astype(object))
+    assert store.columns(snapshot_id) == list(df.columns)
+    assert store.load(snapshot_id, ['RE'])['RE'].tolist() == ['10001', '10002', '10003']
+    assert np.array_equal(store.fingerprints(snapshot_id), row_fingerprints(loaded))
+
+    entry = store.latest()
+    assert (entry['id'], entry['label'], entry['source'], entry['rows']) == (snapshot_id, 'teste', 'lista.pdf', 3)
+    # Outra instância no mesmo diretório enxerga o índice gravado
+    assert SnapshotStore(str(tmp_path)).list_snapshots()['id'].tolist() == [snapshot_id]
+
+    store.delete(snapshot_id)
+    assert store.latest() is None
+    assert store.fingerprints(snapshot_id) is None
+
+def test_same_file_is_extracted_once(tmp_path):
+    source = tmp_path / 'lista.pdf'
+    source.write_bytes(b'%PDF conteudo')
+    store = SnapshotStore(str(tmp_path / 'snapshots'))
+    calls = []
+
+    def extract():
+        calls.append(1)
+        return _extracted()
+
+    first = store.get_or_extract(str(source), extract)
+    second = store.get_or_extract(str(source), extract)
+    assert first == second and len(calls) == 1
+    assert store.metadata(first)['source'] == 'lista.pdf'
+    assert store.latest(exclude=first) is None
+
+def _form(api):
+    request = SimpleNamespace(path='/', wfile=BytesIO(), send_response=lambda code: None,
+                              send_header=lambda *args: None, end_headers=lambda: None)
+    api.handler.do_GET(request)
+    return request.wfile.getvalue().decode()
+
+def _import_api():
+    sys.modules.pop('index', None)
+    return importlib.import_module('index')
+
+def test_api_offers_the_stored_list_only_with_a_snapshot_dir(monkeypatch, tmp_path):
+    monkeypatch.syspath_prepend(API_DIR)
+    try:
+        monkeypatch.delenv('SENIORIDADE_SNAPSHOT_DIR', raising=False)
+        api = _import_api()
+        assert 'error' in api.load_latest_snapshot()
+        html = _form(api)
+        assert api.SNAPSHOT_HINT not in html
+        assert 'const SNAPSHOTS_ENABLED = false;' in html
+
+        monkeypatch.setenv('SENIORIDADE_SNAPSHOT_DIR', str(tmp_path))
+        api = _import_api()
+        html = _form(api)
+        assert api.SNAPSHOT_HINT in html
+        assert 'const SNAPSHOTS_ENABLED = true;' in html
+    finally:
+        sys.modules.pop('index', None)
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from comparator import compare_tables, row_fingerprints
+from timeline import SeniorityTimeline
+
+def _list(rows):
+    """Lista a partir de {RE: (EQUIPAMENTO, SENIORIDADE)}, na ordem da senioridade."""
+    return pd.DataFrame({
+        'RE': [str(re) for re in rows],
+        'NOME': [f'PILOTO {re}' for re in rows],
+        'NOME DE GUERRA': [f'P{re}' for re in rows],
+        'FUNÇÃO': ['CMTE'] * len(rows),
+        'EQUIPAMENTO': [equipment for equipment, _ in rows.values()],
+        'SENIORIDADE': [str(seniority) for _, seniority in rows.values()],
+    })
+
+def _snapshots():
+    january = _list({1001: ('A320', 1), 1002: ('A320', 2), 1003: ('B737', 3), 1004: ('B737', 4), 1005: ('E195', 5)})
+    # Fevereiro: 1003 muda de equipamento, 1005 sai e 1006 entra
+    february = _list({1001: ('A320', 1), 1002: ('A320', 2), 1003: ('A320', 3), 1004: ('B737', 4), 1006: ('E195', 6)})
+    # Março: 1001 sai (1003 sobe na lista) e 1005 volta
+    march = _list({1002: ('A320', 2), 1003: ('A320', 3), 1004: ('B737', 4), 1005: ('E195', 5), 1006: ('E195', 6)})
+    return [('2024-01', january), ('2024-02', february), ('2024-03', march)]
+
+def test_pilot_queries():
+    timeline = SeniorityTimeline.from_snapshots(_snapshots())
+    assert len(timeline) == 3
+
+    history = timeline.pilot_history(1003)
+    assert history['SNAPSHOT'].tolist() == ['2024-01', '2024-02', '2024-03']
+    assert history['EQUIPAMENTO'].astype(str).tolist() == ['B737', 'A320', 'A320']
+    assert history['POSIÇÃO'].tolist() == [3, 3, 2]
+
+    changes = timeline.equipment_changes('1003')
+    assert changes[['SNAPSHOT', 'VALOR ANTIGO', 'VALOR NOVO']].values.tolist() == [['2024-02', 'B737', 'A320']]
+
+    trajectory = timeline.seniority_trajectory(1005)
+    assert trajectory['SENIORIDADE'].tolist() == [5, pd.NA, 5]
+    assert timeline.pilot_changes(1005)['TIPO'].tolist() == ['SAÍDA', 'ENTRADA']
+    assert timeline.pilot_history(9999).empty
+
+def test_changes_match_pairwise_comparison():
+    snapshots = _snapshots()
+    timeline = SeniorityTimeline.from_snapshots(snapshots)
+    for (_, old_df), (label, new_df) in zip(snapshots, snapshots[1:]):
+        expected = {(record['RE'], record['Tipo'])
+                    for record in compare_tables(old_df.copy(), new_df.copy())['differences']}
+        events = timeline.changes_at(label)
+        assert {(str(re), kind) for re, kind in zip(events['RE'], events['TIPO'])} == expected
+
+def test_fingerprints_give_the_same_changes():
+    snapshots = _snapshots()
+    plain = SeniorityTimeline.from_snapshots(snapshots)
+    hashed = SeniorityTimeline()
+    for label, df in snapshots:
+        hashed.add_snapshot(label, df, row_fingerprints(df))
+    for label, _ in snapshots:
+        pd.testing.assert_frame_equal(hashed.changes_at(label), plain.changes_at(label))
+
+def test_labels_are_unique():
+    timeline = SeniorityTimeline.from_snapshots(_snapshots()[:1])
+    with pytest.raises(ValueError):
+        timeline.add_snapshot('2024-01', _snapshots()[1][1])
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from comparator import compare_tables
+from transitions import COMBINED, transition_matrices
+
+def _list(functions, equipment):
+    res = [str(1000 + i) for i in range(len(functions))]
+    return pd.DataFrame({
+        'RE': res,
+        'NOME': [f'PILOTO {re}' for re in res],
+        'FUNÇÃO': functions,
+        'EQUIPAMENTO': equipment,
+        'SENIORIDADE': [str(i + 1) for i in range(len(functions))],
+    })
+
+def _moved(matrix):
+    counts = matrix.to_numpy()
+    return int(counts.sum() - np.trace(counts))
+
+def test_transitions_count_what_compare_tables_reports():
+    # Diferenças só de acentos, maiúsculas ou espaços não são mudanças
+    old_df = _list(['Cmte', 'CMTE', 'COP', 'Copiloto', None], ['a320', 'A320 ', 'B737', 'B737', 'E190'])
+    new_df = _list(['CMTE ', 'cmte', 'CMTE', 'COPILOTO', None], ['A320', 'A320', 'B737', 'É190', 'E190'])
+
+    result = compare_tables(old_df.copy(), new_df.copy(), transitions=True)
+    matrices = result['transitions']
+    types = [record['Tipo'] for record in result['differences']]
+
+    assert _moved(matrices['FUNÇÃO']) == types.count('MUDANÇA DE FUNÇÃO') == 1
+    assert _moved(matrices['EQUIPAMENTO']) == types.count('MUDANÇA DE EQUIPAMENTO') == 1
+    assert list(matrices['FUNÇÃO'].index) == ['CMTE', 'COP', 'COPILOTO', 'N/A']
+    assert list(matrices['EQUIPAMENTO'].index) == ['A320', 'B737', 'E190']
+    assert matrices[COMBINED].loc['COP / B737', 'CMTE / B737'] == 1
+
+def test_transitions_without_normalization_keep_raw_values():
+    old_df = _list(['Cmte'], ['A320'])
+    new_df = _list(['CMTE'], ['A320'])
+    matrices = transition_matrices(old_df, new_df, normalize=False)
+    assert matrices['FUNÇÃO'].loc['Cmte', 'CMTE'] == 1